@@ -0,0 +1,228 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+from panda3d.core import (
+    BamFile,
+    BamWriter,
+    Filename,
+    GeomNode,
+    NodePath,
+    Texture,
+    TexturePool,
+)
+
+# Bump when the layout of generated geometry changes so stale entries miss.
+CACHE_VERSION = 1
+
+
+class AssetCache:
+    """Content-addressed on-disk cache for generated geometry and loaded assets.
+
+    Generated GeomNodes and NumPy tables are keyed by their build parameters,
+    loaded models and textures by a hash of the source file. Models and
+    geometry are stored as self-contained .bam files (textures embedded as raw
+    data), tables as .npy; textures are stored as .txo so they skip JPEG/PNG
+    decoding on a warm start. Entries are evicted least-recently-used first
+    once the directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: str = ".cache/assets", max_bytes: int = 512 * 2**20):
+        """
+        Args:
+            root:      Cache directory, created on first use.
+            max_bytes: Size limit of the directory before eviction kicks in.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def paramKey(kind: str, **params) -> str:
+        """Return the cache key for a generated asset.
+
+        Args:
+            kind:   Asset kind, e.g. "sphere" or "ring".
+            params: Build parameters; any change produces a new key.
+        """
+        items = ",".join(f"{k}={params[k]!r}" for k in sorted(params))
+        text = f"v{CACHE_VERSION}:{kind}:{items}"
+        return f"{kind}-{hashlib.sha1(text.encode()).hexdigest()[:16]}"
+
+    @staticmethod
+    def fileKey(path: str) -> str:
+        """Return the cache key for a source file, derived from its contents."""
+        digest = hashlib.sha1(f"v{CACHE_VERSION}:".encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return f"{name}-{digest.hexdigest()[:16]}"
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def geomNode(self, key: str, build) -> GeomNode:
+        """Return a cached GeomNode, building and storing it on a miss.
+
+        Args:
+            key:   Key from paramKey().
+            build: Zero-argument callable returning a GeomNode.
+        """
+        path = self._path(key, ".bam")
+        if os.path.exists(path):
+            node = self._readBam(path)
+            if node is not None:
+                self._hit(path)
+                return node
+
+        self.misses += 1
+        node = build()
+        self._store(path, lambda tmp: self._writeBam(tmp, node))
+        return node
+
+    def array(self, key: str, build) -> np.ndarray:
+        """Return a cached NumPy array, building and storing it on a miss.
+
+        Args:
+            key:   Key from paramKey().
+            build: Zero-argument callable returning an ndarray.
+        """
+        path = self._path(key, ".npy")
+        if os.path.exists(path):
+            try:
+                array = np.load(path)
+            except (OSError, ValueError):
+                array = None
+            if array is not None:
+                self._hit(path)
+                return array
+
+        self.misses += 1
+        array = build()
+        self._store(path, lambda tmp: np.save(tmp, array))
+        return array
+
+    def model(self, loader, path: str) -> NodePath:
+        """Load a model file through the cache.
+
+        Args:
+            loader: The ShowBase loader, used on a miss.
+            path:   Path to the source model (e.g. .glb).
+        """
+        cached = self._path(self.fileKey(path), ".bam")
+        if os.path.exists(cached):
+            node = self._readBam(cached)
+            if node is not None:
+                self._hit(cached)
+                return NodePath(node)
+
+        self.misses += 1
+        model = loader.loadModel(path)
+        self._store(cached, lambda tmp: self._writeBam(tmp, model.node()))
+        return model
+
+    def texture(self, loader, path: str) -> Texture:
+        """Load a texture file through the cache as a pre-decoded .txo.
+
+        Args:
+            loader: The ShowBase loader, used on a miss.
+            path:   Path to the source image.
+        """
+        cached = self._path(self.fileKey(path), ".txo")
+        if os.path.exists(cached):
+            tex = TexturePool.loadTexture(Filename.fromOsSpecific(cached))
+            if tex is not None:
+                self._hit(cached)
+                return tex
+
+        self.misses += 1
+        tex = loader.loadTexture(path)
+        self._store(cached, lambda tmp: tex.write(Filename.fromOsSpecific(tmp)))
+        return tex
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def sizeBytes(self) -> int:
+        """Return the total size of all entries in the cache directory."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least-recently-used entries until under max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Delete every entry in the cache directory."""
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, key + ext)
+
+    def _entries(self):
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield path, st.st_size, st.st_mtime
+
+    def _hit(self, path: str):
+        # mtime doubles as last-used time for LRU eviction
+        self.hits += 1
+        now = time.time()
+        os.utime(path, (now, now))
+
+    def _store(self, path: str, write):
+        # write to a temporary name and rename, so concurrent processes never
+        # read a half-written entry
+        root, ext = os.path.splitext(path)
+        tmp = f"{root}.tmp{os.getpid()}{ext}"
+        try:
+            ok = write(tmp)
+            if ok is False or not os.path.exists(tmp):
+                return
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+
+    @staticmethod
+    def _writeBam(path: str, node) -> bool:
+        bam = BamFile()
+        if not bam.openWrite(Filename.fromOsSpecific(path)):
+            return False
+        bam.getWriter().setFileTextureMode(BamWriter.BTM_rawdata)
+        ok = bam.writeObject(node)
+        bam.close()
+        return ok
+
+    @staticmethod
+    def _readBam(path: str):
+        bam = BamFile()
+        if not bam.openRead(Filename.fromOsSpecific(path)):
+            return None
+        node = bam.readNode()
+        bam.close()
+        return node
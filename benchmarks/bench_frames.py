@@ -0,0 +1,179 @@
+"""Frame-time benchmark sweeping renderers, pool sizes and particle effects.
+
+Starts the scene offscreen on a fixed simulation clock, warms it up, then
+records wall-clock frame times for every combination of renderer mode
+(3 = Sprite, 4 = Line, 5 = Point), pool size and enabled effect set. Results
+are written as JSON and CSV so runs on different commits can be diffed.
+
+Usage:
+    python benchmarks/bench_frames.py --pool-sizes 3000 9000 --out results/frames
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from panda3d.core import ClockObject, Filename, getModelPath  # noqa: E402
+
+from offscreen import configure_offscreen  # noqa: E402
+
+RENDERERS = {3: "sprite", 4: "line", 5: "point"}
+EFFECTS = ("acc_z", "acc_y", "star")
+
+
+def percentile(times, q: float) -> float:
+    return float(np.percentile(times, q) * 1e3)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def set_effects(app, enabled):
+    """Start or stop each particle effect to match the enabled set."""
+    for name in EFFECTS:
+        app.setEffectEnabled(name, name in enabled)
+
+
+def run_case(app, renderer: int, enabled, warmup: int, frames: int) -> dict:
+    """Measure one configuration and return its result row."""
+    app.changeRenderer(renderer)
+    set_effects(app, enabled)
+
+    for _ in range(warmup):
+        app.taskMgr.step()
+
+    times = []
+    counts = []
+    draw_calls = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        app.taskMgr.step()
+        times.append(time.perf_counter() - t0)
+        counts.append(app.livingParticleCount())
+        draw_calls.append(app.particleDrawCalls())
+
+    return {
+        "renderer": RENDERERS[renderer],
+        "effects": "+".join(enabled) or "none",
+        "frames": frames,
+        "mean_ms": float(np.mean(times) * 1e3),
+        "p50_ms": percentile(times, 50),
+        "p95_ms": percentile(times, 95),
+        "p99_ms": percentile(times, 99),
+        "particles_mean": float(np.mean(counts)),
+        "particles_max": int(np.max(counts)),
+        "draw_calls": int(np.max(draw_calls)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-sizes", nargs="+", type=int, default=[3000, 9000])
+    parser.add_argument("--renderers", nargs="+", type=int, default=sorted(RENDERERS))
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--size", nargs=2, type=int, default=(1280, 820))
+    parser.add_argument("--software", action="store_true")
+    parser.add_argument("--particle-engine", default="panda")
+    parser.add_argument("--batch-particles", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--out", default="results/frames", help="output path without extension"
+    )
+    args = parser.parse_args()
+
+    getModelPath().prependDirectory(Filename.fromOsSpecific(ROOT))
+    configure_offscreen(*args.size, software=args.software)
+    from black_hole_anim import BlackHoleAnimation
+
+    effect_sets = [
+        tuple(e for e, on in zip(EFFECTS, mask) if on)
+        for mask in itertools.product((True, False), repeat=len(EFFECTS))
+    ]
+
+    rows = []
+    for pool in args.pool_sizes:
+        app = BlackHoleAnimation(
+            offscreen=True,
+            seed=args.seed,
+            pool_size=pool,
+            particle_engines={e: args.particle_engine for e in EFFECTS},
+            batch_particles=args.batch_particles,
+            # effects fill up during --warmup, not from a snapshot that only
+            # the NumPy engine has
+            warm_start=False,
+        )
+        app.waitForAssets()
+        app.disableMouse()
+        app.camera.setPos(0, -130, 15)
+        app.camera.lookAt(0, 0, 0)
+
+        clock = ClockObject.getGlobalClock()
+        clock.setMode(ClockObject.MNonRealTime)
+        clock.setFrameRate(args.fps)
+
+        for renderer in args.renderers:
+            for enabled in effect_sets:
+                row = {
+                    "pool_size": pool,
+                    **run_case(app, renderer, enabled, args.warmup, args.frames),
+                }
+                rows.append(row)
+                print(
+                    f"pool={pool:<7} {row['renderer']:<7}{row['effects']:<18}"
+                    f"p50={row['p50_ms']:7.2f}  p95={row['p95_ms']:7.2f}  "
+                    f"p99={row['p99_ms']:7.2f} ms  "
+                    f"particles={row['particles_mean']:.0f}  "
+                    f"draws={row['draw_calls']}"
+                )
+        app.destroy()
+
+    meta = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "size": list(args.size),
+        "software": args.software,
+        "particle_engine": args.particle_engine,
+        "batch_particles": args.batch_particles,
+        "fps": args.fps,
+        "warmup": args.warmup,
+        "warm_start": False,
+        "seed": args.seed,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out + ".json", "w") as f:
+        json.dump({"meta": meta, "results": rows}, f, indent=2)
+    with open(args.out + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"wrote {args.out}.json and {args.out}.csv")
+
+
+if __name__ == "__main__":
+    main()
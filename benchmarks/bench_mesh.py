@@ -0,0 +1,140 @@
+"""Compare loop-built vs vectorized mesh construction times.
+
+Usage:
+    python benchmarks/bench_mesh.py [--resolutions 30 100 300 1000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from panda3d.core import (
+    Geom,
+    GeomLinestrips,
+    GeomTriangles,
+    GeomVertexData,
+    GeomVertexFormat,
+    GeomVertexReader,
+    GeomVertexWriter,
+)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geometry import make_ring_geom, make_sphere_geom  # noqa: E402
+
+
+def loop_sphere_geom(radius: float, slices: int, stacks: int) -> Geom:
+    """Reference sphere builder using the original per-vertex loops."""
+    vertex_data = GeomVertexData(
+        "sphere", GeomVertexFormat().getV3n3c4(), Geom.UHDynamic
+    )
+    vertex_writer = GeomVertexWriter(vertex_data, "vertex")
+
+    for i in range(stacks + 1):
+        phi = (2 * np.pi) * (i / stacks)
+        z = radius * np.sin(phi)
+        for j in range(slices + 1):
+            theta = (2 * np.pi) * (j / slices)
+            x = (radius * np.cos(phi)) * np.cos(theta)
+            y = (radius * np.cos(phi)) * np.sin(theta)
+            vertex_writer.addData3f(x, y, z)
+
+    triangles = GeomTriangles(Geom.UHStatic)
+    for i in range(stacks):
+        for j in range(slices):
+            K1 = i * (slices + 1) + j
+            K2 = (i + 1) * (slices + 1) + j
+            K1_1 = i * (slices + 1) + (j + 1)
+            K2_1 = (i + 1) * (slices + 1) + (j + 1)
+            triangles.addVertices(K1, K2, K1_1)
+            triangles.addVertices(K1_1, K2, K2_1)
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(triangles)
+    return geom
+
+
+def loop_ring_geom(radius: float, samples: int = 500) -> Geom:
+    """Reference ring builder using the original per-vertex loops."""
+    vertex_data = GeomVertexData("circle", GeomVertexFormat().getV3c4(), Geom.UHDynamic)
+    vertex_writer = GeomVertexWriter(vertex_data, "vertex")
+
+    x_vals = np.linspace(-radius, radius, samples)
+    neg_z_vals = {}
+    for x in x_vals:
+        z = np.sqrt(radius**2 - x**2)
+        vertex_writer.addData3f(x, 0, z)
+        neg_z_vals[x] = -z
+    for x in reversed(x_vals):
+        vertex_writer.addData3f(x, 0, neg_z_vals[x])
+
+    lines = GeomLinestrips(Geom.UHDynamic)
+    lines.addConsecutiveVertices(start=0, num_vertices=vertex_data.getNumRows())
+    lines.closePrimitive()
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(lines)
+    return geom
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` calls to fn, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def vertices_of(geom: Geom) -> np.ndarray:
+    """Read back a Geom's vertex positions for the equivalence check."""
+    reader = GeomVertexReader(geom.getVertexData(), "vertex")
+    rows = []
+    while not reader.isAtEnd():
+        v = reader.getData3()
+        rows.append((v[0], v[1], v[2]))
+    return np.array(rows, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--resolutions", nargs="+", type=int, default=[30, 100, 300, 1000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # sanity check: both builders produce the same mesh
+    assert np.allclose(
+        vertices_of(loop_sphere_geom(5, 30, 30)),
+        vertices_of(make_sphere_geom(5, 30, 30)),
+        atol=1e-5,
+    )
+    assert np.allclose(
+        vertices_of(loop_ring_geom(5.1)), vertices_of(make_ring_geom(5.1)), atol=1e-5
+    )
+
+    print(
+        f"{'mesh':<8}{'resolution':>12}{'loop (ms)':>14}{'numpy (ms)':>14}{'speedup':>10}"
+    )
+    for n in args.resolutions:
+        loop = best_time(lambda: loop_sphere_geom(5, n, n), args.repeat)
+        vec = best_time(lambda: make_sphere_geom(5, n, n), args.repeat)
+        print(
+            f"{'sphere':<8}{f'{n}x{n}':>12}{loop * 1e3:>14.2f}{vec * 1e3:>14.2f}{loop / vec:>9.1f}x"
+        )
+
+    for n in args.resolutions:
+        samples = n * 10
+        loop = best_time(lambda: loop_ring_geom(5.1, samples), args.repeat)
+        vec = best_time(lambda: make_ring_geom(5.1, samples), args.repeat)
+        print(
+            f"{'ring':<8}{samples:>12}{loop * 1e3:>14.2f}{vec * 1e3:>14.2f}{loop / vec:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
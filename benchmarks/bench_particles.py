@@ -0,0 +1,89 @@
+"""Compare per-frame particle update cost of the Panda3D and NumPy engines.
+
+Only the simulation step is timed (Panda3D's particle + physics managers vs
+NumpyParticleEffect.step + vertex buffer write), so the result does not depend
+on the graphics driver.
+
+Usage:
+    python benchmarks/bench_particles.py [--pool-sizes 9000 50000 200000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from panda3d.core import Filename, getModelPath  # noqa: E402
+
+from offscreen import configure_offscreen  # noqa: E402
+
+getModelPath().prependDirectory(Filename.fromOsSpecific(ROOT))
+configure_offscreen(64, 41, software=True)
+
+from black_hole_anim import BlackHoleAnimation  # noqa: E402
+
+DT = 1 / 60
+
+
+def time_panda(app, frames: int):
+    """Time Panda3D's particle and physics managers for frames steps."""
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        app.particleMgr.doParticles(DT)
+        app.physicsMgr.doPhysics(DT)
+        times.append(time.perf_counter() - t0)
+    return times, app.livingParticleCount()
+
+
+def time_numpy(app, frames: int):
+    """Time every enabled NumpyParticleEffect for frames steps."""
+    effects = [pe for pe, _ in app.particleSystems() if pe.isEnabled()]
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        for pe in effects:
+            pe.step(DT)
+            pe.writeGeom()
+        times.append(time.perf_counter() - t0)
+    return times, app.livingParticleCount()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pool-sizes", nargs="+", type=int, default=[9000, 50000, 200000]
+    )
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--engines", nargs="+", default=["panda", "numpy"])
+    args = parser.parse_args()
+
+    print(f"{'engine':<8}{'pool':>10}{'live':>10}{'mean (ms)':>12}{'p95 (ms)':>12}")
+    for engine in args.engines:
+        for pool in args.pool_sizes:
+            app = BlackHoleAnimation(
+                offscreen=True,
+                cache_dir=None,
+                pool_size=pool,
+                particle_engines={"acc_z": engine, "acc_y": engine, "star": engine},
+                # start empty so both engines fill from the same state
+                warm_start=False,
+            )
+            bench = time_numpy if engine == "numpy" else time_panda
+            bench(app, 10)  # fill the pools
+            times, live = bench(app, args.frames)
+            p95 = sorted(times)[int(0.95 * (len(times) - 1))]
+            print(
+                f"{engine:<8}{pool:>10}{live:>10}"
+                f"{statistics.mean(times) * 1e3:>12.2f}{p95 * 1e3:>12.2f}"
+            )
+            app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure geodesic ray tracer throughput against the number of worker processes.
+
+Traces the same view of the black hole with 1, 2, 4, ... workers up to the
+core count and reports rays per second and the speedup over one worker.
+Tiles are independent, so the speedup should stay close to the worker count
+as long as there are several tiles per worker.
+
+Usage:
+    python benchmarks/bench_raytrace.py [--size 320 205] [--tile 32]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from panda3d.core import LPoint3, LQuaternion, LVector3  # noqa: E402
+
+from raytrace import GeodesicTracer, load_sky  # noqa: E402
+
+
+def make_tracer(size, tile: int) -> GeodesicTracer:
+    """Tracer looking at the hole from slightly above the disk plane."""
+    camera = LPoint3(0, -55, 8)
+    quat = LQuaternion()
+    quat.setHpr(LVector3(0, -8, 0))
+    width, height = size
+    return GeodesicTracer(
+        rs=5,
+        camera_pos=camera,
+        camera_axes=(quat.getRight(), quat.getForward(), quat.getUp()),
+        fov=(45.4, 45.4 * height / width),
+        size=size,
+        photon_rad=5.1,
+        disk_inner=5.1,
+        disk_outer=6,
+        sky=load_sky("images/stars.jpg"),
+        tile=tile,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", nargs=2, type=int, default=(320, 205))
+    parser.add_argument("--tile", type=int, default=32)
+    args = parser.parse_args()
+
+    tracer = make_tracer(tuple(args.size), args.tile)
+    rays = args.size[0] * args.size[1]
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2**i for i in range(1, cores.bit_length())})
+    print(f"{cores} cores, {len(tracer.tiles())} tiles of {args.tile}px")
+
+    baseline = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        tracer.render(workers=workers)
+        rate = rays / (time.perf_counter() - t0)
+        baseline = baseline or rate
+        print(
+            f"{workers:>3} workers{rate / 1e3:>10.1f}k rays/sec"
+            f"{rate / baseline:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Report cold vs warm startup time with the on-disk asset cache.
+
+Startup is split into the constructor, the first drawn frame, and the
+last asset arriving from the loader thread.
+
+Each measurement runs in a fresh interpreter so Panda3D's in-memory model and
+texture pools cannot hide the cost of loading from disk.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--software]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys
+from offscreen import configure_offscreen
+configure_offscreen(640, 410, software={software})
+from black_hole_anim import BlackHoleAnimation
+app = BlackHoleAnimation(offscreen=True, cache_dir={cache_dir!r})
+app.taskMgr.step()
+app.waitForAssets()
+app.taskMgr.step()
+print(json.dumps({{
+    "startup": app.startup_time,
+    "first_frame": app.startup.marks["first frame"],
+    "assets": app.startup.marks["assets loaded"],
+}}))
+"""
+
+
+def measure(cache_dir, software: bool) -> dict:
+    """Start the scene in a child process and return its startup times (s).
+
+    "startup" is the constructor alone; "first_frame" and "assets" are the
+    time to the first drawn frame and to the last asset replacing its
+    placeholder.
+    """
+    code = CHILD.format(cache_dir=cache_dir, software=software)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--software", action="store_true")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bh-cache-")
+    try:
+        uncached, cold, warm = [], [], []
+        for _ in range(args.runs):
+            uncached.append(measure(None, args.software))
+            shutil.rmtree(cache_dir)
+            cold.append(measure(cache_dir, args.software))
+            warm.append(measure(cache_dir, args.software))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    columns = ("startup", "first_frame", "assets")
+    print(f"{'':<10}" + "".join(f"{c:>13}" for c in columns) + "  (median ms)")
+    for label, runs in (("no cache", uncached), ("cold", cold), ("warm", warm)):
+        medians = [statistics.median(run[c] for run in runs) for c in columns]
+        print(f"{label:<10}" + "".join(f"{m * 1e3:>13.0f}" for m in medians))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure particle renderer switch latency under a full pool.
+
+For every transition between Sprite (3), Line (4) and Point (5), reports the
+time spent in changeRenderer and the duration of the first frame drawn with
+the new renderer compared with a steady-state frame of the same renderer.
+
+Usage:
+    python benchmarks/bench_switch.py [--software] [--pool-size 9000]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from panda3d.core import ClockObject, Filename, getModelPath  # noqa: E402
+
+from offscreen import configure_offscreen  # noqa: E402
+
+NAMES = {3: "sprite", 4: "line", 5: "point"}
+
+
+def frame_ms(app) -> float:
+    t0 = time.perf_counter()
+    app.taskMgr.step()
+    return (time.perf_counter() - t0) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-size", type=int, default=9000)
+    parser.add_argument("--size", nargs=2, type=int, default=(1280, 820))
+    parser.add_argument("--software", action="store_true")
+    parser.add_argument("--particle-engine", default="panda")
+    args = parser.parse_args()
+
+    getModelPath().prependDirectory(Filename.fromOsSpecific(ROOT))
+    configure_offscreen(*args.size, software=args.software)
+    from black_hole_anim import BlackHoleAnimation
+
+    app = BlackHoleAnimation(
+        offscreen=True,
+        pool_size=args.pool_size,
+        particle_engines={
+            e: args.particle_engine for e in BlackHoleAnimation.PARTICLE_EFFECTS
+        },
+    )
+    app.waitForAssets()
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MNonRealTime)
+    clock.setFrameRate(60)
+    for _ in range(30):
+        app.taskMgr.step()
+
+    print(f"{'switch':<16}{'call (ms)':>10}{'first frame':>13}{'steady':>10}")
+    for src, dst in itertools.permutations(NAMES, 2):
+        app.changeRenderer(src)
+        for _ in range(5):
+            app.taskMgr.step()
+        app.changeRenderer(dst)
+        first = frame_ms(app)
+        steady = min(frame_ms(app) for _ in range(5))
+        label = f"{NAMES[src]} -> {NAMES[dst]}"
+        print(
+            f"{label:<16}{app.renderer_switch_ms:>10.3f}{first:>13.1f}{steady:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
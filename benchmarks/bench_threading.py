@@ -0,0 +1,99 @@
+"""Compare frame rates across Panda3D threading models and the particle worker.
+
+Each configuration runs in a fresh interpreter, since the threading model is
+fixed once the graphics engine exists. The scene is rendered offscreen on a
+fixed clock with the NumPy particle engine, and the wall-clock frame rate of
+every configuration is reported against the single-threaded pipeline. The
+speedup depends on how many cores are free; on a single core it is ~1x.
+
+Usage:
+    python benchmarks/bench_threading.py [--frames 200] [--pool-size 30000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, threading model, particle worker)
+CONFIGS = [
+    ("single pipeline", "", False),
+    ("Cull/Draw", "Cull/Draw", False),
+    ("particle worker", "", True),
+    ("Cull/Draw + worker", "Cull/Draw", True),
+]
+
+CHILD = """
+import json, time
+from panda3d.core import ClockObject
+from offscreen import configure_offscreen
+from pipeline import configure_threading
+configure_offscreen(640, 410, software={software})
+configure_threading({model!r})
+from black_hole_anim import BlackHoleAnimation
+app = BlackHoleAnimation(
+    offscreen=True,
+    cache_dir=None,
+    particle_engines=dict.fromkeys(BlackHoleAnimation.PARTICLE_EFFECTS, "numpy"),
+    pool_size={pool_size},
+    particle_worker={worker},
+)
+clock = ClockObject.getGlobalClock()
+clock.setMode(ClockObject.MNonRealTime)
+clock.setFrameRate(30)
+for _ in range({warmup}):
+    app.taskMgr.step()
+t0 = time.perf_counter()
+for _ in range({frames}):
+    app.taskMgr.step()
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"fps": {frames} / elapsed, "particles": app.livingParticleCount()}}))
+app.destroy()
+"""
+
+
+def measure(model: str, worker: bool, args) -> dict:
+    """Render in a child process and return its frame rate and particle count."""
+    code = CHILD.format(
+        software=args.software,
+        model=model,
+        worker=worker,
+        pool_size=args.pool_size,
+        warmup=args.warmup,
+        frames=args.frames,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--pool-size", type=int, default=30000)
+    parser.add_argument("--software", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores, pool size {args.pool_size}")
+    baseline = None
+    for label, model, worker in CONFIGS:
+        result = measure(model, worker, args)
+        baseline = baseline or result["fps"]
+        print(
+            f"{label:<22}{result['fps']:>8.1f} frames/sec"
+            f"{result['fps'] / baseline:>8.2f}x"
+            f"{result['particles']:>10} particles"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import os
 import sys
+import time
+import zlib
+from functools import partial
+from typing import Optional
 
 import numpy as np
 from direct.gui.OnscreenImage import OnscreenImage
@@ -9,22 +13,59 @@ from direct.particles.ParticleEffect import ParticleEffect
 from direct.particles.Particles import Particles
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
-    Geom,
-    GeomLinestrips,
+    ClockObject,
+    ConfigVariableBool,
     GeomNode,
-    GeomTriangles,
-    GeomVertexData,
-    GeomVertexFormat,
-    GeomVertexWriter,
     LColor,
     LPoint3,
     LVector3,
     NodePath,
     TextNode,
+    Texture,
+    TransparencyAttrib,
     loadPrcFile,
 )
 from panda3d.physics import LinearSinkForce
 
+from asset_cache import AssetCache
+from asset_loader import AssetLoader, placeholder_texture
+from geometry import (
+    lod_distance,
+    make_arcs_geom,
+    make_lod_node,
+    make_ring_geom,
+    make_sphere_geom,
+)
+from governor import ParticleBudgetGovernor
+from gravity import GravityGrid, GridSink
+from lensing import BackgroundLens, deflection_table
+from memory import (
+    PANDA_PARTICLE_BYTES,
+    MemoryReport,
+    geom_bytes,
+    scene_geom_nodes,
+    texture_bytes,
+    vertex_data_bytes,
+)
+from np_particles import (
+    NumpyParticleEffect,
+    SinkForce,
+    SphereSurfaceEmitter,
+    TangentRingEmitter,
+)
+from offscreen import seed_random
+from particle_batch import ParticleBatch
+from particle_recording import ParticleRecorder, ParticleReplay, restore_particles
+from pipeline import ParticleWorker
+from profiling import FrameProfiler
+from raytrace import GeodesicTracer, load_sky, save_image
+from renderer_pool import LINE, POINT, SPRITE, RendererPool
+from resolution import DynamicResolution
+from rotation import Spinner
+from simclock import FixedStepClock
+from startup import StartupProfile
+from warmstart import simulate_steady_state, warm_params, warm_start_panda
+
 sys.path.append(os.getcwd())
 
 HELP_TEXT = """
@@ -33,6 +74,8 @@ HELP_TEXT = """
 3 : Sprite particles
 4 : Line particles
 5 : Point particles
+6 : Top accretion disk
+7 : Underside arcs
 """
 
 # load config file
@@ -47,8 +90,166 @@ class BlackHoleAnimation(ShowBase):
         1) Axis (positive): Right = X/Pitch, back = -Y/Roll, up = Z/Heading.
     """
 
-    def __init__(self):
-        super().__init__()
+    # effect keys, in the same order as particleSystems()
+    PARTICLE_EFFECTS = ("acc_z", "acc_y", "star")
+
+    # name of each effect's particles
+    PARTICLE_NAMES = {
+        "acc_z": "acc disk particles",
+        "acc_y": "top acc disk particles",
+        "star": "star particles",
+    }
+
+    # effects that start hidden, built on first use (see particleSystem)
+    LAZY_EFFECTS = ("acc_y",)
+
+    # with several black holes: points along each axis of the gravity grid,
+    # and how far (world units) a hole moves before its share is resampled
+    GRAVITY_RESOLUTION = 32
+    GRAVITY_TOLERANCE = 0.1
+
+    # sprite renderer (initial x, final x, initial y, final y) scales
+    SPRITE_SCALES = {
+        "acc_z": (5e-3, 1e-4, 1e-3, 1e-4),
+        "acc_y": (1e-3, 1e-4, 5e-3, 1e-4),
+        "star": (5e-3, 5e-3, 1e-3, 1e-3),
+    }
+
+    # lensing.deflection_table parameters, also the table's cache key
+    DEFLECTION_TABLE = dict(samples=4096, x_max=1e3, nodes=256)
+
+    # camera (position, look-at point) of offscreen renders, framing the
+    # star, the black holes and their disks from slightly above
+    OFFSCREEN_VIEW = ((0, -110, 35), (0, 0, 0))
+
+    def __init__(
+        self,
+        offscreen: bool = False,
+        cache_dir: Optional[str] = ".cache/assets",
+        particle_engines: Optional[dict] = None,
+        pool_size: int = 9000,
+        metrics_path: Optional[str] = None,
+        frame_budget_ms: Optional[float] = None,
+        particle_worker: bool = False,
+        lensing: bool = False,
+        seed: Optional[int] = None,
+        sim_rate: Optional[float] = None,
+        startup_profile: Optional[StartupProfile] = None,
+        black_holes: int = 1,
+        orbit_rate: float = 10.0,
+        batch_particles: bool = False,
+        underside_arcs: bool = False,
+        record_particles: Optional[str] = None,
+        replay_particles: Optional[str] = None,
+        warm_start: bool = True,
+        warm_start_panda: bool = False,
+        dynamic_resolution: Optional[float] = None,
+        camera_view=None,
+    ):
+        """Build the scene.
+
+        Args:
+            offscreen: Render into an offscreen buffer instead of opening a
+                       window (see offscreen.configure_offscreen).
+            cache_dir: Directory of the on-disk asset cache, or None to always
+                       rebuild geometry and decode assets from source.
+            particle_engines: Maps an effect ("acc_z", "acc_y", "star") to
+                       "panda" (Panda3D Particles) or "numpy"
+                       (np_particles.NumpyParticleEffect).
+            pool_size: Base particle pool size of every effect.
+            metrics_path: Per-frame subsystem timings are appended to this
+                       rolling .csv / .jsonl file (see profiling.FrameProfiler).
+            frame_budget_ms: Frame-time target; when set, particle budgets are
+                       scaled at runtime to hold it (see
+                       governor.ParticleBudgetGovernor).
+            particle_worker: Step NumPy particle effects on a worker task
+                       chain, overlapping the rest of the frame (see
+                       pipeline.ParticleWorker).
+            lensing: Bend the background around the black hole on the CPU
+                       (see lensing.BackgroundLens).
+            seed: Seed for every random source, so the same frame always
+                       comes out the same (see offscreen.seed_random).
+            sim_rate: Step particle simulation at this fixed rate (Hz),
+                       independent of the frame rate (see
+                       simclock.FixedStepClock); None steps once per frame.
+            startup_profile: Profile receiving the constructor's phases and
+                       the first frame; its report is printed once the first
+                       frame is drawn and every asset has loaded.
+            black_holes: Number of black holes, each with its own sphere,
+                       photon ring and accretion disk. More than one are
+                       spaced on a circle around the scene's center, orbiting
+                       it, and NumPy particles feel their combined pull
+                       through a gravity.GravityGrid; effects then default
+                       to the "numpy" engine.
+            orbit_rate: Orbit speed of several black holes, in degrees per
+                       second.
+            batch_particles: Draw the particles of every NumPy effect through
+                       one shared Geom in line and point modes (see
+                       particle_batch.ParticleBatch). Effects then default to
+                       the "numpy" engine.
+            underside_arcs: Show the Ursina prototype's glowing underside
+                       arcs around every black hole from the start (see
+                       createUndersideArcs); key 7 toggles them either way.
+            record_particles: Record every frame's NumPy particle state into
+                       this directory (see particle_recording); effects then
+                       default to the "numpy" engine.
+            replay_particles: Draw the particles of a recording made with
+                       record_particles instead of simulating them, one
+                       recorded frame per drawn frame (see seekReplay). The
+                       number of black holes is taken from the recording.
+            warm_start: Start NumPy particle effects at their cached steady
+                       state instead of empty (see warmStart); effects then
+                       default to the "numpy" engine, so a default launch
+                       shows settled disks on its first frame.
+            warm_start_panda: Also fast-forward Panda3D particle effects to
+                       their steady state. Their pools cannot be cached, so
+                       this costs close to a second on every launch.
+            dynamic_resolution: Lowest fraction of the window resolution the
+                       3-D scene may be rendered at, e.g. 0.5; the scene is
+                       then drawn offscreen and upscaled (see
+                       resolution.DynamicResolution), and resolution is the
+                       first thing cut to hold frame_budget_ms (when not
+                       given, 1.2 refresh periods under vsync, else 16.6 ms).
+                       The background and help text stay at
+                       native resolution. None renders at full resolution.
+            camera_view: (position, look-at point) of the camera. Offscreen
+                       renders default to OFFSCREEN_VIEW, since the
+                       interactive drive starts at the origin facing away
+                       from the scene; interactively it is where the drive
+                       starts.
+        """
+        t0 = time.perf_counter()
+        self.startup = startup_profile or StartupProfile(t0)
+        self.print_startup = startup_profile is not None
+        with self.startup.phase("ShowBase (window, pipe, default tasks)"):
+            super().__init__(windowType="offscreen" if offscreen else None)
+        self.seed = seed
+        if seed is not None:
+            seed_random(seed)
+
+        self.assets = AssetCache(cache_dir) if cache_dir else None
+        self.profiler = FrameProfiler(metrics_path)
+
+        self.particle_replay = (
+            ParticleReplay(replay_particles) if replay_particles else None
+        )
+        self.particle_engines = particle_engines or {}
+        # NumPy effects are the default: they warm-start from a cached
+        # snapshot, read the gravity grid, batch and record; Panda3D
+        # Particles are left for cold starts of a single hole
+        self.default_engine = "numpy"
+        if not (warm_start or batch_particles or record_particles):
+            if not self.particle_replay and black_holes == 1:
+                self.default_engine = "panda"
+        # a loader thread would slow Panda3D particles for the whole run
+        self.asset_loader = AssetLoader(
+            self.taskMgr,
+            profile=self.startup,
+            threaded="panda" not in self.particleEngines().values(),
+        )
+        self.replay_row = None
+        if self.particle_replay:
+            black_holes = self.particle_replay.meta["black_holes"]
 
         # scene properties
         self.bh_rad = 5
@@ -56,24 +257,27 @@ class BlackHoleAnimation(ShowBase):
         self.adisk_rad = self.bh_rad + 1
         self.photon_thickness = 5
         self.position = LPoint3(25, -5, 0)
-        self.pool_size = 9000
-
-        # background
+        self.hole_count = black_holes
+        self.orbit_rate = orbit_rate
+        self.orbit_angle = 0.0
+        self.orbit_radius = 3 * (self.bh_rad + 1)
+        self.hole_positions = self.holePositions(self.orbit_angle)
+        self.pool_size = pool_size
+        self.lensing = lensing
+        self.warm_start = warm_start and not self.particle_replay
+        self.warm_start_panda = warm_start_panda
+        self.sim_clock = FixedStepClock(sim_rate) if sim_rate else None
+
+        # spin rates in degrees per second (heading, pitch, roll)
+        self.star_spin = (15, 0, 0)
+        self.hole_spin = (0, 0, 120)
+        self.spinner = Spinner()
+
+        # with a loader thread, assets are decoded while the rest of the scene
+        # is built; placeholders stand in until they arrive
         background_path = "images/galaxy_background.jpg"
         self.loadBackground(background_path)
 
-        # black hole geometry
-        self.createBlackHole()
-        self.createPhotonRing()
-
-        # particle systems
-        base.enableParticles()
-        self.pe_acc_z = self.createAccretionDisk("acc disk")
-        self.pe_acc_y = self.createAccretionDisk(
-            "top acc disk", birth_rate=1e-4, lifespan_base=2.0, tilt=90, show=False
-        )
-        self.pe_star = self.createStarParticles("star")
-
         # star model
         # This work is based on "Sun with 2K Textures"
         # (https://sketchfab.com/3d-models/sun-with-2k-textures-bac9e8f95040484bb86f1deb9bd6fe95)
@@ -82,8 +286,67 @@ class BlackHoleAnimation(ShowBase):
         star_path = "star_model/source/Sun.glb"
         self.loadStar(star_path)
 
+        self.loadSpriteTexture("images/steam.png")
+
+        # black hole geometry
+        with self.startup.phase("geometry build"):
+            self.createBlackHole()
+            self.createPhotonRing()
+            self.createCompanions()
+            self.arcs = None
+            if underside_arcs:
+                self.setArcsVisible(True)
+            self.gravity = self.createGravity()
+
+        # particle systems; hidden effects are built on first use
+        base.enableParticles()
+        self.renderer_mode = LINE
+        self.particle_color = LColor(0.99, 0.39, 0, 1)
+        self.renderer_switch_ms = 0.0
+        self.renderer_pools = {}
+        self.particle_effects = {}
+        self.particle_budget_base = {}
+        self.warm_effects = set()
+        self.accreted_reported = 0
+        self.particle_batch = None
+        if batch_particles:
+            self.particle_batch = ParticleBatch()
+            self.particle_batch.reparentTo(self.render)
+        self.pe_acc_z = self.pe_acc_y = self.pe_star = None
+        with self.startup.phase("particle setup"):
+            for key in self.effectKeys():
+                if key not in self.LAZY_EFFECTS:
+                    self.particleSystem(key)
+        self.taskMgr.remove("manager-update")
+        self.taskMgr.add(self.updateParticles, "manager-update")
+        if self.hole_count > 1:
+            self.taskMgr.add(self.orbitHoles, "orbitHoles", sort=-5)
+        # nothing is simulated in a replay, so it has no use for a worker
+        self.particle_worker = None
+        if particle_worker and not self.particle_replay:
+            self.particle_worker = ParticleWorker(self.taskMgr)
+        self.particle_recorder = None
+        if record_particles:
+            self.particle_recorder = ParticleRecorder(
+                record_particles,
+                self.effectKeys(),
+                meta={"black_holes": self.hole_count},
+            )
+        if self.particle_replay:
+            self.taskMgr.add(self.replayParticles, "replayParticles", sort=-6)
+
         # camera
         self.useDrive()
+        if offscreen:
+            self.disableMouse()
+        if offscreen or camera_view:
+            self.setCameraView(*(camera_view or self.OFFSCREEN_VIEW))
+        if self.lensing:
+            self.taskMgr.add(
+                self.profiler.wrapTask("App:Lensing", self.updateLensing),
+                "lensBackground",
+                sort=45,
+            )
 
         # key bindings
         self.accept("1", self.changeColor)
@@ -91,6 +354,8 @@ class BlackHoleAnimation(ShowBase):
         self.accept("3", self.changeRenderer, [3])
         self.accept("4", self.changeRenderer, [4])
         self.accept("5", self.changeRenderer, [5])
+        self.accept("6", self.toggleEffect, ["acc_y"])
+        self.accept("7", self.toggleArcs)
 
         self.events = OnscreenText(
             text=HELP_TEXT,
@@ -102,22 +367,49 @@ class BlackHoleAnimation(ShowBase):
             scale=0.05,
         )
 
+        # profiling frame boundaries around igLoop (sort 50)
+        self.profiler.collector("App:Renderer switch")
+        self.taskMgr.add(self.profiler.beginRender, "profilerBeginRender", sort=49)
+        self.taskMgr.add(self.recordFrameMetrics, "profilerEndFrame", sort=51)
+
+        # adaptive render resolution and particle budget; resolution goes
+        # first, then the hidden top disk, the star stream, and the main
+        # disk last
+        self.resolution = None
+        budget_keys = []
+        if dynamic_resolution:
+            self.resolution = DynamicResolution(self.win, self.cam)
+            self.taskMgr.add(self.updateResolution, "dynamicResolution", sort=46)
+            budget_keys.append("resolution")
+        if frame_budget_ms and not self.particle_replay:
+            budget_keys += ["acc_y", "star"] + self.effectKeys()[3:] + ["acc_z"]
+        self.governor = None
+        if budget_keys:
+            vsync_ms = None if offscreen else self.refreshPeriod()
+            if vsync_ms:
+                # flipped ahead of igLoop, so the vsync wait is timed apart
+                self.taskMgr.add(
+                    self.profiler.wrapTask("App:Flip", self.flipFrame),
+                    "flipFrame",
+                    sort=48,
+                )
+            target_ms = frame_budget_ms or (1.2 * vsync_ms if vsync_ms else 16.6)
+            self.governor = ParticleBudgetGovernor(
+                budget_keys,
+                self.setBudget,
+                target_ms=target_ms,
+                min_scales={"resolution": dynamic_resolution},
+                vsync_ms=vsync_ms,
+            )
+            self.taskMgr.add(self.updateGovernor, "particleGovernor", sort=52)
+
+        self.taskMgr.add(self.recordStartup, "startupProfile", sort=53)
+        self.startup_time = time.perf_counter() - t0
+
     # -------------------------------------------------------------------------
     # Scene setup helpers
     # -------------------------------------------------------------------------
 
-    def createTaskChains(self, name: str) -> str:
-        """Set up a single-threaded task chain and return its name.
-
-        Args:
-            name: Identifier used for both the chain name and the return value.
-
-        Returns:
-            The supplied name string, ready to pass to taskMgr.add().
-        """
-        self.taskMgr.setupTaskChain(chainName=f"{name}Chain", numThreads=1)
-        return name
-
     def loadBackground(self, imagepath: str):
         """Load a full-screen background image rendered behind all 3D models.
 
@@ -125,27 +417,97 @@ class BlackHoleAnimation(ShowBase):
         the image to render2dp and setting a negative sort order on its camera
         we ensure it is drawn before everything else.
 
+        The image is decoded on the loader thread; the card is black until
+        it arrives. With lensing enabled the image shown is the lens's warped
+        copy of the texture, kept up to date by the lensBackground task.
+
         Args:
             imagepath: Path to the background image file.
         """
-        self.background = OnscreenImage(parent=self.render2dp, image=imagepath)
+        self.lens = None
+        self.background = OnscreenImage(
+            parent=self.render2dp, image=placeholder_texture("background", (0, 0, 0))
+        )
         self.background.setPos(0, 0, 0)
         base.cam2dp.node().getDisplayRegion(0).setSort(-20)
 
+        def load():
+            image = self.loadCachedTexture(imagepath)
+            if self.lensing:
+                return BackgroundLens(image, self.deflectionTable())
+            return image
+
+        self.asset_loader.request(os.path.basename(imagepath), load, self.setBackground)
+
+    def setBackground(self, image):
+        """Show a loaded background Texture, or BackgroundLens with lensing."""
+        if isinstance(image, BackgroundLens):
+            self.lens = image
+            image = image.texture
+        self.background.setTexture(image, 1)
+
+    def deflectionTable(self):
+        """Return the light deflection table, from the asset cache if enabled."""
+        if self.assets:
+            key = AssetCache.paramKey("deflection", **self.DEFLECTION_TABLE)
+            return self.assets.array(
+                key, lambda: deflection_table(**self.DEFLECTION_TABLE)
+            )
+        return deflection_table(**self.DEFLECTION_TABLE)
+
+    def loadCachedTexture(self, path: str):
+        """Load a texture, going through the asset cache when it is enabled.
+
+        Args:
+            path: Path to the image file.
+
+        Returns:
+            The loaded Texture.
+        """
+        if self.assets:
+            return self.assets.texture(self.loader, path)
+        return self.loader.loadTexture(path)
+
     def loadStar(self, path: str):
-        """Load the star model, place it in the scene, and begin its spin task.
+        """Place the star's pivot in the scene, start it spinning, and queue
+        the model on the loader thread.
+
+        A plain sphere of about the model's size stands in until it arrives
+        (see placeStar).
 
         Args:
             path: Path to the star GLTF model file.
         """
-        star = self.loader.loadModel(path)
-
         # Create a parent node to act as the rotation pivot point
         star_pivot = self.render.attachNewNode("star_pivot")
         star_pivot.setPos(-20, -10, 0)
 
+        node = GeomNode("star placeholder")
+        node.addGeom(make_sphere_geom(7.5, 16, 16))
+        self.star_placeholder = star_pivot.attachNewNode(node)
+        self.star_placeholder.setColor(1, 0.55, 0.1, 1)
+
+        # Store the pivot node so we rotate it instead of the star directly
+        self.starNode = star_pivot
+        self.spinner.add("star", self.starNode, self.star_spin)
+
+        def load():
+            if self.assets:
+                return self.assets.model(self.loader, path)
+            return self.loader.loadModel(path)
+
+        self.asset_loader.request(os.path.basename(path), load, self.placeStar)
+
+    def placeStar(self, star: NodePath):
+        """Attach the loaded star model to its pivot, replacing the placeholder.
+
+        Args:
+            star: The loaded model.
+        """
+        self.star_placeholder.removeNode()
+
         # Attach the star to the pivot
-        star.reparentTo(star_pivot)
+        star.reparentTo(self.starNode)
 
         # Scale FIRST before calculating bounds
         star.setScale(LVector3(30, 30, 30))
@@ -157,110 +519,318 @@ class BlackHoleAnimation(ShowBase):
             center = (min_point + max_point) / 2
             star.setPos(-center)
 
-        self.taskMgr.add(
-            funcOrTask=self.spinStar,
-            name="spinStar",
-            taskChain=self.createTaskChains("spinStar"),
+    def loadSpriteTexture(self, path: str):
+        """Queue the sprite renderers' texture on the loader thread.
+
+        A white texel stands in until it arrives (see setSpriteTexture).
+
+        Args:
+            path: Path to the sprite image.
+        """
+        self.sprite_texture = placeholder_texture("sprite", (1, 1, 1))
+        self.asset_loader.request(
+            os.path.basename(path),
+            lambda: self.loadCachedTexture(path),
+            self.setSpriteTexture,
         )
-        # Store the pivot node so we rotate it instead of the star directly
-        self.starNode = star_pivot
 
-    def createBlackHole(self):
+    def setSpriteTexture(self, texture: Texture):
+        """Give every sprite renderer, Panda3D and NumPy, a new texture."""
+        self.sprite_texture = texture
+        for pool in self.renderer_pools.values():
+            pool.setSpriteTexture(texture)
+        if self.renderer_mode == SPRITE:
+            for key, (pe, _) in self.particle_effects.items():
+                if isinstance(pe, NumpyParticleEffect):
+                    self.setNumpyRenderer(pe, key, SPRITE, self.particle_color)
+
+    def waitForAssets(self):
+        """Block until every queued asset has loaded and replaced its placeholder."""
+        self.asset_loader.wait()
+
+    def createBlackHole(self, levels=(96, 48, 24, 12)):
         """Procedurally generate the black hole sphere and add it to the scene.
 
         The sphere is built from scratch using Panda3D's low-level geometry
-        API (GeomVertexData / GeomTriangles) and painted solid black to
-        represent the event horizon / shadow.
+        API: positions, normals and indices are computed as NumPy arrays and
+        copied into the vertex and index buffers in bulk (see geometry.py).
+        It is painted solid black to represent the event horizon / shadow.
+
+        Every tessellation in levels is built once, under an LODNode that
+        switches by how large the sphere is on screen (see createLod); holes
+        instance the same LODNode.
+
+        Args:
+            levels: Subdivisions around the x-y and the y-z plane of each
+                    detail level, finest first.
         """
-        vertex_data = GeomVertexData(
-            "sphere", GeomVertexFormat().getV3n3c4(), Geom.UHDynamic
-        )
-        vertex_writer = GeomVertexWriter(vertex_data, "vertex")
-        # normal_writer kept for future lighting work
-        GeomVertexWriter(vertex_data, "normal")
-
-        radius = self.bh_rad
-        slices = 30
-        stacks = 30
-
-        for i in range(stacks + 1):
-            # angle in the y-z plane
-            phi = (2 * np.pi) * (i / stacks)
-            z = radius * np.sin(phi)
-            for j in range(slices + 1):
-                # angle in the x-y plane
-                theta = (2 * np.pi) * (j / slices)
-                x = (radius * np.cos(phi)) * np.cos(theta)
-                y = (radius * np.cos(phi)) * np.sin(theta)
-                vertex_writer.addData3f(x, y, z)
-
-        triangles = GeomTriangles(Geom.UHStatic)
-        for i in range(stacks):
-            for j in range(slices):
-                K1 = i * (slices + 1) + j
-                K2 = (i + 1) * (slices + 1) + j
-                K1_1 = i * (slices + 1) + (j + 1)
-                K2_1 = (i + 1) * (slices + 1) + (j + 1)
-                triangles.addVertices(K1, K2, K1_1)
-                triangles.addVertices(K1_1, K2, K2_1)
-
-        hole_geom = Geom(vertex_data)
-        hole_geom.addPrimitive(triangles)
-
-        hole_node = GeomNode("sphere")
-        hole_node.addGeom(hole_geom)
-
-        self.HoleNodePath = NodePath(hole_node)
-        self.HoleNodePath.setPos(self.position)
-        self.HoleNodePath.setColor(r=0, g=0, b=0, a=1)
-        self.HoleNodePath.reparentTo(self.render)
 
-        self.taskMgr.add(
-            funcOrTask=self.spinHole,
-            name="spinHoleTask",
-            taskChain=self.createTaskChains("spinHole"),
+        def build(slices):
+            node = GeomNode("sphere")
+            node.addGeom(make_sphere_geom(self.bh_rad, slices, slices))
+            return node
+
+        self.hole_lod = self.createLod(
+            "sphere lod",
+            [
+                (
+                    slices,
+                    AssetCache.paramKey(
+                        "sphere", radius=self.bh_rad, slices=slices, stacks=slices
+                    ),
+                    partial(build, slices),
+                )
+                for slices in levels
+            ],
+            self.bh_rad,
         )
 
-    def createPhotonRing(self):
+        self.HoleNodePath = self.render.attachNewNode("black hole")
+        self.hole_lod.instanceTo(self.HoleNodePath)
+        self.HoleNodePath.setPos(self.hole_positions[0])
+        self.HoleNodePath.setColor(r=0, g=0, b=0, a=1)
+        self.spinner.add("hole", self.HoleNodePath, self.hole_spin)
+
+    def createPhotonRing(self, levels=(2000, 500, 125, 32)):
         """Build the photon ring as a circle linestrip and add it to the scene.
 
-        The circle is constructed by iterating over x values and computing the
-        corresponding positive and negative z values to form a closed loop.
+        The circle is sampled at evenly spaced x values; the upper half and the
+        mirrored lower half are computed in one vectorized pass to form a
+        closed loop. Like the sphere, every sample count in levels is built
+        once under a shared LODNode.
+
+        Args:
+            levels: Number of x samples per half circle of each detail level,
+                    finest first.
         """
-        vertex_data = GeomVertexData(
-            "circle", GeomVertexFormat().getV3c4(), Geom.UHDynamic
+
+        def build(samples):
+            node = GeomNode("circle")
+            node.addGeom(make_ring_geom(self.photon_rad, samples))
+            return node
+
+        self.ring_lod = self.createLod(
+            "ring lod",
+            [
+                (
+                    # evenly spaced x samples leave the longest edges at the
+                    # sides, about 2 * radius / sqrt(samples) long
+                    int(np.pi * np.sqrt(samples)),
+                    AssetCache.paramKey(
+                        "ring", radius=self.photon_rad, samples=samples
+                    ),
+                    partial(build, samples),
+                )
+                for samples in levels
+            ],
+            self.photon_rad,
         )
-        vertex_writer = GeomVertexWriter(vertex_data, "vertex")
 
-        radius = self.photon_rad
-        x_vals = np.linspace(-radius, radius, 500)
-        neg_z_vals = {}
+        self.circleNodePath = self.render.attachNewNode("photon ring")
+        self.ring_lod.instanceTo(self.circleNodePath)
+        self.circleNodePath.setPos(self.hole_positions[0])
+        self.circleNodePath.setColor(r=0.99, g=0.39, b=0, a=1)
+        self.circleNodePath.setRenderModeThickness(self.photon_thickness)
+
+    def createLod(self, name: str, levels, radius: float) -> NodePath:
+        """Build the detail levels of a round object under one LODNode.
 
-        for x in x_vals:
-            z = np.sqrt(radius**2 - x**2)
-            vertex_writer.addData3f(x, 0, z)
-            neg_z_vals[x] = -z
+        Each level is used from the distance at which its edges would be
+        longer than geometry.LOD_EDGE_PIXELS on screen with the camera's
+        vertical field of view and the window height, so the switches
+        follow the object's on-screen radius.
 
-        for x in reversed(x_vals):
-            vertex_writer.addData3f(x, 0, neg_z_vals[x])
+        Args:
+            name:   Name of the LODNode.
+            levels: (segments around the silhouette, cache key, build) per
+                    level, finest first; build returns the level's GeomNode.
+            radius: Radius of the object's silhouette.
 
-        circle_lines = GeomLinestrips(Geom.UHDynamic)
-        circle_lines.addConsecutiveVertices(
-            start=0, num_vertices=vertex_data.getNumRows()
+        Returns:
+            NodePath of the LODNode, not yet in the scene.
+        """
+        fov = self.camLens.getFov()[1]
+        height = self.win.getYSize()
+        nodes = []
+        for segments, key, build in levels:
+            node = self.assets.geomNode(key, build) if self.assets else build()
+            nodes.append((node, lod_distance(radius, segments, fov, height)))
+        return make_lod_node(name, nodes)
+
+    def setCameraView(self, pos, look_at):
+        """Place the camera at pos, facing look_at.
+
+        The mouse drive is moved along, so it carries on from there.
+        """
+        view = NodePath("camera view")
+        view.setPos(*pos)
+        view.lookAt(*look_at)
+        self.camera.setPosHpr(view.getPos(), view.getHpr())
+        if self.mouseInterfaceNode:
+            self.mouseInterfaceNode.setPos(view.getPos())
+            self.mouseInterfaceNode.setHpr(view.getHpr())
+
+    def holePositions(self, angle: float):
+        """Return every black hole's position with the orbit at angle degrees.
+
+        A single hole sits at the scene's center; several are spread evenly
+        on a circle around it in the x-y plane.
+        """
+        if self.hole_count == 1:
+            return [LPoint3(self.position)]
+        theta = (
+            np.radians(angle) + np.arange(self.hole_count) * 2 * np.pi / self.hole_count
         )
-        circle_lines.closePrimitive()
+        return [
+            self.position + LVector3(np.cos(t), np.sin(t), 0) * self.orbit_radius
+            for t in theta
+        ]
 
-        circle_geom = Geom(vertex_data)
-        circle_geom.addPrimitive(circle_lines)
+    def createCompanions(self):
+        """Copy the black hole and photon ring for every hole past the first.
 
-        circle_node = GeomNode("circle")
-        circle_node.addGeom(circle_geom)
+        The copies instance the first hole's LODNodes, so every level is
+        built once.
+        """
+        self.holes = [(self.HoleNodePath, self.circleNodePath)]
+        for i, pos in enumerate(self.hole_positions[1:], 1):
+            # copy the pivots' own state (color, thickness) but not children
+            hole = self.render.attachNewNode(self.HoleNodePath.node().makeCopy())
+            ring = self.render.attachNewNode(self.circleNodePath.node().makeCopy())
+            self.hole_lod.instanceTo(hole)
+            self.ring_lod.instanceTo(ring)
+            hole.setPos(pos)
+            ring.setPos(pos)
+            self.spinner.add(f"hole {i}", hole, self.hole_spin)
+            self.holes.append((hole, ring))
+
+    def createUndersideArcs(self, count: int = 200, segments: int = 360):
+        """Build the underside arcs of the Ursina prototype as one node.
+
+        The prototype drew count glowing circles around the horizon as
+        separate entities; here they are one Geom of line segments with
+        per-vertex colors (see geometry.arc_arrays), so all of them cost a
+        single draw call per black hole.
 
-        self.circleNodePath = NodePath(circle_node)
-        self.circleNodePath.setPos(self.position)
-        self.circleNodePath.setColor(r=0.99, g=0.39, b=0, a=1)
-        self.circleNodePath.setRenderModeThickness(self.photon_thickness)
-        self.circleNodePath.reparentTo(self.render)
+        Args:
+            count:    Number of arcs.
+            segments: Edges per arc.
+
+        Returns:
+            NodePath of the arcs' GeomNode, not yet in the scene.
+        """
+
+        def build():
+            node = GeomNode("underside arcs")
+            node.addGeom(make_arcs_geom(self.bh_rad, count, segments))
+            return node
+
+        key = AssetCache.paramKey(
+            "arcs", radius=self.bh_rad, count=count, segments=segments
+        )
+        arcs = NodePath(self.assets.geomNode(key, build) if self.assets else build())
+        # vertex colors instead of the hole's flat black
+        arcs.setColorOff()
+        arcs.setTransparency(TransparencyAttrib.MAlpha)
+        arcs.setDepthWrite(False)
+        arcs.setLightOff()
+        return arcs
+
+    def setArcsVisible(self, visible: bool):
+        """Show or hide the underside arcs, building them on first use.
+
+        The arcs are instanced under every black hole's pivot, so they
+        follow its orbit and spin in their own plane like the prototype's.
+        """
+        if self.arcs is None:
+            if not visible:
+                return
+            self.arcs = self.createUndersideArcs()
+            for hole, _ in self.holes:
+                self.arcs.instanceTo(hole)
+        if visible:
+            self.arcs.show()
+        else:
+            self.arcs.hide()
+
+    def toggleArcs(self):
+        """Show hidden underside arcs or hide shown ones."""
+        self.setArcsVisible(self.arcs is None or self.arcs.isHidden())
+
+    def createGravity(self):
+        """Build the gravity grids of a scene with several black holes.
+
+        Disk and star particles are pulled with different strengths, so each
+        kind gets its own grid, holding one sink per hole. The grids cover
+        the holes' orbit and the star, with a margin for particles that
+        overshoot.
+
+        Returns:
+            {"disk": GravityGrid, "star": GravityGrid}, or None with a single
+            hole, whose effects keep their own SinkForce.
+        """
+        if self.hole_count == 1:
+            return None
+        reach = LVector3(self.orbit_radius, self.orbit_radius, 0)
+        points = np.array(
+            [
+                self.position - reach,
+                self.position + reach,
+                self.starNode.getPos(self.render),
+            ]
+        )
+        margin = 4 * self.adisk_rad
+        bounds = points.min(axis=0) - margin, points.max(axis=0) + margin
+
+        def sinks(amplitude, falloff):
+            return [
+                SinkForce(
+                    center=pos,
+                    radius=self.adisk_rad - 1,
+                    amplitude=amplitude,
+                    falloff=falloff,
+                )
+                for pos in self.hole_positions
+            ]
+
+        return {
+            "disk": GravityGrid(
+                sinks(55, SinkForce.ONE_OVER_R_SQUARED),
+                *bounds,
+                resolution=self.GRAVITY_RESOLUTION,
+            ),
+            "star": GravityGrid(
+                sinks(self.bh_rad / 1.5, SinkForce.ONE_OVER_R),
+                *bounds,
+                resolution=self.GRAVITY_RESOLUTION,
+            ),
+        }
+
+    def sinkCenters(self, pe):
+        """Return every black hole's position in an effect's local space."""
+        return [pe.getRelativePoint(self.render, pos) for pos in self.hole_positions]
+
+    def updateSinks(self, pe):
+        """Point an effect's sinks at the black holes' current positions.
+
+        NumPy effects take their new transform into the gravity grid lookup;
+        Panda3D effects move one LinearSinkForce per hole.
+        """
+        if isinstance(pe, NumpyParticleEffect):
+            pe.sink.setFrame(pe.getMat())
+        else:
+            for force, center in zip(pe.sink_forces, self.sinkCenters(pe)):
+                force.setForceCenter(center)
+
+    def updateHorizons(self, pe):
+        """Give a NumPy effect the black holes' event horizons, in its space.
+
+        Particles that cross one are killed and their slots reused (see
+        NumpyParticleEffect.swallow). Panda3D systems give Python no access
+        to single particles, so theirs live out their lifespan.
+        """
+        if isinstance(pe, NumpyParticleEffect):
+            pe.setHorizons(self.sinkCenters(pe), self.bh_rad)
 
     # -------------------------------------------------------------------------
     # Particle systems
@@ -273,12 +843,15 @@ class BlackHoleAnimation(ShowBase):
         lifespan_base: float = 3.0,
         tilt: float = 0,
         show: bool = True,
+        engine: str = "panda",
+        hole: int = 0,
     ) -> ParticleEffect:
-        """Create an accretion disk particle system around the black hole.
+        """Create an accretion disk particle system around a black hole.
 
         A TangentRingEmitter gives particles an orbital velocity, while a
         LinearSinkForce with inverse-square falloff pulls them inward to
-        simulate gravity.
+        simulate gravity. With several black holes every one of them pulls
+        (see updateSinks).
 
         Args:
             name:          Base name used for the particles, force group, and
@@ -288,10 +861,42 @@ class BlackHoleAnimation(ShowBase):
             tilt:          Rotation around the P axis (degrees) to orient the
                            disk plane (0 = horizontal, 90 = vertical).
             show:          Whether to start the particle effect immediately.
+            engine:        "panda" for Panda3D Particles, "numpy" for the
+                           vectorized NumpyParticleEffect.
+            hole:          Index of the black hole the disk surrounds.
 
         Returns:
-            The configured ParticleEffect instance.
+            The configured ParticleEffect (or NumpyParticleEffect) instance.
         """
+        if engine == "numpy":
+            if self.gravity:
+                sink = GridSink(self.gravity["disk"])
+            else:
+                sink = SinkForce(
+                    radius=self.adisk_rad - 1,
+                    amplitude=55,
+                    falloff=SinkForce.ONE_OVER_R_SQUARED,
+                )
+            pe = NumpyParticleEffect(
+                f"{name} particle effect",
+                emitter=TangentRingEmitter(self.adisk_rad, 10, 1.0),
+                sink=sink,
+                pool_size=self.pool_size + 10000,
+                birth_rate=birth_rate,
+                lifespan_base=lifespan_base,
+                mass_base=1,
+                mass_spread=0.25,
+                seed=self.effectSeed(name),
+            )
+            pe.setPos(self.hole_positions[hole])
+            pe.setP(tilt)
+            if self.gravity:
+                self.updateSinks(pe)
+            self.updateHorizons(pe)
+            if show:
+                pe.start(self.render)
+            return pe
+
         p = Particles(f"{name} particles")
         p.setPoolSize(self.pool_size + 10000)
         p.setBirthRate(birth_rate)
@@ -322,41 +927,77 @@ class BlackHoleAnimation(ShowBase):
         p.renderer.setHeadColor(LColor(0.99, 0.39, 0, 1))
         p.renderer.setTailColor(LColor(0.99, 0.39, 0, 1))
 
-        # gravitational sink force
+        # gravitational sink force, one per black hole
         fg = ForceGroup(f"{name} forces")
-        force = LinearSinkForce()
-        force.setFalloffType(force.FT_ONE_OVER_R_SQUARED)
-        force.setForceCenter(LPoint3(0, 0, 0))
-        force.setRadius(self.adisk_rad - 1)
-        force.setMassDependent(True)
-        force.setAmplitude(55)
-        force.setActive(1)
-        fg.addForce(force)
+        forces = []
+        for _ in self.hole_positions:
+            force = LinearSinkForce()
+            force.setFalloffType(force.FT_ONE_OVER_R_SQUARED)
+            force.setForceCenter(LPoint3(0, 0, 0))
+            force.setRadius(self.adisk_rad - 1)
+            force.setMassDependent(True)
+            force.setAmplitude(55)
+            force.setActive(1)
+            fg.addForce(force)
+            forces.append(force)
 
         pe = ParticleEffect(f"{name} particle effect")
         pe.addForceGroup(fg)
         pe.addParticles(p)
-        pe.setPos(self.position)
+        pe.setPos(self.hole_positions[hole])
         pe.setP(tilt)
+        pe.sink_forces = forces
+        if self.gravity:
+            self.updateSinks(pe)
 
         if show:
             pe.start(self.render)
 
         return pe
 
-    def createStarParticles(self, name: str) -> ParticleEffect:
+    def createStarParticles(self, name: str, engine: str = "panda") -> ParticleEffect:
         """Create the particle system that streams material from the star to the black hole.
 
         A SphereSurfaceEmitter radiates particles outward from the star's
-        surface, while a LinearSinkForce pulls them toward the black hole.
+        surface, while a LinearSinkForce pulls them toward the black hole, or
+        toward every black hole when there are several.
 
         Args:
-            name: Base name used for the particles, force group, and particle
-                  effect objects.
+            name:   Base name used for the particles, force group, and particle
+                    effect objects.
+            engine: "panda" for Panda3D Particles, "numpy" for the vectorized
+                    NumpyParticleEffect.
 
         Returns:
-            The configured ParticleEffect instance.
+            The configured ParticleEffect (or NumpyParticleEffect) instance.
         """
+        if engine == "numpy":
+            if self.gravity:
+                sink = GridSink(self.gravity["star"])
+            else:
+                sink = SinkForce(
+                    center=(33, 1.5, 0),
+                    radius=self.adisk_rad - 1,
+                    amplitude=self.bh_rad / 1.5,
+                    falloff=SinkForce.ONE_OVER_R,
+                )
+            pe = NumpyParticleEffect(
+                f"{name} particle effect",
+                emitter=SphereSurfaceEmitter(self.adisk_rad, 0.25, 2),
+                sink=sink,
+                pool_size=self.pool_size,
+                lifespan_base=4.0,
+                mass_base=5,
+                mass_spread=2,
+                seed=self.effectSeed(name),
+            )
+            pe.start(self.render)
+            pe.setPos(LPoint3(-20, -10, 0))
+            if self.gravity:
+                self.updateSinks(pe)
+            self.updateHorizons(pe)
+            return pe
+
         p = Particles(f"{name} particles")
         p.setPoolSize(self.pool_size)
         p.setBirthRate(1e-5)
@@ -389,22 +1030,29 @@ class BlackHoleAnimation(ShowBase):
         p.renderer.setHeadColor(LColor(0.99, 0.39, 0, 1))
         p.renderer.setTailColor(LColor(0.99, 0.39, 0, 1))
 
-        # gravitational sink force (center is relative to the black hole position)
+        # gravitational sink force (center is relative to the black hole
+        # position), one per black hole
         fg = ForceGroup(f"{name} forces")
-        force = LinearSinkForce()
-        force.setFalloffType(force.FT_ONE_OVER_R)
-        force.setForceCenter(LPoint3(33, 1.5, 0))
-        force.setRadius(self.adisk_rad - 1)
-        force.setMassDependent(True)
-        force.setAmplitude(self.bh_rad / 1.5)
-        force.setActive(1)
-        fg.addForce(force)
+        forces = []
+        for _ in self.hole_positions:
+            force = LinearSinkForce()
+            force.setFalloffType(force.FT_ONE_OVER_R)
+            force.setForceCenter(LPoint3(33, 1.5, 0))
+            force.setRadius(self.adisk_rad - 1)
+            force.setMassDependent(True)
+            force.setAmplitude(self.bh_rad / 1.5)
+            force.setActive(1)
+            fg.addForce(force)
+            forces.append(force)
 
         pe = ParticleEffect(f"{name} particle effect")
         pe.addForceGroup(fg)
         pe.addParticles(p)
         pe.start(self.render)
         pe.setPos(LPoint3(-20, -10, 0))
+        pe.sink_forces = forces
+        if self.gravity:
+            self.updateSinks(pe)
 
         return pe
 
@@ -412,6 +1060,12 @@ class BlackHoleAnimation(ShowBase):
     # Color and renderer controls
     # -------------------------------------------------------------------------
 
+    def effectSeed(self, name: str):
+        """Return a NumPy particle effect's seed, distinct for every effect."""
+        if self.seed is None:
+            return None
+        return [self.seed, zlib.crc32(name.encode())]
+
     def changeColor(self, col: LColor = None):
         """Change the color of the photon ring, star, and all particle systems.
 
@@ -422,142 +1076,589 @@ class BlackHoleAnimation(ShowBase):
             vals = np.float16(np.append(np.random.uniform(0, 1, 3), 1))
             col = LColor(vals[0], vals[1], vals[2], vals[3])
 
-        self.circleNodePath.setColor(col)
+        for _, ring in self.holes:
+            ring.setColor(col)
         self.starNode.setColorScale(col)
 
-        crend = (
-            self.pe_acc_z.getParticlesNamed("acc disk particles")
-            .getRenderer()
-            .__repr__()
-        )
-
-        if crend == "SpriteParticleRenderer":
-            self.changeRenderer(3, col)
-        elif crend == "LineParticleRenderer":
-            self.changeRenderer(4, col)
-        elif crend == "PointParticleRenderer":
-            self.changeRenderer(5, col)
+        self.changeRenderer(self.renderer_mode, col)
 
     def changeRenderer(self, val: int, ccol: LColor = None):
         """Switch the particle renderer type across all particle systems.
 
+        Every renderer is prebuilt (see createRendererPools), so a switch is a
+        renderer swap plus a color update; Panda3D line renderers still
+        rebuild their Geom on the swap, so the first Line frame costs about
+        twice a steady one (see renderer_pool.RendererPool). Its duration is kept in
+        renderer_switch_ms and reported under the "App:Renderer switch" timer.
+
         Args:
             val:  Renderer type identifier (3 = Sprite, 4 = Line, 5 = Point).
-            ccol: Color to carry over. If None, the current color is read from
-                  the active renderer.
+            ccol: Color to carry over. If None, the current color is kept.
+        """
+        if ccol is None:
+            ccol = self.particle_color
+
+        self.syncParticles()
+        t0 = time.perf_counter()
+        with self.profiler.timed("App:Renderer switch"):
+            for key, (pe, _) in self.particle_effects.items():
+                if isinstance(pe, NumpyParticleEffect):
+                    self.setNumpyRenderer(pe, key, val, ccol)
+                else:
+                    self.renderer_pools[key].use(val, ccol)
+            self.setBatchRenderer(val)
+        self.renderer_switch_ms = (time.perf_counter() - t0) * 1e3
+
+        self.renderer_mode = val
+        self.particle_color = LColor(ccol)
+
+    def particleSystems(self):
+        """Return (effect, particles name) for every particle system built so far."""
+        return [
+            self.particle_effects[key]
+            for key in self.effectKeys()
+            if key in self.particle_effects
+        ]
+
+    def effectKeys(self):
+        """Return every effect key: PARTICLE_EFFECTS, then one main disk
+        ("acc_z1", "acc_z2", ...) per black hole past the first."""
+        return list(self.PARTICLE_EFFECTS) + [
+            f"acc_z{i}" for i in range(1, self.hole_count)
+        ]
+
+    @staticmethod
+    def effectHole(key: str):
+        """Return the index of the black hole an effect surrounds, or None."""
+        if key.startswith("acc_"):
+            return int(key[5:] or 0)
+        return None
+
+    @staticmethod
+    def baseKey(key: str) -> str:
+        """Return the PARTICLE_EFFECTS key an effect is configured by."""
+        return key.rstrip("0123456789")
+
+    def particleSystem(self, key: str):
+        """Return the (effect, particles name) pair for an effect key.
+
+        The effect is built on first use, with the current renderer and
+        color, so hidden effects cost nothing until they are shown.
+        """
+        if key not in self.particle_effects:
+            pe = self.createParticleEffect(key)
+            setattr(self, f"pe_{key}", pe)
+            name = self.PARTICLE_NAMES[self.baseKey(key)]
+            if key != self.baseKey(key):
+                name = name.replace("disk", f"disk {self.effectHole(key)}")
+            self.particle_effects[key] = (pe, name)
+            self.particle_budget_base[key] = self.getParticleBudget(key)
+            if pe.isEnabled() and self.wantsWarmStart(key):
+                with self.startup.phase(f"warm start: {name}"):
+                    self.warmStart(key)
+            if isinstance(pe, NumpyParticleEffect):
+                self.setNumpyRenderer(pe, key, self.renderer_mode, self.particle_color)
+            else:
+                self.createRendererPool(key)
+        return self.particle_effects[key]
+
+    def particleEngines(self) -> dict:
+        """Return the engine every effect ("acc_z", "acc_y", "star") uses."""
+        if self.particle_replay:
+            return {name: "numpy" for name in self.PARTICLE_EFFECTS}
+        return {
+            name: self.particle_engines.get(name, self.default_engine)
+            for name in self.PARTICLE_EFFECTS
+        }
+
+    def createParticleEffect(self, key: str):
+        """Build the effect for key with its configured engine."""
+        engine = self.particleEngines()[self.baseKey(key)]
+        if key == "acc_z":
+            return self.createAccretionDisk("acc disk", engine=engine)
+        if self.baseKey(key) == "acc_z":
+            hole = self.effectHole(key)
+            return self.createAccretionDisk(
+                f"acc disk {hole}", engine=engine, hole=hole
+            )
+        if key == "acc_y":
+            return self.createAccretionDisk(
+                "top acc disk",
+                birth_rate=1e-4,
+                lifespan_base=2.0,
+                tilt=90,
+                show=False,
+                engine=engine,
+            )
+        return self.createStarParticles("star", engine=engine)
+
+    def wantsWarmStart(self, key: str) -> bool:
+        """Return whether the effect for key starts at its steady state."""
+        if not self.warm_start:
+            return False
+        pe, _ = self.particle_effects[key]
+        return isinstance(pe, NumpyParticleEffect) or self.warm_start_panda
+
+    def warmStart(self, key: str):
+        """Fill a new effect's pool with its steady-state population.
+
+        A NumPy effect is fast-forwarded from empty until its first
+        particles would have died, without drawing, and the settled pool is
+        cached on disk under the effect's parameters (see warmstart.py), so
+        later launches just load it. Panda3D pools cannot be saved, so those
+        are fast-forwarded in place every time, and only with
+        warm_start_panda.
+        """
+        pe, name = self.particle_effects[key]
+        self.warm_effects.add(key)
+        if isinstance(pe, NumpyParticleEffect):
+            build = partial(simulate_steady_state, pe)
+            if self.assets:
+                cache_key = AssetCache.paramKey("particles", **warm_params(pe))
+                pe.setState(self.assets.array(cache_key, build))
+            else:
+                pe.setState(build())
+        else:
+            p = pe.getParticlesNamed(name)
+            lifespan = (p.factory.getLifespanBase(), p.factory.getLifespanSpread())
+            warm_start_panda(self.particleMgr, self.physicsMgr, p, lifespan)
+
+    def isEffectEnabled(self, key: str) -> bool:
+        """Return whether an effect has been built and is running."""
+        if key not in self.particle_effects:
+            return False
+        return bool(self.particle_effects[key][0].isEnabled())
+
+    def setEffectEnabled(self, key: str, enabled: bool):
+        """Start or stop an effect, building it first if needed.
+
+        A stopped NumPy effect releases its pool, which is allocated again
+        (and warm-started from the cached snapshot) when it next starts.
+        Panda3D pools are kept: shrinking one kills its particles one by one
+        and gives little memory back to the system.
+        """
+        pe, _ = self.particleSystem(key)
+        if enabled == pe.isEnabled():
+            return
+        self.syncParticles()
+        if enabled:
+            if key not in self.warm_effects and self.wantsWarmStart(key):
+                self.warmStart(key)
+            pe.start(self.render)
+        elif isinstance(pe, NumpyParticleEffect):
+            pe.disable(release=True)
+            self.warm_effects.discard(key)
+        else:
+            pe.disable()
+
+    def toggleEffect(self, key: str):
+        """Show a stopped effect or hide a running one."""
+        self.setEffectEnabled(key, not self.isEffectEnabled(key))
+
+    def getParticleBudget(self, key: str):
+        """Return an effect's current (birth rate, litter size, pool size)."""
+        pe, name = self.particleSystem(key)
+        if isinstance(pe, NumpyParticleEffect):
+            return pe.birth_rate, pe.litter_size, pe.getPoolSize()
+        p = pe.getParticlesNamed(name)
+        return p.getBirthRate(), p.getLitterSize(), p.getPoolSize()
+
+    def setParticleBudget(self, key: str, scale: float):
+        """Scale an effect's birth rate, litter size and pool size.
+
+        Args:
+            key:   Effect key ("acc_z", "acc_y" or "star").
+            scale: Fraction of the effect's original budget, in (0, 1].
+        """
+        birth_rate, litter_size, pool_size = self.particle_budget_base[key]
+        birth_rate /= scale
+        litter_size = max(1, int(litter_size * scale))
+        pool_size = max(1, int(pool_size * scale))
+
+        pe, name = self.particleSystem(key)
+        if isinstance(pe, NumpyParticleEffect):
+            self.syncParticles()
+            pe.birth_rate = birth_rate
+            pe.litter_size = litter_size
+            pe.setPoolSize(pool_size)
+        else:
+            p = pe.getParticlesNamed(name)
+            p.setBirthRate(birth_rate)
+            p.setLitterSize(litter_size)
+            p.setPoolSize(pool_size)
+
+    def setBudget(self, key: str, scale: float):
+        """Apply a budget scale from the governor: the render resolution for
+        "resolution", an effect's particle budget otherwise."""
+        if key == "resolution":
+            self.resolution.setScale(scale)
+        else:
+            self.setParticleBudget(key, scale)
+
+    def livingParticleCount(self) -> int:
+        """Return the number of live particles across all running effects.
+
+        While a worker step is in flight, NumPy effects report the particles
+        uploaded this frame rather than waiting for the step.
+        """
+        count = 0
+        for pe, name in self.particleSystems():
+            if not pe.isEnabled():
+                continue
+            if isinstance(pe, NumpyParticleEffect):
+                if self.particle_worker:
+                    count += pe.drawn_count
+                else:
+                    count += pe.getLivingParticleCount()
+            else:
+                count += pe.getParticlesNamed(name).getLivingParticles()
+        return count
+
+    def accretedParticleCount(self) -> int:
+        """Return how many particles have crossed an event horizon so far.
+
+        Counts NumPy effects only, built or hidden; see updateHorizons.
         """
-        crend = (
-            self.pe_acc_z.getParticlesNamed("acc disk particles")
-            .getRenderer()
-            .__repr__()
+        return sum(
+            pe.getSwallowedCount()
+            for pe, _ in self.particleSystems()
+            if isinstance(pe, NumpyParticleEffect)
         )
 
-        if ccol is None:
-            renderer = self.pe_acc_z.getParticlesNamed(
-                "acc disk particles"
-            ).getRenderer()
-            if crend == "SpriteParticleRenderer":
-                ccol = renderer.getColor()
-            elif crend == "LineParticleRenderer":
-                ccol = renderer.getHeadColor()
-            elif crend == "PointParticleRenderer":
-                ccol = renderer.getStartColor()
-
-        if val == 3:
-            self.updateToSprite(ccol)
-        elif val == 4:
-            self.updateToLine(ccol)
-        elif val == 5:
-            self.updateToPoint(ccol)
-
-    def updateToSprite(self, ccol: LColor):
-        """Switch all particle systems to the sprite renderer.
+    def createRendererPool(self, key: str):
+        """Prebuild the Sprite, Line and Point renderers of a Panda3D effect.
+
+        All sprite renderers share a single steam.png texture. The pool is
+        left on the current renderer and color.
+        """
+        pe, name = self.particle_effects[key]
+        pool = RendererPool(
+            pe.getParticlesNamed(name),
+            self.sprite_texture,
+            self.SPRITE_SCALES[self.baseKey(key)],
+        )
+        if pe.isEnabled():
+            pool.prewarm(self.particleMgr, self.particle_color)
+        pool.use(self.renderer_mode, self.particle_color)
+        self.renderer_pools[key] = pool
+
+    def setNumpyRenderer(self, pe, key: str, val: int, ccol: LColor):
+        """Switch a NumpyParticleEffect to the renderer type val.
 
         Args:
-            ccol: Color to apply to every sprite renderer instance.
+            pe:   The effect.
+            key:  Effect key, used to look up its sprite scale.
+            val:  Renderer type identifier (3 = Sprite, 4 = Line, 5 = Point).
+            ccol: Particle color.
         """
+        if val == SPRITE:
+            size = (
+                self.sprite_texture.getXSize()
+                * self.SPRITE_SCALES[self.baseKey(key)][0]
+            )
+            pe.setRenderer("sprite", ccol, point_size=size, texture=self.sprite_texture)
+        elif val == LINE:
+            pe.setRenderer("line", ccol)
+        elif val == POINT:
+            pe.setRenderer("point", ccol, point_size=100.0)
+        if self.particle_batch:
+            pe.setBatched(val != SPRITE)
+
+    def setBatchRenderer(self, val: int):
+        """Switch the shared particle batch, if any, to the renderer type val.
+
+        Sprites are not batched, so the batch keeps its primitive and is
+        simply left empty in sprite mode.
+        """
+        if self.particle_batch and val != SPRITE:
+            if val == LINE:
+                self.particle_batch.setRenderer("line")
+            else:
+                self.particle_batch.setRenderer("point", point_size=100.0)
+
+    def particleDrawCalls(self) -> int:
+        """Return the draw calls spent on particles in the last frame.
+
+        Every running effect drawn on its own costs one, and the shared
+        batch one more if it drew anything.
+        """
+        calls = 0
+        for pe, _ in self.particleSystems():
+            if pe.isEnabled() and not getattr(pe, "batched", False):
+                calls += 1
+        if self.particle_batch:
+            calls += self.particle_batch.getDrawCalls()
+        return calls
+
+    def memoryReport(self) -> MemoryReport:
+        """Return the bytes held by particle pools, Geoms and textures.
+
+        NumPy pools report their arrays and vertex buffer exactly (a
+        released pool holds nothing); Panda3D pools are estimated from their
+        size, see memory.PANDA_PARTICLE_BYTES. Geoms are counted once however
+        often they are instanced, including every LOD level; textures include
+        the loaded images, the lensing source and the windows' render
+        textures.
+        """
+        report = MemoryReport()
+        seen = set()
+        for key in self.effectKeys():
+            if key not in self.particle_effects:
+                report.add("pool", key, 0, "not built")
+                continue
+            pe, name = self.particle_effects[key]
+            if isinstance(pe, NumpyParticleEffect):
+                note = "" if pe.isAllocated() else "released"
+                report.add("pool", key, pe.getPoolBytes(), note)
+                vertex_data_bytes(pe.vertex_data, seen)
+            else:
+                slots = pe.getParticlesNamed(name).getPoolSize()
+                report.add("pool", key, slots * PANDA_PARTICLE_BYTES, "estimated")
+
+        labeled = [("sphere", self.hole_lod), ("photon ring", self.ring_lod)]
+        if self.arcs is not None:
+            labeled.append(("underside arcs", self.arcs))
+        labeled.append(("star model", self.starNode))
+        for label, root in labeled:
+            if root.node().isLodNode():
+                # levels in the order they were added, finest first
+                paths = [
+                    (f"{label} level {i}", path)
+                    for i, path in enumerate(root.getChildren())
+                ]
+            else:
+                paths = [(label, path) for path in scene_geom_nodes(root)]
+            for name, path in paths:
+                for geom in path.node().getGeoms():
+                    report.add("geom", name, geom_bytes(geom, seen))
+        for root in (self.render, self.render2d, self.render2dp):
+            for path in scene_geom_nodes(root):
+                for geom in path.node().getGeoms():
+                    nbytes = geom_bytes(geom, seen)
+                    if nbytes:
+                        report.add("geom", path.getName(), nbytes)
+
+        # unnamed textures (e.g. the ones embedded in Sun.glb) are listed
+        # under the first scene graph they were found in
+        textures = {self.sprite_texture.this: (self.sprite_texture, "sprite")}
+        for label, root in (
+            ("star model", self.starNode),
+            ("scene", self.render),
+            ("background", self.render2dp),
+            ("2-D", self.render2d),
+        ):
+            for texture in root.findAllTextures():
+                textures.setdefault(texture.this, (texture, label))
+        for win in self.graphicsEngine.getWindows():
+            for i in range(win.countTextures()):
+                texture = win.getTexture(i)
+                textures.setdefault(texture.this, (texture, f"{win.getName()} render"))
+        for texture, label in textures.values():
+            nbytes, where = texture_bytes(texture)
+            report.add(
+                "texture", texture.getName() or f"{label} texture", nbytes, where
+            )
+        if self.lens:
+            source = self.lens.source.nbytes
+            report.add("texture", "lensing source", source, "NumPy")
+        return report
+
+    # -------------------------------------------------------------------------
+    # Per-frame tasks
+    # -------------------------------------------------------------------------
 
-        def _apply(p, x_init, x_final, y_init, y_final):
-            p.setRenderer("SpriteParticleRenderer")
-            p.renderer.setTexture(self.loader.loadTexture("images/steam.png"))
-            p.renderer.setColor(ccol)
-            p.renderer.setXScaleFlag(True)
-            p.renderer.setYScaleFlag(True)
-            p.renderer.setAnimAngleFlag(True)
-            p.renderer.setInitialXScale(x_init)
-            p.renderer.setFinalXScale(x_final)
-            p.renderer.setInitialYScale(y_init)
-            p.renderer.setFinalYScale(y_final)
+    def updateParticles(self, task):
+        """Step every enabled particle effect, each under its own timer.
 
-        p = self.pe_acc_z.getParticlesNamed("acc disk particles")
-        _apply(p, 5e-3, 1e-4, 1e-3, 1e-4)
-        self.pe_acc_z.getParticlesDict()["acc disk particles"] = p
+        Replaces ShowBase's "manager-update" task, which updates all Panda3D
+        particle systems in one call, so the cost of each effect is visible
+        in PStats and the metrics export.
 
-        p = self.pe_acc_y.getParticlesNamed("top acc disk particles")
-        _apply(p, 1e-3, 1e-4, 5e-3, 1e-4)
-        self.pe_acc_y.getParticlesDict()["top acc disk particles"] = p
+        With a simulation clock, the frame time is turned into zero or more
+        fixed steps; NumPy effects are drawn interpolated between their last
+        two steps, Panda3D systems only build geometry on the final step.
+        Without one, every effect takes a single step of the frame's dt.
 
-        p = self.pe_star.getParticlesNamed("star particles")
-        _apply(p, 5e-3, 5e-3, 1e-3, 1e-3)
-        self.pe_star.getParticlesDict()["star particles"] = p
+        With a particle batch, batched NumPy effects only step here and their
+        particles are written into the batch's single Geom afterwards.
 
-    def updateToLine(self, ccol: LColor):
-        """Switch all particle systems to the line renderer.
+        With a particle worker, NumPy effects upload the steps finished on the
+        worker during the previous frame and then queue the next ones; Panda3D
+        particle systems write their renderers' geometry while they update,
+        so they always stay on the App thread.
 
         Args:
-            ccol: Color to apply to every line renderer instance.
+            task: Panda3D task object.
+
+        Returns:
+            task.cont to keep the task running every frame.
         """
+        dt = ClockObject.getGlobalClock().getDt()
+        if self.particle_replay:
+            # replayParticles has loaded this frame's state; only draw it
+            steps, blend = 0, 1.0
+        elif self.sim_clock:
+            steps = self.sim_clock.advance(dt)
+            dt, blend = self.sim_clock.step, self.sim_clock.blend
+        else:
+            steps, blend = 1, 1.0
+
+        worker = self.particle_worker
+        with self.profiler.timed("App:Particles:wait"):
+            self.syncParticles()
+
+        jobs = []
+        batched = []
+        for pe, name in self.particleSystems():
+            if not pe.isEnabled():
+                continue
+            with self.profiler.timed(f"App:Particles:{name}"):
+                if isinstance(pe, NumpyParticleEffect) and pe.batched:
+                    batched.append(pe)
+                    if worker:
+                        jobs.append(partial(pe.advance, dt, steps))
+                    else:
+                        pe.advance(dt, steps)
+                elif isinstance(pe, NumpyParticleEffect):
+                    if worker:
+                        pe.writeGeom(blend)
+                        jobs.append(partial(pe.advance, dt, steps))
+                    else:
+                        pe.update(dt, steps, blend)
+                else:
+                    particles = pe.getParticlesNamed(name)
+                    for i in range(steps):
+                        self.particleMgr.doParticles(dt, particles, i == steps - 1)
+                        self.physicsMgr.doPhysics(dt, particles)
+
+        if self.particle_batch:
+            # with a worker the batch shows last frame's steps, like writeGeom
+            # above, so it is written before the next steps are submitted
+            with self.profiler.timed("App:Particles:batch"):
+                self.particle_batch.write(batched, blend)
+
+        if self.particle_recorder:
+            # the state just drawn; a worker's next steps have not started
+            with self.profiler.timed("App:Particles:record"):
+                self.recordParticles(dt)
+
+        if worker:
+            worker.submit(jobs)
+        return task.cont
 
-        def _apply(p):
-            p.setRenderer("LineParticleRenderer")
-            p.renderer.setHeadColor(ccol)
-            p.renderer.setTailColor(ccol)
+    def orbitHoles(self, task):
+        """Move several black holes along their orbit, with their disks.
 
-        p = self.pe_acc_z.getParticlesNamed("acc disk particles")
-        _apply(p)
-        self.pe_acc_z.getParticlesDict()["acc disk particles"] = p
+        Each gravity grid resamples only the holes that have moved more than
+        GRAVITY_TOLERANCE since they were last sampled. Particle steps read
+        the grids, so the worker is synced before they change.
 
-        p = self.pe_acc_y.getParticlesNamed("top acc disk particles")
-        _apply(p)
-        self.pe_acc_y.getParticlesDict()["top acc disk particles"] = p
+        Args:
+            task: Panda3D task object.
 
-        p = self.pe_star.getParticlesNamed("star particles")
-        _apply(p)
-        self.pe_star.getParticlesDict()["star particles"] = p
+        Returns:
+            task.cont to keep the task running every frame.
+        """
+        self.syncParticles()
+        if self.replay_row is not None:
+            self.orbit_angle = float(self.replay_row["orbit_angle"])
+        else:
+            self.orbit_angle += self.orbit_rate * ClockObject.getGlobalClock().getDt()
+        self.hole_positions = self.holePositions(self.orbit_angle)
+        for (hole, ring), pos in zip(self.holes, self.hole_positions):
+            hole.setPos(pos)
+            ring.setPos(pos)
+
+        for key, (pe, _) in self.particle_effects.items():
+            hole = self.effectHole(key)
+            if hole is not None:
+                pe.setPos(self.hole_positions[hole])
+            self.updateSinks(pe)
+            self.updateHorizons(pe)
+
+        if self.particle_replay:
+            return task.cont
+        with self.profiler.timed("App:Gravity grid"):
+            for grid in self.gravity.values():
+                for i, pos in enumerate(self.hole_positions):
+                    grid.move(i, pos, self.GRAVITY_TOLERANCE)
+        return task.cont
+
+    def recordParticles(self, dt: float):
+        """Append the running NumPy effects' particles to the recording.
 
-    def updateToPoint(self, ccol: LColor):
-        """Switch all particle systems to the point renderer.
+        Panda3D systems cannot be read back from Python and are skipped.
 
         Args:
-            ccol: Color to apply to every point renderer instance.
+            dt: Length of the simulation step that produced the state.
         """
+        effects = {
+            key: pe
+            for key, (pe, _) in self.particle_effects.items()
+            if isinstance(pe, NumpyParticleEffect) and pe.isEnabled()
+        }
+        self.particle_recorder.record(
+            effects,
+            dt,
+            ClockObject.getGlobalClock().getFrameTime(),
+            self.orbit_angle,
+        )
 
-        def _apply(p):
-            p.setRenderer("PointParticleRenderer")
-            p.renderer.setPointSize(100.0)
-            p.renderer.setStartColor(ccol)
-            p.renderer.setEndColor(ccol)
-            p.renderer.setBlendType(p.renderer.PP_BLEND_VEL)
-            p.renderer.setBlendMethod(p.renderer.PP_BLEND_CUBIC)
+    def replayParticles(self, task):
+        """Load the next recorded frame into the particle effects.
 
-        p = self.pe_acc_z.getParticlesNamed("acc disk particles")
-        _apply(p)
-        self.pe_acc_z.getParticlesDict()["acc disk particles"] = p
+        Runs before orbitHoles and updateParticles, which then place the
+        holes and draw the particles of the frame without simulating.
 
-        p = self.pe_acc_y.getParticlesNamed("top acc disk particles")
-        _apply(p)
-        self.pe_acc_y.getParticlesDict()["top acc disk particles"] = p
+        Args:
+            task: Panda3D task object.
 
-        p = self.pe_star.getParticlesNamed("star particles")
-        _apply(p)
-        self.pe_star.getParticlesDict()["star particles"] = p
+        Returns:
+            task.cont to keep the task running every frame.
+        """
+        with self.profiler.timed("App:Particles:replay"):
+            row, particles = self.particle_replay.next()
+            self.replay_row = row
+            for i, key in enumerate(self.particle_replay.effects):
+                running = key in particles
+                self.setEffectEnabled(key, running)
+                if running:
+                    pe, _ = self.particleSystem(key)
+                    restore_particles(pe, particles[key], float(row["dt"]))
+                    pe.color = LColor(*row["color"][i])
+        return task.cont
 
-    # -------------------------------------------------------------------------
-    # Per-frame tasks
-    # -------------------------------------------------------------------------
+    def seekReplay(self, frame: int):
+        """Make frame the next recorded frame to be drawn."""
+        self.particle_replay.seek(frame)
 
-    def spinStar(self, task):
-        """Continuously rotate the star around its heading axis.
+    def syncParticles(self):
+        """Wait for the particle worker, if any, to finish its current step.
+
+        Must be called before reading or changing a NumPy effect's particle
+        arrays from the App thread.
+        """
+        if self.particle_worker:
+            self.particle_worker.wait()
+
+    def destroy(self):
+        """Stop the particle worker and asset loader, close any particle
+        recording and release the dynamic resolution buffer before ShowBase
+        tears down the scene."""
+        if getattr(self, "particle_worker", None):
+            self.particle_worker.stop()
+        if getattr(self, "asset_loader", None):
+            self.asset_loader.stop()
+        if getattr(self, "particle_recorder", None):
+            self.particle_recorder.close()
+        if getattr(self, "particle_replay", None):
+            self.particle_replay.close()
+        if getattr(self, "resolution", None):
+            self.resolution.destroy()
+        super().destroy()
+
+    def recordFrameMetrics(self, task):
+        """Close the profiler's frame once igLoop has drawn it.
 
         Args:
             task: Panda3D task object.
@@ -565,11 +1666,153 @@ class BlackHoleAnimation(ShowBase):
         Returns:
             task.cont to keep the task running every frame.
         """
-        self.starNode.setH(self.starNode.getH() + 0.25)
+        accreted = self.accretedParticleCount()
+        extra = {
+            "particle_draw_calls": self.particleDrawCalls(),
+            "accreted": accreted - self.accreted_reported,
+        }
+        self.accreted_reported = accreted
+        if self.sim_clock:
+            extra["sim_steps"] = self.sim_clock.steps
+        if self.resolution:
+            extra["render_scale"] = self.resolution.getScale()
+        self.profiler.endFrame(particles=self.livingParticleCount(), **extra)
         return task.cont
 
-    def spinHole(self, task):
-        """Continuously rotate the black hole sphere around its roll axis.
+    def recordStartup(self, task):
+        """Mark the first frame and the arrival of the last asset.
+
+        Runs after igLoop until both have happened, then prints the startup
+        report if a profile was passed in.
+
+        Args:
+            task: Panda3D task object.
+
+        Returns:
+            task.cont until every asset has loaded, then task.done.
+        """
+        self.startup.mark("first frame")
+        if self.asset_loader.pending:
+            return task.cont
+        self.startup.mark("assets loaded")
+        if self.print_startup:
+            print(self.startup.report())
+        return task.done
+
+    def traceFrame(
+        self,
+        path: str,
+        workers: int = None,
+        tile: int = 64,
+        background: bool = True,
+        progress=None,
+    ):
+        """Render the current view with the geodesic ray tracer.
+
+        The tracer sees the black hole, photon ring and main accretion disk
+        from the scene's camera, against the star map in images/stars.jpg.
+
+        Args:
+            path:       Output image file (RGBA).
+            workers:    Worker processes; None uses every core.
+            tile:       Tile edge in pixels.
+            background: Draw the star map; if False escaped rays are left
+                        transparent for compositing over a Panda3D frame.
+            progress:   Optional callable(done, total, elapsed, rays) run
+                        after each tile (see raytrace.print_progress).
+
+        Returns:
+            The (height, width, 4) float32 RGBA image.
+        """
+        quat = self.cam.getQuat(self.render)
+        tracer = GeodesicTracer(
+            rs=self.bh_rad,
+            camera_pos=self.cam.getPos(self.render)
+            - self.HoleNodePath.getPos(self.render),
+            camera_axes=(quat.getRight(), quat.getForward(), quat.getUp()),
+            fov=self.camLens.getFov(),
+            size=(self.win.getXSize(), self.win.getYSize()),
+            photon_rad=self.photon_rad,
+            disk_inner=self.photon_rad,
+            disk_outer=self.adisk_rad,
+            disk_color=self.particle_color,
+            ring_color=self.particle_color,
+            sky=load_sky("images/stars.jpg") if background else None,
+            background=background,
+            tile=tile,
+        )
+        image = tracer.render(workers=workers, progress=progress)
+        save_image(image, path)
+        return image
+
+    def updateLensing(self, task):
+        """Re-warp the lensed background once the view has moved enough.
+
+        Args:
+            task: Panda3D task object.
+
+        Returns:
+            task.cont to keep the task running every frame.
+        """
+        if self.lens is None:
+            # still loading
+            return task.cont
+        self.lens.update(
+            self.HoleNodePath.getPos(self.cam), self.bh_rad, self.camLens.getFov()
+        )
+        return task.cont
+
+    def updateGovernor(self, task):
+        """Feed the last frame time to the resolution / particle budget governor.
+
+        Wall-clock time from the profiler is used rather than the clock's dt,
+        which is fixed when rendering offscreen.
+
+        Args:
+            task: Panda3D task object.
+
+        Returns:
+            task.cont to keep the task running every frame.
+        """
+        row = self.profiler.last_row
+        frame_ms = row.get("frame_ms")
+        if frame_ms is not None:
+            self.governor.update(
+                frame_ms,
+                active=self.isBudgetActive,
+                work_ms=frame_ms - row.get("App:Flip_ms", 0.0),
+            )
+        return task.cont
+
+    def refreshPeriod(self) -> Optional[float]:
+        """Return the refresh period in ms frames wait for, or None without
+        sync-video. Displays that do not report their rate count as 60 Hz."""
+        if not ConfigVariableBool("sync-video", True).getValue():
+            return None
+        info = self.pipe.getDisplayInformation()
+        index = info.getCurrentDisplayModeIndex() if info else -1
+        rate = info.getDisplayModeRefreshRate(index) if index >= 0 else 0
+        return 1e3 / (rate or 60)
+
+    def flipFrame(self, task):
+        """Flip the last frame before igLoop, which then skips its own flip.
+
+        Args:
+            task: Panda3D task object.
+
+        Returns:
+            task.cont to keep the task running every frame.
+        """
+        self.graphicsEngine.flipFrame()
+        return task.cont
+
+    def isBudgetActive(self, key: str) -> bool:
+        """Return whether cutting a governor key can save time: the render
+        resolution always, an effect only while it runs."""
+        return key == "resolution" or self.isEffectEnabled(key)
+
+    def updateResolution(self, task):
+        """Keep the dynamic resolution buffer in step with the window.
 
         Args:
             task: Panda3D task object.
@@ -577,5 +1820,5 @@ class BlackHoleAnimation(ShowBase):
         Returns:
             task.cont to keep the task running every frame.
         """
-        self.HoleNodePath.setR(self.HoleNodePath.getR() + 2)
+        self.resolution.update()
         return task.cont
@@ -0,0 +1,240 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+import numpy as np
+from panda3d.core import Filename, GraphicsOutput, Texture
+
+# output extensions that are piped to an encoder instead of written as PNGs
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm")
+
+
+def encoder_command(path: str, size, fps: float):
+    """Return an ffmpeg command that encodes raw BGRA frames from stdin.
+
+    Panda3D images are stored bottom row first, so the encoder flips them.
+
+    Raises:
+        RuntimeError: If ffmpeg is not on the PATH.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("recording to a video file needs ffmpeg on the PATH")
+    width, height = size
+    return [
+        ffmpeg, "-loglevel", "error", "-y",
+        "-f", "rawvideo", "-pix_fmt", "bgra",
+        "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "-",
+        "-vf", "vflip", "-pix_fmt", "yuv420p", path,
+    ]  # fmt: skip
+
+
+class FrameCapture:
+    """Capture rendered frames without blocking the render loop on disk.
+
+    The window renders into a texture that Panda3D copies to RAM after every
+    frame. capture() copies that image into one of a fixed ring of
+    preallocated buffers and queues it; background threads encode and write
+    the buffers, then hand them back. Every buffer is a view of its own
+    texture's RAM image, so the PNG writers encode it in place. The only
+    work left on the main thread is one memcpy per frame.
+
+    When every buffer is in flight the encoders have fallen behind. By
+    default the frame is then dropped so the main loop keeps its pace; with
+    ``block=True`` capture() waits for a buffer instead, which keeps every
+    frame (for offline renders) at the cost of stalling.
+
+    Frames are written as a PNG sequence, or, when ``target`` ends in a
+    video extension, piped as raw BGRA to an encoder process by a single
+    writer thread so they stay in order.
+    """
+
+    def __init__(
+        self,
+        win,
+        target: str,
+        fps: float = 30.0,
+        buffers: int = 8,
+        workers: int = 2,
+        block: bool = False,
+        command=None,
+    ):
+        """
+        Args:
+            win:      The GraphicsOutput to capture.
+            target:   Output directory for PNGs, or a video file path.
+            fps:      Frame rate passed to the encoder.
+            buffers:  Number of frame buffers in the ring; also the most
+                      frames that can wait to be written.
+            workers:  PNG encoder threads (a video is written by one).
+            block:    Wait for a free buffer instead of dropping the frame.
+            command:  Encoder command line reading raw frames from stdin;
+                      defaults to encoder_command() for video targets.
+        """
+        self.win = win
+        self.target = target
+        self.block = block
+        self.width = win.getXSize()
+        self.height = win.getYSize()
+
+        self.texture = Texture("frame capture")
+        win.addRenderTexture(self.texture, GraphicsOutput.RTMCopyRam)
+
+        self.video = target.lower().endswith(VIDEO_EXTENSIONS)
+        self.encoder = None
+        if self.video:
+            command = command or encoder_command(target, (self.width, self.height), fps)
+            self.encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+            workers = 1
+        else:
+            os.makedirs(target, exist_ok=True)
+
+        self.textures = []
+        self.buffers = []
+        for slot in range(buffers):
+            texture = Texture(f"frame buffer {slot}")
+            texture.setup2dTexture(
+                self.width, self.height, Texture.T_unsigned_byte, Texture.F_rgba
+            )
+            self.textures.append(texture)
+            self.buffers.append(
+                np.frombuffer(memoryview(texture.modifyRamImage()), dtype=np.uint8)
+            )
+        self.free = queue.Queue()
+        for slot in range(buffers):
+            self.free.put(slot)
+        self.pending = queue.Queue()
+
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.frames = set()
+        self.max_queued = 0
+        self.capture_seconds = 0.0
+        self.stall_seconds = 0.0
+        self.encode_seconds = 0.0
+        self.errors = []
+        self._lock = threading.Lock()
+
+        self.threads = [
+            threading.Thread(target=self._work, name=f"capture-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    # -------------------------------------------------------------------------
+    # Main thread
+    # -------------------------------------------------------------------------
+
+    def capture(self, frame: int) -> bool:
+        """Queue the most recently rendered frame for writing.
+
+        Call after the frame has been rendered (after igLoop).
+
+        Args:
+            frame: Frame number, used for the PNG file name.
+
+        Returns:
+            False if the frame was dropped or nothing has been rendered yet.
+        """
+        t0 = time.perf_counter()
+        image = self.texture.getRamImage()
+        if not image:
+            return False
+
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            if not self.block:
+                self.dropped += 1
+                return False
+            slot = self.free.get()
+            self.stall_seconds += time.perf_counter() - t0
+
+        self.buffers[slot][:] = np.frombuffer(memoryview(image), dtype=np.uint8)
+        self.pending.put((frame, slot))
+        self.captured += 1
+        self.max_queued = max(self.max_queued, self.pending.qsize())
+        self.capture_seconds += time.perf_counter() - t0
+        return True
+
+    def task(self, task):
+        """Task (sort > 50) that captures every frame as it is rendered."""
+        self.capture(task.frame)
+        return task.cont
+
+    def close(self) -> dict:
+        """Write out every queued frame, stop the workers and return stats."""
+        for _ in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.encoder:
+            self.encoder.stdin.close()
+            self.encoder.wait()
+        self.win.clearRenderTextures()
+        if self.errors:
+            raise self.errors[0]
+        return self.stats()
+
+    def stats(self) -> dict:
+        """Return frame counts and per-frame main-thread / encoder costs."""
+        captured = max(self.captured, 1)
+        return {
+            "captured": self.captured,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": self.pending.qsize(),
+            "max_queued": self.max_queued,
+            "capture_ms": self.capture_seconds / captured * 1e3,
+            "stall_ms": self.stall_seconds / captured * 1e3,
+            "encode_ms": self.encode_seconds / max(self.written, 1) * 1e3,
+        }
+
+    def report(self) -> str:
+        """Return a one-line summary of stats()."""
+        stats = self.stats()
+        return (
+            f"captured {stats['captured']} frames ({stats['dropped']} dropped, "
+            f"{stats['failed']} failed to write, "
+            f"{stats['queued']} queued, at most {stats['max_queued']}): "
+            f"{stats['capture_ms']:.2f} ms/frame on the render loop, "
+            f"{stats['stall_ms']:.2f} ms/frame stalled, "
+            f"{stats['encode_ms']:.1f} ms/frame encoding"
+        )
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def _work(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            frame, slot = item
+            t0 = time.perf_counter()
+            try:
+                if self.encoder:
+                    self.encoder.stdin.write(self.buffers[slot].data)
+                else:
+                    path = os.path.join(self.target, f"frame_{frame:06d}.png")
+                    if not self.textures[slot].write(Filename.fromOsSpecific(path)):
+                        raise OSError(f"could not write {path}")
+            except Exception as e:
+                with self._lock:
+                    self.errors.append(e)
+                    self.failed += 1
+            else:
+                with self._lock:
+                    self.frames.add(frame)
+                    self.written += 1
+                    self.encode_seconds += time.perf_counter() - t0
+            finally:
+                self.free.put(slot)
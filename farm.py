@@ -0,0 +1,198 @@
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from capture import VIDEO_EXTENSIONS
+
+
+def split_range(start: int, end: int, chunk: int):
+    """Split frames [start, end) into consecutive (start, end) chunks."""
+    return [(s, min(s + chunk, end)) for s in range(start, end, chunk)]
+
+
+def concat_command(frames_list: str, path: str, fps: float):
+    """Return an ffmpeg command that encodes a stitched concat list to a video.
+
+    Raises:
+        RuntimeError: If ffmpeg is not on the PATH.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("farming to a video file needs ffmpeg on the PATH")
+    return [
+        ffmpeg, "-loglevel", "error", "-y",
+        "-f", "concat", "-i", frames_list,
+        "-r", f"{fps:g}", "-pix_fmt", "yuv420p", path,
+    ]  # fmt: skip
+
+
+def render_chunk(job: dict) -> dict:
+    """Render one chunk of frames in a fresh offscreen ShowBase.
+
+    Runs in a worker process. The scene is seeded and driven by the fixed
+    clock of render_frame_range, so frame N comes out the same no matter
+    which worker renders it; frames before the chunk are simulated but not
+    written.
+
+    Args:
+        job: Dict with start, end, out_dir, fps, size, software, seed and
+             options (keyword arguments for BlackHoleAnimation).
+
+    Returns:
+        Dict with the chunk bounds, worker pid and timings.
+    """
+    t0 = time.perf_counter()
+    from offscreen import configure_offscreen, render_frame_range
+
+    configure_offscreen(*job["size"], software=job["software"])
+    from black_hole_anim import BlackHoleAnimation
+
+    app = BlackHoleAnimation(offscreen=True, seed=job["seed"], **job["options"])
+    boot = time.perf_counter() - t0
+
+    start, end = job["start"], job["end"]
+    fps = render_frame_range(app, start, end, job["out_dir"], fps=job["fps"])
+    app.destroy()
+
+    total = time.perf_counter() - t0
+    render = (end - start) / fps if fps else 0.0
+    return {
+        "start": start,
+        "end": end,
+        "pid": os.getpid(),
+        "fps": fps,
+        "boot": boot,
+        "warmup": total - boot - render,
+        "seconds": total,
+    }
+
+
+def render_farm(
+    start: int,
+    end: int,
+    out_dir: str,
+    workers: int = None,
+    chunk: int = 60,
+    fps: float = 30.0,
+    size=(1280, 820),
+    software: bool = False,
+    seed: int = 0,
+    options: dict = None,
+    report=print,
+):
+    """Render frames [start, end) across worker processes and stitch them.
+
+    The range is cut into chunks of ``chunk`` frames. Every chunk is rendered
+    by its own worker process into a private directory; once all are done,
+    the coordinator moves the frames into ``out_dir`` in order as
+    ``frame_NNNNNN.png`` and writes ``frames.txt``, an ffmpeg concat list
+    (``ffmpeg -f concat -i frames.txt out.mp4``). When ``out_dir`` names a
+    video file instead, the frames are stitched in a temporary directory
+    next to it, encoded from that list and then removed.
+
+    Args:
+        start:    First frame number to write.
+        end:      Frame number to stop before.
+        out_dir:  Output directory, or a video file (see
+                  capture.VIDEO_EXTENSIONS).
+        workers:  Worker processes; None uses every core.
+        chunk:    Frames per chunk. Every worker simulates the frames before
+                  its chunk, so larger chunks waste less time warming up
+                  while smaller ones balance better.
+        fps:      Simulated frames per second.
+        size:     Offscreen buffer (width, height).
+        software: Use the tinydisplay software renderer.
+        seed:     Random seed shared by every worker.
+        options:  Extra keyword arguments for BlackHoleAnimation.
+        report:   Callable receiving one progress line per finished chunk
+                  and the summary; None for silence.
+
+    Returns:
+        List of per-chunk stats from render_chunk, in frame order.
+
+    Raises:
+        RuntimeError: If out_dir is a video file and ffmpeg is missing.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = split_range(start, end, chunk)
+    frames_dir = out_dir
+    command = None
+    if out_dir.lower().endswith(VIDEO_EXTENSIONS):
+        parent = os.path.dirname(os.path.abspath(out_dir))
+        os.makedirs(parent, exist_ok=True)
+        frames_dir = tempfile.mkdtemp(prefix=".frames-", dir=parent)
+        frames_list = os.path.join(frames_dir, "frames.txt")
+        try:
+            command = concat_command(frames_list, out_dir, fps)
+        except RuntimeError:
+            shutil.rmtree(frames_dir)
+            raise
+    staging = os.path.join(frames_dir, ".chunks")
+    jobs = [
+        {
+            "start": s,
+            "end": e,
+            "out_dir": os.path.join(staging, f"{s:06d}"),
+            "fps": fps,
+            "size": tuple(size),
+            "software": software,
+            "seed": seed,
+            "options": options or {},
+        }
+        for s, e in chunks
+    ]
+    report = report or (lambda line: None)
+    report(
+        f"rendering {end - start} frames at {fps:g} fps in {len(chunks)} chunks "
+        f"of {chunk} on {workers} workers"
+    )
+
+    t0 = time.perf_counter()
+    stats = []
+    # a fresh process per chunk, since ShowBase cannot be rebuilt in-process
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(render_chunk, jobs):
+            stats.append(result)
+            report(
+                f"chunk {len(stats)}/{len(chunks)} frames "
+                f"{result['start']}-{result['end'] - 1} (pid {result['pid']}): "
+                f"{result['fps']:.1f} frames/sec, "
+                f"boot {result['boot']:.1f} s, warmup {result['warmup']:.1f} s"
+            )
+    elapsed = time.perf_counter() - t0
+
+    stitch(jobs, frames_dir, fps)
+    shutil.rmtree(staging, ignore_errors=True)
+
+    stats.sort(key=lambda s: s["start"])
+    report(
+        f"rendered {end - start} frames in {elapsed:.1f} s "
+        f"({(end - start) / elapsed:.1f} frames/sec overall)"
+    )
+    if command:
+        subprocess.run(command, check=True)
+        shutil.rmtree(frames_dir)
+        report(f"encoded {out_dir}")
+    return stats
+
+
+def stitch(jobs, out_dir: str, fps: float):
+    """Move every chunk's frames into out_dir in order and list them.
+
+    Raises:
+        FileNotFoundError: If a chunk is missing a frame.
+    """
+    names = []
+    for job in sorted(jobs, key=lambda job: job["start"]):
+        for frame in range(job["start"], job["end"]):
+            name = f"frame_{frame:06d}.png"
+            os.replace(os.path.join(job["out_dir"], name), os.path.join(out_dir, name))
+            names.append(name)
+
+    with open(os.path.join(out_dir, "frames.txt"), "w") as f:
+        for name in names:
+            f.write(f"file '{name}'\nduration {1 / fps:.6f}\n")
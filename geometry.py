@@ -0,0 +1,301 @@
+import numpy as np
+from panda3d.core import (
+    Geom,
+    GeomLines,
+    GeomLinestrips,
+    GeomTriangles,
+    GeomVertexArrayFormat,
+    GeomVertexData,
+    GeomVertexFormat,
+    LODNode,
+    NodePath,
+)
+
+# on-screen length (pixels) of a circle's edge at which the next finer level
+# of detail takes over
+LOD_EDGE_PIXELS = 12.0
+
+# position + float color, for geometry with per-vertex colors
+_COLORED_ARRAY = GeomVertexArrayFormat()
+_COLORED_ARRAY.addColumn("vertex", 3, Geom.NT_float32, Geom.C_point)
+_COLORED_ARRAY.addColumn("color", 4, Geom.NT_float32, Geom.C_color)
+COLORED_FORMAT = GeomVertexFormat.registerFormat(_COLORED_ARRAY)
+
+# underside arcs of the Ursina prototype (archive/First-attempt-Ursina.py):
+# its horizon radius, first arc radius, and inner / outer arc colors
+_PROTOTYPE_HORIZON = 2.5
+_PROTOTYPE_ARC_RADIUS = 5 / 1.5
+_ARC_INNER_RGB = np.array([255, 252, 200], dtype=np.float32) / 255
+_ARC_OUTER_RGB = np.array([237, 130, 54], dtype=np.float32) / 255
+
+
+def sphere_arrays(radius: float, slices: int, stacks: int):
+    """Compute sphere vertices, normals and triangle indices as NumPy arrays.
+
+    Uses the same (stacks + 1) x (slices + 1) vertex grid and winding as the
+    original per-vertex loop, so the resulting mesh is identical.
+
+    Args:
+        radius: Sphere radius.
+        slices: Number of subdivisions around the x-y plane.
+        stacks: Number of subdivisions around the y-z plane.
+
+    Returns:
+        Tuple of (vertices, normals, indices): float32 arrays of shape (N, 3)
+        and a flat uint32 index array of length stacks * slices * 6.
+    """
+    phi = (2 * np.pi) * (np.arange(stacks + 1) / stacks)
+    theta = (2 * np.pi) * (np.arange(slices + 1) / slices)
+
+    normals = np.empty((stacks + 1, slices + 1, 3), dtype=np.float32)
+    normals[..., 0] = np.outer(np.cos(phi), np.cos(theta))
+    normals[..., 1] = np.outer(np.cos(phi), np.sin(theta))
+    normals[..., 2] = np.sin(phi)[:, None]
+    normals = normals.reshape(-1, 3)
+    vertices = normals * np.float32(radius)
+
+    i, j = np.meshgrid(
+        np.arange(stacks, dtype=np.uint32),
+        np.arange(slices, dtype=np.uint32),
+        indexing="ij",
+    )
+    k1 = i * (slices + 1) + j
+    k2 = k1 + (slices + 1)
+    indices = np.stack([k1, k2, k1 + 1, k1 + 1, k2, k2 + 1], axis=-1).ravel()
+
+    return vertices, normals, indices
+
+
+def ring_arrays(radius: float, samples: int = 500):
+    """Compute a closed circle in the x-z plane as a NumPy vertex array.
+
+    The upper half is sampled at ``samples`` evenly spaced x values and the
+    lower half walks the same x values back, giving 2 * samples vertices.
+
+    Args:
+        radius:  Circle radius.
+        samples: Number of x samples per half circle.
+
+    Returns:
+        float32 array of shape (2 * samples, 3).
+    """
+    x = np.linspace(-radius, radius, samples)
+    z = np.sqrt(np.maximum(radius**2 - x**2, 0))
+
+    vertices = np.zeros((2 * samples, 3), dtype=np.float32)
+    vertices[:samples, 0] = x
+    vertices[:samples, 2] = z
+    vertices[samples:, 0] = x[::-1]
+    vertices[samples:, 2] = -z[::-1]
+    return vertices
+
+
+def arc_radii(radius: float, count: int = 200) -> np.ndarray:
+    """Radii of the Ursina prototype's underside arcs around a horizon.
+
+    The gaps grow quadratically from arc to arc, with one wide jump at
+    count / 1.1 that sets the outer band apart. Scaled from the prototype's
+    horizon to radius.
+
+    Args:
+        radius: Event horizon radius.
+        count:  Number of arcs.
+
+    Returns:
+        float32 array of count radii, innermost first.
+    """
+    step = (count / 10000) * np.linspace(0, 1, count) ** 2
+    step[round(count / 1.1)] = 0.08
+    offsets = np.concatenate([[0.0], np.cumsum(step[:-1])])
+    scale = radius / _PROTOTYPE_HORIZON
+    return ((_PROTOTYPE_ARC_RADIUS + offsets) * scale).astype(np.float32)
+
+
+def arc_arrays(radius: float, count: int = 200, segments: int = 360):
+    """Compute the underside arcs as circles in the x-z plane.
+
+    Every circle is sampled at evenly spaced angles, rather than at evenly
+    spaced heights like the prototype, so its edges are all the same length.
+    Colors blend from pale yellow on the innermost arc to orange on the
+    outermost, with alpha falling off by 1/255 per arc.
+
+    Args:
+        radius:   Event horizon radius (see arc_radii).
+        count:    Number of arcs.
+        segments: Edges per arc.
+
+    Returns:
+        Tuple of (vertices, colors, indices): float32 arrays of shape
+        (count * segments, 3) and (count * segments, 4), and a flat uint32
+        array of line-segment index pairs closing every circle.
+    """
+    radii = arc_radii(radius, count)
+    theta = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+
+    vertices = np.zeros((count, segments, 3), dtype=np.float32)
+    vertices[..., 0] = np.outer(radii, np.cos(theta))
+    vertices[..., 2] = np.outer(radii, np.sin(theta))
+
+    t = np.linspace(0, 1, count, dtype=np.float32)[:, None]
+    colors = np.empty((count, 4), dtype=np.float32)
+    colors[:, :3] = _ARC_INNER_RGB + t * (_ARC_OUTER_RGB - _ARC_INNER_RGB)
+    colors[:, 3] = (255 - np.arange(count)) / 255
+    colors = np.repeat(colors, segments, axis=0)
+
+    start = np.arange(count * segments, dtype=np.uint32).reshape(count, segments)
+    end = np.roll(start, -1, axis=1)
+    indices = np.stack([start, end], axis=-1).ravel()
+
+    return vertices.reshape(-1, 3), colors, indices
+
+
+def _array_view(array_data, dtype) -> np.ndarray:
+    """Wrap a GeomVertexArrayData's buffer as a writable flat NumPy array."""
+    return np.frombuffer(memoryview(array_data).cast("B"), dtype=dtype)
+
+
+def make_vertex_data(name: str, vertex_format, *columns) -> GeomVertexData:
+    """Create a GeomVertexData and fill its first array in one bulk copy.
+
+    Args:
+        name:          Name of the vertex data.
+        vertex_format: Single-array GeomVertexFormat whose columns are all
+                       float32 and appear in the same order as ``columns``.
+        columns:       (N, k) arrays, interleaved row-wise into the buffer.
+
+    Returns:
+        The populated GeomVertexData.
+    """
+    num_rows = len(columns[0])
+    vertex_data = GeomVertexData(name, vertex_format, Geom.UHStatic)
+    vertex_data.uncleanSetNumRows(num_rows)
+
+    rows = _array_view(vertex_data.modifyArray(0), np.float32).reshape(num_rows, -1)
+    offset = 0
+    for column in columns:
+        width = column.shape[1]
+        rows[:, offset : offset + width] = column
+        offset += width
+    return vertex_data
+
+
+def make_sphere_geom(radius: float, slices: int, stacks: int) -> Geom:
+    """Build the event-horizon sphere Geom from vectorized arrays.
+
+    Args:
+        radius: Sphere radius.
+        slices: Number of subdivisions around the x-y plane.
+        stacks: Number of subdivisions around the y-z plane.
+
+    Returns:
+        A Geom holding a single GeomTriangles primitive.
+    """
+    vertices, normals, indices = sphere_arrays(radius, slices, stacks)
+    vertex_data = make_vertex_data(
+        "sphere", GeomVertexFormat.getV3n3(), vertices, normals
+    )
+
+    triangles = GeomTriangles(Geom.UHStatic)
+    triangles.setIndexType(Geom.NT_uint32)
+    index_data = triangles.modifyVertices()
+    index_data.uncleanSetNumRows(len(indices))
+    _array_view(index_data, np.uint32)[:] = indices
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(triangles)
+    return geom
+
+
+def make_ring_geom(radius: float, samples: int = 500) -> Geom:
+    """Build the photon ring Geom as a single closed linestrip.
+
+    Args:
+        radius:  Ring radius.
+        samples: Number of x samples per half circle.
+
+    Returns:
+        A Geom holding a single GeomLinestrips primitive.
+    """
+    vertices = ring_arrays(radius, samples)
+    vertex_data = make_vertex_data("circle", GeomVertexFormat.getV3(), vertices)
+
+    lines = GeomLinestrips(Geom.UHStatic)
+    lines.addConsecutiveVertices(0, len(vertices))
+    lines.closePrimitive()
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(lines)
+    return geom
+
+
+def make_arcs_geom(radius: float, count: int = 200, segments: int = 360) -> Geom:
+    """Build every underside arc into one Geom, drawn with one call.
+
+    Args:
+        radius:   Event horizon radius (see arc_radii).
+        count:    Number of arcs.
+        segments: Edges per arc.
+
+    Returns:
+        A Geom holding a single indexed GeomLines primitive.
+    """
+    vertices, colors, indices = arc_arrays(radius, count, segments)
+    vertex_data = make_vertex_data("arcs", COLORED_FORMAT, vertices, colors)
+
+    lines = GeomLines(Geom.UHStatic)
+    lines.setIndexType(Geom.NT_uint32)
+    index_data = lines.modifyVertices()
+    index_data.uncleanSetNumRows(len(indices))
+    _array_view(index_data, np.uint32)[:] = indices
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(lines)
+    return geom
+
+
+def lod_distance(
+    radius: float,
+    segments: int,
+    fov: float,
+    height: int,
+    edge_pixels: float = LOD_EDGE_PIXELS,
+) -> float:
+    """Return the camera distance below which a circle needs more segments.
+
+    A circle of the given radius drawn with ``segments`` straight edges
+    covers ``radius * height / (2 * d * tan(fov / 2))`` pixels of radius at
+    distance d; closer than the returned distance its edges are longer
+    than ``edge_pixels`` on screen.
+
+    Args:
+        radius:      Radius of the circle (or sphere silhouette).
+        segments:    Edges around the full circle.
+        fov:         Vertical field of view in degrees.
+        height:      Viewport height in pixels.
+        edge_pixels: Longest acceptable on-screen edge.
+    """
+    tan = np.tan(np.radians(fov) / 2)
+    return np.pi * radius * height / (segments * edge_pixels * tan)
+
+
+def make_lod_node(name: str, levels) -> NodePath:
+    """Put detail levels of one object under a single LODNode.
+
+    Args:
+        name:   Name of the LODNode.
+        levels: (node, distance) pairs, finest first, where distance is how
+                close the camera may come before the previous, finer level
+                takes over (see lod_distance); the first level is used all
+                the way in.
+
+    Returns:
+        NodePath of the LODNode, ready to be instanced under every copy of
+        the object.
+    """
+    lod = NodePath(LODNode(name))
+    for i, (node, _) in enumerate(levels):
+        near = levels[i][1] if i else 0.0
+        far = levels[i + 1][1] if i + 1 < len(levels) else float("inf")
+        lod.node().addSwitch(far, near)
+        lod.attachNewNode(node)
+    return lod
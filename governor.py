@@ -0,0 +1,116 @@
+from collections import deque
+
+import numpy as np
+
+
+class ParticleBudgetGovernor:
+    """Scale particle budgets up and down to hold a frame-time target.
+
+    Recent frame times are kept in a sliding window. When their 90th
+    percentile exceeds the target, the first still-running effect in
+    ``effects`` (least visible first) has its budget cut by ``step``; when it
+    drops below ``headroom * target``, budget is handed back in reverse order.
+    After every change the window is cleared and the governor waits
+    ``cooldown`` frames so the effect of the change can be measured.
+
+    Keys need not be particle effects: anything that can be scaled down,
+    such as the render resolution, can take part under its own floor.
+
+    Under vsync a frame never measures less than the refresh period, so
+    wall-clock times alone can never show headroom. Given ``vsync_ms`` and
+    each frame's work time (the frame minus its wait for the flip), budget
+    is also handed back once the work fits in ``headroom`` of a refresh
+    period.
+    """
+
+    def __init__(
+        self,
+        effects,
+        apply,
+        target_ms: float = 16.6,
+        window: int = 30,
+        step: float = 0.2,
+        min_scale: float = 0.1,
+        headroom: float = 0.8,
+        cooldown: int = 15,
+        min_scales=None,
+        vsync_ms: float = None,
+    ):
+        """
+        Args:
+            effects:   Effect keys, in the order they should be degraded.
+            apply:     Callable(key, scale) that applies a budget scale in
+                       (0, 1] to an effect.
+            target_ms: Frame-time target in milliseconds.
+            window:    Number of recent frames considered.
+            step:      Fraction of an effect's budget removed per adjustment.
+            min_scale: Lowest budget scale an effect is reduced to.
+            headroom:  Budget is restored below headroom * target_ms.
+            cooldown:  Frames to wait after an adjustment.
+            min_scales: Per-key floors overriding min_scale.
+            vsync_ms:  Refresh period frames are synchronized to, or None.
+        """
+        self.effects = list(effects)
+        self.apply = apply
+        self.target_ms = target_ms
+        self.step = step
+        self.min_scale = min_scale
+        self.headroom = headroom
+        self.cooldown = cooldown
+        self.min_scales = {key: min_scale for key in self.effects}
+        self.min_scales.update(min_scales or {})
+        self.vsync_ms = vsync_ms
+
+        self.scales = {key: 1.0 for key in self.effects}
+        self.frame_times = deque(maxlen=window)
+        self.work_times = deque(maxlen=window)
+        self.wait = 0
+
+    def update(
+        self, frame_ms: float, active=lambda key: True, work_ms: float = None
+    ) -> bool:
+        """Record one frame time and adjust budgets if needed.
+
+        Args:
+            frame_ms: Wall-clock duration of the last frame.
+            active:   Predicate telling whether an effect is running; stopped
+                      effects are skipped since cutting them saves nothing.
+            work_ms:  Duration of the last frame without its vsync wait;
+                      defaults to frame_ms.
+
+        Returns:
+            True if a budget was changed this frame.
+        """
+        self.frame_times.append(frame_ms)
+        self.work_times.append(frame_ms if work_ms is None else work_ms)
+        if self.wait > 0:
+            self.wait -= 1
+            return False
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        measured = float(np.percentile(self.frame_times, 90))
+        slack = measured < self.headroom * self.target_ms
+        if self.vsync_ms:
+            work = float(np.percentile(self.work_times, 90))
+            slack = slack or work < self.headroom * self.vsync_ms
+        if measured > self.target_ms:
+            for key in self.effects:
+                floor = self.min_scales[key]
+                if active(key) and self.scales[key] > floor:
+                    scale = max(floor, self.scales[key] * (1 - self.step))
+                    return self._set(key, scale)
+        elif slack:
+            for key in reversed(self.effects):
+                if active(key) and self.scales[key] < 1.0:
+                    scale = min(1.0, self.scales[key] / (1 - self.step))
+                    return self._set(key, scale)
+        return False
+
+    def _set(self, key: str, scale: float) -> bool:
+        self.scales[key] = scale
+        self.apply(key, scale)
+        self.frame_times.clear()
+        self.work_times.clear()
+        self.wait = self.cooldown
+        return True
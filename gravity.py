@@ -0,0 +1,128 @@
+import numpy as np
+
+# offsets of a cell's 8 corners along each axis, x varying slowest
+_CORNERS = np.array(
+    [(i, j, k) for i in (0, 1) for j in (0, 1) for k in (0, 1)], dtype=np.int32
+)
+
+
+class GravityGrid:
+    """Summed pull of several sinks, sampled on a regular 3-D grid.
+
+    Every body is a sink with a ``center`` and a ``field(pos)`` method (see
+    np_particles.SinkForce), in world space. Each body's field is sampled at
+    the grid points once and kept, and the grid holds their sum, so particles
+    pay for one trilinear lookup however many bodies there are. When a body
+    moves only its own contribution is resampled and swapped into the sum.
+
+    Positions outside the grid read the nearest boundary value, so the bounds
+    should cover everywhere particles are expected to go.
+    """
+
+    def __init__(self, sinks, bounds_min, bounds_max, resolution: int = 32):
+        """
+        Args:
+            sinks:      The bodies; moved later through move().
+            bounds_min: World-space (x, y, z) of the first grid point.
+            bounds_max: World-space (x, y, z) of the last grid point.
+            resolution: Grid points along each axis.
+        """
+        self.sinks = list(sinks)
+        self.lo = np.asarray(bounds_min, dtype=np.float32)
+        self.hi = np.asarray(bounds_max, dtype=np.float32)
+        self.resolution = resolution
+        self.cell = (self.hi - self.lo) / (resolution - 1)
+
+        axes = [np.linspace(lo, hi, resolution) for lo, hi in zip(self.lo, self.hi)]
+        grid = np.meshgrid(*axes, indexing="ij")
+        self.points = np.stack(grid, axis=-1).reshape(-1, 3).astype(np.float32)
+        # flat index offsets of a cell's corners
+        strides = np.array([resolution * resolution, resolution, 1], dtype=np.int32)
+        self.corner_offsets = _CORNERS @ strides
+
+        self.contributions = [sink.field(self.points) for sink in self.sinks]
+        self.field = np.sum(self.contributions, axis=0, dtype=np.float32)
+        self.updates = 0
+
+    def move(self, index: int, center, tolerance: float = 0.0) -> bool:
+        """Move body index to center and update the summed field.
+
+        Args:
+            index:     Body to move.
+            center:    New world-space center.
+            tolerance: Skip the update while the body has moved less than
+                       this far from where it was last sampled.
+
+        Returns:
+            True if the field was updated.
+        """
+        sink = self.sinks[index]
+        center = np.asarray(center, dtype=np.float32)
+        if np.abs(center - sink.center).max() <= tolerance:
+            return False
+        sink.center = center
+        contribution = sink.field(self.points)
+        self.field += contribution - self.contributions[index]
+        self.contributions[index] = contribution
+        self.updates += 1
+        return True
+
+    def sample(self, pos: np.ndarray) -> np.ndarray:
+        """Return the summed pull on a unit mass at each world position."""
+        last = self.resolution - 1
+        u = (pos - self.lo) / self.cell
+        np.clip(u, 0, last, out=u)
+        # the upper corner of the last cell is clamped back inside
+        base = np.minimum(u.astype(np.int32), last - 1)
+        u -= base
+        fx, fy, fz = u.T
+
+        r = self.resolution
+        flat = (base[:, 0] * r + base[:, 1]) * r + base[:, 2]
+        corners = np.take(self.field, flat + self.corner_offsets[:, None], axis=0)
+
+        # corner weights in the same order as corner_offsets
+        gx, gy, gz = 1 - fx, 1 - fy, 1 - fz
+        xy = np.stack([gx * gy, gx * fy, fx * gy, fx * fy])
+        weights = (xy[:, None] * np.stack([gz, fz])).reshape(8, -1)
+        return np.einsum("kn,knc->nc", weights, corners)
+
+
+class GridSink:
+    """A GravityGrid seen from one particle effect's local space.
+
+    Drop-in replacement for np_particles.SinkForce: positions are mapped into
+    the grid's world space through the effect's transform and the pull is
+    mapped back. The transform is a plain array copied from the scene graph
+    by setFrame() on the App thread, so acceleration() is safe to call from a
+    particle worker.
+    """
+
+    def __init__(self, grid: GravityGrid, mass_dependent: bool = True):
+        """
+        Args:
+            grid:           The shared field.
+            mass_dependent: Divide the pull by the particle mass.
+        """
+        self.grid = grid
+        self.mass_dependent = mass_dependent
+        self.rotation = np.eye(3, dtype=np.float32)
+        self.origin = np.zeros(3, dtype=np.float32)
+
+    def setFrame(self, mat):
+        """Set the effect's local-to-world transform from a Panda3D LMatrix4.
+
+        Panda3D matrices act on row vectors: world = local * mat.
+        """
+        rows = np.array([list(mat.getRow3(i)) for i in range(4)], dtype=np.float32)
+        self.rotation = rows[:3]
+        self.origin = rows[3]
+
+    def acceleration(self, pos: np.ndarray, mass: np.ndarray) -> np.ndarray:
+        """Return the acceleration applied to particles at local pos."""
+        world = pos @ self.rotation + self.origin
+        # rotation is orthonormal, so its transpose maps world vectors back
+        accel = self.grid.sample(world) @ self.rotation.T
+        if self.mass_dependent:
+            accel /= mass[:, None]
+        return accel
@@ -0,0 +1,225 @@
+import math
+
+import numpy as np
+from panda3d.core import LPoint3, SamplerState, Texture
+
+# impact parameter (in Schwarzschild radii) below which light is captured
+CRITICAL_IMPACT = 1.5 * math.sqrt(3)
+
+
+def deflection_table(
+    samples: int = 4096, x_max: float = 1e3, nodes: int = 256
+) -> np.ndarray:
+    """Tabulate the Schwarzschild light deflection angle.
+
+    For a ray with impact parameter b = x * rs passing a black hole of
+    Schwarzschild radius rs, the total bending angle is
+
+        alpha(x) = 2 * integral_0^u0 du / sqrt(1/x^2 - u^2 (1 - u)) - pi
+
+    in units where rs = 1, u0 being the inverse closest-approach radius.
+    Substituting u = u0 (1 - s^2) removes the square-root singularity at u0,
+    leaving a smooth integrand that is summed with Gauss-Legendre quadrature
+    for every x at once. The grid is uniform in log(x - CRITICAL_IMPACT) so it
+    resolves the logarithmic divergence near the photon sphere.
+
+    Args:
+        samples: Number of table entries.
+        x_max:   Largest impact parameter in the table; beyond it the weak
+                 field limit 2 / x is used.
+        nodes:   Quadrature nodes.
+
+    Returns:
+        A (2, samples) float64 array of impact parameters x and angles alpha.
+    """
+    x = CRITICAL_IMPACT + np.geomspace(1e-4, x_max - CRITICAL_IMPACT, samples)
+
+    # closest approach: root of u^2 (1 - u) = 1 / x^2 on (0, 2/3], which is
+    # monotonic there, so bisection converges for every entry
+    target = 1.0 / x**2
+    lo = np.zeros_like(x)
+    hi = np.full_like(x, 2.0 / 3.0)
+    for _ in range(60):
+        mid = 0.5 * (lo + hi)
+        below = mid**2 * (1.0 - mid) < target
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    u0 = 0.5 * (lo + hi)[:, None]
+
+    s, w = np.polynomial.legendre.leggauss(nodes)
+    s = 0.5 * (s + 1.0)
+    w = 0.5 * w
+    u = u0 * (1.0 - s**2)
+    # (g(u0) - g(u)) / (u0 - u) with g(u) = u^2 (1 - u), factored so it does
+    # not cancel as u -> u0
+    h = (u0 + u) - (u0**2 + u0 * u + u**2)
+    alpha = (4.0 * np.sqrt(u0) / np.sqrt(h)) @ w - math.pi
+    return np.stack([x, alpha])
+
+
+def deflection(table: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Look up the deflection angle for impact parameters x (in rs).
+
+    The table grid is uniform in log(x - CRITICAL_IMPACT), so entries are
+    found by direct indexing rather than a binary search. Values below
+    CRITICAL_IMPACT are captured rays and return NaN.
+    """
+    xs, alphas = table
+    q0 = math.log(xs[0] - CRITICAL_IMPACT)
+    dq = (math.log(xs[-1] - CRITICAL_IMPACT) - q0) / (len(xs) - 1)
+
+    x = np.asarray(x, dtype=np.float32)
+    q = np.log(np.maximum(x - CRITICAL_IMPACT, 1e-12, dtype=np.float32))
+    t = np.clip((q - q0) / dq, 0, len(xs) - 1.001)
+    i = t.astype(np.int32)
+    t -= i
+    alphas = alphas.astype(np.float32)
+    alpha = alphas[i] * (1 - t) + alphas[i + 1] * t
+
+    alpha = np.where(x > xs[-1], 2.0 / x, alpha)
+    return np.where(x < CRITICAL_IMPACT, np.float32(np.nan), alpha)
+
+
+class BackgroundLens:
+    """Warp a full-screen background texture around a black hole on the CPU.
+
+    The background is treated as the sky at infinity, seen through the
+    camera's field of view. Every texel's view ray is bent toward the hole by
+    the Schwarzschild deflection of its impact parameter, and the texel takes
+    the colour of the background in the bent direction; rays inside the
+    shadow turn black. The remap is a handful of vectorized NumPy passes over
+    the texture, redone only when the hole's projection on screen or its
+    apparent size drift by more than ``tolerance`` texels.
+    """
+
+    def __init__(self, source: Texture, table: np.ndarray, tolerance: float = 1.0):
+        """
+        Args:
+            source:    Background texture; it must still have its RAM image.
+            table:     Output of deflection_table().
+            tolerance: Movement in texels that triggers a recompute.
+        """
+        self.table = table
+        self.tolerance = tolerance
+        self.width = source.getXSize()
+        self.height = source.getYSize()
+
+        # BGR is Panda3D's native byte order, so no swizzle on upload; rows
+        # run bottom to top, matching screen y
+        image = np.frombuffer(memoryview(source.getRamImageAs("BGR")), dtype=np.uint8)
+        self.source = np.concatenate([image.reshape(-1, 3), np.zeros((1, 3), np.uint8)])
+
+        self.texture = Texture("lensed background")
+        self.texture.setup2dTexture(
+            self.width, self.height, Texture.T_unsigned_byte, Texture.F_rgb
+        )
+        self.texture.setWrapU(SamplerState.WM_clamp)
+        self.texture.setWrapV(SamplerState.WM_clamp)
+        self.texture.setMinfilter(source.getMinfilter())
+        self.texture.setMagfilter(source.getMagfilter())
+
+        # texel centres in normalized device coordinates
+        self.ndc_x = (np.arange(self.width, dtype=np.float32) + 0.5) / self.width
+        self.ndc_x = self.ndc_x * 2 - 1
+        self.ndc_y = (np.arange(self.height, dtype=np.float32) + 0.5) / self.height
+        self.ndc_y = self.ndc_y * 2 - 1
+
+        self.state = None
+        self.updates = 0
+
+    def update(self, hole: LPoint3, rs: float, fov) -> bool:
+        """Re-warp the texture if the view changed by more than the tolerance.
+
+        Args:
+            hole: Hole centre in camera space (Panda3D: +Y forward, +Z up).
+            rs:   Schwarzschild radius, in the same units as hole.
+            fov:  Camera (horizontal, vertical) field of view in degrees.
+
+        Returns:
+            True if the texture was recomputed.
+        """
+        tan_x = math.tan(math.radians(fov[0]) / 2)
+        tan_y = math.tan(math.radians(fov[1]) / 2)
+        distance = hole.length()
+
+        if hole[1] <= rs:
+            # hole behind or around the camera: nothing to bend
+            state = None
+        else:
+            # projected centre and shadow radius, in texels
+            tx = (hole[0] / hole[1] / tan_x + 1) * self.width / 2
+            ty = (hole[2] / hole[1] / tan_y + 1) * self.height / 2
+            shadow = CRITICAL_IMPACT * rs / distance / tan_y * self.height / 2
+            state = (tx, ty, shadow, fov[0], fov[1])
+
+        if self.updates and not self._moved(state):
+            return False
+
+        self.state = state
+        self.updates += 1
+        if state is None:
+            self._upload(self.source[:-1])
+        else:
+            self._upload(self.remap(hole, rs, tan_x, tan_y))
+        return True
+
+    def remap(self, hole: LPoint3, rs: float, tan_x: float, tan_y: float) -> np.ndarray:
+        """Return the lensed image as a flat (height * width, 3) BGR array."""
+        distance = hole.length()
+        h = np.array([hole[0], hole[1], hole[2]], dtype=np.float32) / distance
+
+        # unit view ray of every texel
+        dx = (self.ndc_x * tan_x)[None, :]
+        dz = (self.ndc_y * tan_y)[:, None]
+        inv = 1.0 / np.sqrt(dx * dx + 1.0 + dz * dz)
+        dx = dx * inv
+        dy = inv
+        dz = dz * inv
+
+        # angle to the hole and the unit vector from the ray toward it
+        cos_t = np.clip(dx * h[0] + dy * h[1] + dz * h[2], -1.0, 1.0)
+        sin_t = np.sqrt(1.0 - cos_t * cos_t)
+        sin_t = np.maximum(sin_t, 1e-7)
+        ex = (h[0] - cos_t * dx) / sin_t
+        ey = (h[1] - cos_t * dy) / sin_t
+        ez = (h[2] - cos_t * dz) / sin_t
+
+        alpha = deflection(self.table, distance * sin_t / rs)
+        captured = np.isnan(alpha)
+        alpha = np.where(captured, 0.0, alpha)
+
+        # rotate the ray toward the hole by alpha
+        cos_a = np.cos(alpha)
+        sin_a = np.sin(alpha)
+        sx = cos_a * dx + sin_a * ex
+        sy = cos_a * dy + sin_a * ey
+        sz = cos_a * dz + sin_a * ez
+
+        # rays bent behind the camera reuse the mirrored front view
+        sy = np.maximum(np.abs(sy), 1e-3)
+        u = np.clip((sx / sy / tan_x + 1) * (0.5 * self.width), -1e6, 1e6)
+        v = np.clip((sz / sy / tan_y + 1) * (0.5 * self.height), -1e6, 1e6)
+
+        # directions outside the field of view sample a mirrored copy of the
+        # image rather than smearing its edge texels
+        col = np.floor(u).astype(np.int32) % (2 * self.width)
+        col = np.where(col < self.width, col, 2 * self.width - 1 - col)
+        row = np.floor(v).astype(np.int32) % (2 * self.height)
+        row = np.where(row < self.height, row, 2 * self.height - 1 - row)
+
+        # captured rays index the black texel appended after the image
+        index = row * self.width + col
+        index[captured] = len(self.source) - 1
+        return self.source[index].reshape(-1, 3)
+
+    def _moved(self, state) -> bool:
+        if state is None or self.state is None:
+            return state is not self.state
+        if state[3:] != self.state[3:]:
+            return True
+        return (
+            max(abs(a - b) for a, b in zip(state[:3], self.state[:3])) > self.tolerance
+        )
+
+    def _upload(self, image: np.ndarray):
+        self.texture.setRamImage(np.ascontiguousarray(image).tobytes())
@@ -1,9 +1,437 @@
-from black_hole_anim import BlackHoleAnimation
+import time
+
+LAUNCH = time.perf_counter()
+
+import argparse  # noqa: E402
+
+from startup import StartupProfile  # noqa: E402
+
+# the heavy imports are timed one by one for --startup-profile
+STARTUP = StartupProfile(LAUNCH)
+STARTUP.importModules(
+    (
+        "numpy",
+        "panda3d.core",
+        "direct.showbase.ShowBase",
+        "direct.gui.OnscreenImage",
+        "direct.particles.ParticleEffect",
+    )
+)
+with STARTUP.phase("import app modules"):
+    from panda3d.core import PStatClient
+
+    from black_hole_anim import BlackHoleAnimation
+    from capture import FrameCapture
+    from pipeline import THREADING_MODELS, configure_threading
+
+PARTICLE_EFFECTS = BlackHoleAnimation.PARTICLE_EFFECTS
+PARTICLE_ENGINES = ("panda", "numpy")
+
+
+def parse_engines(values) -> dict:
+    """Turn ``--particle-engine`` values into a per-effect engine mapping.
+
+    A bare engine name applies to every effect; ``EFFECT=ENGINE`` overrides
+    a single one. Later values win.
+    """
+    engines = {}
+    for value in values or []:
+        effect, _, engine = value.rpartition("=")
+        if engine not in PARTICLE_ENGINES:
+            raise argparse.ArgumentTypeError(f"unknown particle engine {engine!r}")
+        if effect and effect not in PARTICLE_EFFECTS:
+            raise argparse.ArgumentTypeError(f"unknown particle effect {effect!r}")
+        for name in [effect] if effect else PARTICLE_EFFECTS:
+            engines[name] = engine
+    return engines
+
+
+def camera_view(args):
+    """Return the (position, look-at point) of --camera / --look-at, filling
+    in the offscreen default for the one not given; None if neither is."""
+    if args.camera is None and args.look_at is None:
+        return None
+    pos, look_at = BlackHoleAnimation.OFFSCREEN_VIEW
+    return (args.camera or pos, args.look_at or look_at)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Black hole animation")
+    parser.add_argument(
+        "--offscreen",
+        action="store_true",
+        help="render a frame range to images without opening a window",
+    )
+    parser.add_argument(
+        "--software",
+        action="store_true",
+        help="use the tinydisplay software renderer (offscreen only)",
+    )
+    parser.add_argument(
+        "--frames",
+        nargs=2,
+        type=int,
+        default=(0, 300),
+        metavar=("START", "END"),
+        help="frame range [START, END) to render (offscreen only)",
+    )
+    parser.add_argument(
+        "--size",
+        nargs=2,
+        type=int,
+        default=(1280, 820),
+        metavar=("WIDTH", "HEIGHT"),
+        help="offscreen buffer size in pixels",
+    )
+    parser.add_argument(
+        "--camera",
+        nargs=3,
+        type=float,
+        metavar=("X", "Y", "Z"),
+        help="camera position of offscreen renders (default: 0 -110 35), or "
+        "where the interactive drive starts",
+    )
+    parser.add_argument(
+        "--look-at",
+        nargs=3,
+        type=float,
+        metavar=("X", "Y", "Z"),
+        help="point the camera faces (offscreen default: the scene's center)",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=30.0, help="simulated frames per second"
+    )
+    parser.add_argument(
+        "--out",
+        default="renders",
+        help="output directory for rendered frames, or a video file (ffmpeg)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="capture the interactive session to a PNG directory, or to a "
+        ".mp4/.mkv/.mov/.webm file through ffmpeg",
+    )
+    parser.add_argument(
+        "--capture-buffers",
+        type=int,
+        default=8,
+        metavar="N",
+        help="frames that may wait to be written before capture drops/blocks",
+    )
+    parser.add_argument(
+        "--capture-workers",
+        type=int,
+        default=2,
+        metavar="N",
+        help="PNG encoder threads",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".cache/assets",
+        help="directory of the on-disk geometry/asset cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always rebuild geometry and decode assets from source",
+    )
+    parser.add_argument(
+        "--particle-engine",
+        action="append",
+        metavar="[EFFECT=]ENGINE",
+        help="particle engine (panda or numpy) for all effects, or for one of "
+        "acc_z, acc_y, star; may be repeated (default: numpy, or panda with "
+        "--cold-start and a single black hole)",
+    )
+    parser.add_argument(
+        "--batch-particles",
+        action="store_true",
+        help="draw every NumPy particle effect with one shared Geom in line "
+        "and point modes; effects default to the numpy engine",
+    )
+    parser.add_argument(
+        "--record-particles",
+        metavar="DIR",
+        help="record every frame's NumPy particle state to a chunked, "
+        "memory-mappable recording; effects default to the numpy engine",
+    )
+    parser.add_argument(
+        "--replay-particles",
+        metavar="DIR",
+        help="draw particles from a --record-particles recording instead of "
+        "simulating them (any size, camera or frame range; works with --farm)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="append per-frame subsystem timings to a rolling .csv/.jsonl file",
+    )
+    parser.add_argument(
+        "--pstats",
+        action="store_true",
+        help="connect to a running PStats server",
+    )
+    parser.add_argument(
+        "--frame-budget",
+        type=float,
+        metavar="MS",
+        help="scale particle budgets at runtime to hold this frame time",
+    )
+    parser.add_argument(
+        "--threading-model",
+        default="",
+        choices=THREADING_MODELS,
+        metavar="MODEL",
+        help="run Cull and/or Draw on their own threads: Cull, /Draw, "
+        "Cull/Draw or /Cull/Draw (default: single-threaded); interactive "
+        "runs only",
+    )
+    parser.add_argument(
+        "--particle-worker",
+        action="store_true",
+        help="step NumPy particle effects on a worker thread",
+    )
+    parser.add_argument(
+        "--lensing",
+        action="store_true",
+        help="bend the background around the black hole (CPU)",
+    )
+    parser.add_argument(
+        "--raytrace",
+        metavar="PATH",
+        help="trace photon geodesics for a single high-quality frame and write "
+        "it to PATH instead of rendering the frame range (offscreen only)",
+    )
+    parser.add_argument(
+        "--raytrace-transparent",
+        action="store_true",
+        help="leave escaped rays transparent instead of drawing the star map, "
+        "for compositing the traced frame",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for --raytrace and --farm (default: one per core)",
+    )
+    parser.add_argument(
+        "--farm",
+        action="store_true",
+        help="split the frame range across worker processes (offscreen only)",
+    )
+    parser.add_argument(
+        "--chunk",
+        type=int,
+        default=60,
+        metavar="FRAMES",
+        help="frames per farm chunk",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="random seed, making every frame reproducible (default 0 with --farm)",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        type=float,
+        metavar="HZ",
+        help="run the particle simulation at a fixed rate, interpolating "
+        "between steps when drawing (default: one step per frame)",
+    )
+    parser.add_argument(
+        "--black-holes",
+        type=int,
+        default=1,
+        metavar="N",
+        help="number of orbiting black holes, each with its own disk; "
+        "effects default to the numpy engine with more than one",
+    )
+    parser.add_argument(
+        "--orbit-rate",
+        type=float,
+        default=10.0,
+        metavar="DEG",
+        help="orbit speed of several black holes, in degrees per second",
+    )
+    parser.add_argument(
+        "--underside-arcs",
+        action="store_true",
+        help="show the glowing underside arcs around every black hole "
+        "(key 7 toggles them)",
+    )
+    parser.add_argument(
+        "--cold-start",
+        action="store_true",
+        help="start particle effects empty instead of at their cached steady "
+        "state; effects then default to the panda engine",
+    )
+    parser.add_argument(
+        "--warm-start-panda",
+        action="store_true",
+        help="also fast-forward panda-engine particle effects to their steady "
+        "state at launch (uncached, close to a second)",
+    )
+    parser.add_argument(
+        "--dynamic-resolution",
+        type=float,
+        metavar="MIN",
+        help="render the 3-D scene at MIN (e.g. 0.5) to 1 times the window "
+        "resolution, lowered first when frames exceed --frame-budget "
+        "(1.2 refresh periods under vsync by default), and upscale it under the native-resolution "
+        "background and help text",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="print the bytes held by every particle pool, generated Geom "
+        "and texture (after rendering offscreen, on exit otherwise)",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="print a breakdown of the time to the first frame (imports, "
+        "asset decode, geometry build, particle setup)",
+    )
+    args = parser.parse_args()
+    try:
+        args.particle_engines = parse_engines(args.particle_engine)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.dynamic_resolution is not None and not 0 < args.dynamic_resolution <= 1:
+        parser.error("--dynamic-resolution must be in (0, 1]")
+    if args.offscreen and args.threading_model:
+        # the captured image would lag the frame it is saved as
+        parser.error(
+            "--offscreen renders need the single-threaded pipeline; "
+            "drop --threading-model"
+        )
+    if args.farm and args.record_particles:
+        parser.error("--record-particles needs a single process; drop --farm")
+    panda = sorted(k for k, v in args.particle_engines.items() if v == "panda")
+    if args.record_particles and panda:
+        # only NumPy effects can be recorded
+        parser.error(
+            "--record-particles cannot record panda-engine effects "
+            f"({', '.join(panda)}); use --particle-engine numpy"
+        )
+    return args
 
 
 def main():
-    app = BlackHoleAnimation()
-    app.run()
+    args = parse_args()
+    options = dict(
+        cache_dir=None if args.no_cache else args.cache_dir,
+        particle_engines=args.particle_engines,
+        metrics_path=args.metrics,
+        frame_budget_ms=args.frame_budget,
+        particle_worker=args.particle_worker,
+        lensing=args.lensing,
+        seed=args.seed,
+        sim_rate=args.sim_rate,
+        black_holes=args.black_holes,
+        orbit_rate=args.orbit_rate,
+        batch_particles=args.batch_particles,
+        underside_arcs=args.underside_arcs,
+        record_particles=args.record_particles,
+        replay_particles=args.replay_particles,
+        warm_start=not args.cold_start,
+        warm_start_panda=args.warm_start_panda,
+        dynamic_resolution=args.dynamic_resolution,
+        camera_view=camera_view(args),
+    )
+    configure_threading(args.threading_model)
+    startup = STARTUP if args.startup_profile else None
+
+    if not args.offscreen:
+        app = BlackHoleAnimation(startup_profile=startup, **options)
+        if args.pstats:
+            PStatClient.connect()
+        if args.record:
+            # drop frames rather than slow down the interactive session
+            capture = FrameCapture(
+                app.win,
+                args.record,
+                fps=args.fps,
+                buffers=args.capture_buffers,
+                workers=args.capture_workers,
+            )
+            app.taskMgr.add(capture.task, "captureFrame", sort=51)
+
+            def finish():
+                try:
+                    capture.close()
+                finally:
+                    print(capture.report())
+
+            app.finalExitCallbacks.append(finish)
+        if args.memory_report:
+            app.finalExitCallbacks.append(lambda: print(app.memoryReport().report()))
+        app.run()
+        return
+
+    if args.farm:
+        from farm import render_farm
+
+        # frame times and metrics files are per process, so budgets and
+        # metrics are left to single-process runs
+        options.update(metrics_path=None, frame_budget_ms=None)
+        seed = options.pop("seed")
+        start, end = args.frames
+        render_farm(
+            start,
+            end,
+            args.out,
+            workers=args.workers,
+            chunk=args.chunk,
+            fps=args.fps,
+            size=args.size,
+            software=args.software,
+            seed=0 if seed is None else seed,
+            options=options,
+        )
+        return
+
+    from offscreen import configure_offscreen, render_frame_range
+    from raytrace import print_progress
+
+    configure_offscreen(*args.size, software=args.software)
+    app = BlackHoleAnimation(offscreen=True, startup_profile=startup, **options)
+    if args.pstats:
+        PStatClient.connect()
+    print(f"startup took {app.startup_time * 1e3:.0f} ms")
+    if args.raytrace:
+        app.taskMgr.step()
+        app.traceFrame(
+            args.raytrace,
+            workers=args.workers,
+            background=not args.raytrace_transparent,
+            progress=print_progress,
+        )
+        print(f"traced frame written to {args.raytrace}")
+        app.destroy()
+        return
+
+    start, end = args.frames
+    fps = render_frame_range(
+        app,
+        start,
+        end,
+        args.out,
+        fps=args.fps,
+        buffers=args.capture_buffers,
+        workers=args.capture_workers,
+        report=print,
+    )
+    print(f"rendered {end - start} frames to {args.out} at {fps:.1f} frames/sec")
+    if app.particle_recorder:
+        print(
+            f"recorded {app.particle_recorder.frames} frames of particles "
+            f"({app.particle_recorder.bytes_written / 2**20:.1f} MiB) to {args.record_particles}"
+        )
+    if args.memory_report:
+        print(app.memoryReport().report())
+    app.profiler.close()
+    app.destroy()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+from panda3d.core import NodePath
+
+# resident bytes per slot of a Panda3D particle pool: BaseParticle objects
+# are not visible from Python, so this is the RSS growth per slot measured
+# around Particles.setPoolSize (Panda3D 1.10, Linux x86-64)
+PANDA_PARTICLE_BYTES = 188
+
+
+def vertex_data_bytes(vertex_data, seen: set) -> int:
+    """Return the bytes of a GeomVertexData's arrays not counted yet.
+
+    Args:
+        vertex_data: The GeomVertexData.
+        seen:        Addresses of arrays already counted; updated in place,
+                     so data shared by several Geoms or instances is counted
+                     once.
+    """
+    total = 0
+    for i in range(vertex_data.getNumArrays()):
+        array = vertex_data.getArray(i)
+        if array.this not in seen:
+            seen.add(array.this)
+            total += array.getDataSizeBytes()
+    return total
+
+
+def geom_bytes(geom, seen: set) -> int:
+    """Return the vertex and index bytes of a Geom not counted yet."""
+    total = vertex_data_bytes(geom.getVertexData(), seen)
+    for i in range(geom.getNumPrimitives()):
+        primitive = geom.getPrimitive(i)
+        if primitive.isIndexed():
+            indices = primitive.getVertices()
+            if indices.this not in seen:
+                seen.add(indices.this)
+                total += indices.getDataSizeBytes()
+    return total
+
+
+def texture_bytes(texture):
+    """Return (bytes, where) for a texture.
+
+    Textures that keep their RAM image report the images of every mipmap
+    level held in RAM; the rest only live in video memory once uploaded, and
+    report the size of their uncompressed image instead.
+    """
+    if texture.hasRamImage():
+        total = sum(
+            texture.getRamMipmapImageSize(n)
+            for n in range(texture.getNumRamMipmapImages())
+        )
+        return total, "RAM"
+    return texture.getExpectedRamImageSize(), "video"
+
+
+def scene_geom_nodes(root: NodePath):
+    """Return every GeomNode under root, stashed ones included, once each."""
+    nodes = {}
+    for path in root.findAllMatches("**/+GeomNode;+s"):
+        nodes.setdefault(path.node().this, path)
+    if root.node().isGeomNode():
+        nodes.setdefault(root.node().this, root)
+    return list(nodes.values())
+
+
+class MemoryReport:
+    """Bytes held by particle pools, generated Geoms and textures.
+
+    Entries are (kind, name, bytes, note) rows; kind groups them in the
+    report ("pool", "geom", "texture"), and note says how a size was
+    obtained where it is not an exact count.
+    """
+
+    KINDS = ("pool", "geom", "texture")
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, kind: str, name: str, nbytes: int, note: str = ""):
+        """Record nbytes held by name; rows with the same kind and name add up."""
+        for i, (k, n, b, t) in enumerate(self.entries):
+            if k == kind and n == name:
+                self.entries[i] = (k, n, b + int(nbytes), t or note)
+                return
+        self.entries.append((kind, name, int(nbytes), note))
+
+    def total(self, kind: str = None) -> int:
+        """Return the bytes of every entry, or of the entries of one kind."""
+        return sum(b for k, _, b, _ in self.entries if kind in (None, k))
+
+    def rows(self):
+        """Return the entries as dicts, e.g. for JSON export."""
+        return [
+            {"kind": k, "name": n, "bytes": b, "note": t} for k, n, b, t in self.entries
+        ]
+
+    def report(self) -> str:
+        """Return the entries as an aligned table, largest first per kind."""
+        width = max([len(n) for _, n, _, _ in self.entries] + [10])
+        lines = ["memory report:"]
+        for kind in self.KINDS:
+            entries = sorted(
+                (e for e in self.entries if e[0] == kind), key=lambda e: -e[2]
+            )
+            if not entries:
+                continue
+            lines.append(f"  {kind}s:")
+            for _, name, nbytes, note in entries:
+                note = f"  ({note})" if note else ""
+                lines.append(f"    {name:<{width}} {nbytes / 2**20:9.2f} MiB{note}")
+            lines.append(f"    {'total':<{width}} {self.total(kind) / 2**20:9.2f} MiB")
+        lines.append(f"  {'all':<{width + 2}} {self.total() / 2**20:9.2f} MiB")
+        return "\n".join(lines)
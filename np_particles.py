@@ -0,0 +1,553 @@
+import numpy as np
+from panda3d.core import (
+    Geom,
+    GeomLines,
+    GeomNode,
+    GeomPoints,
+    GeomVertexArrayFormat,
+    GeomVertexData,
+    GeomVertexFormat,
+    LColor,
+    NodePath,
+    TexGenAttrib,
+    TextureStage,
+    TransparencyAttrib,
+)
+
+# vertex layout shared by every renderer mode: position + float color, so a
+# whole frame can be written as one contiguous float32 block
+_ARRAY_FORMAT = GeomVertexArrayFormat()
+_ARRAY_FORMAT.addColumn("vertex", 3, Geom.NT_float32, Geom.C_point)
+_ARRAY_FORMAT.addColumn("color", 4, Geom.NT_float32, Geom.C_color)
+VERTEX_FORMAT = GeomVertexFormat.registerFormat(_ARRAY_FORMAT)
+FLOATS_PER_VERTEX = 7
+
+# one pool slot, as saved by NumpyParticleEffect.getState()
+STATE_DTYPE = np.dtype(
+    [
+        ("pos", "<f4", 3),
+        ("prev_pos", "<f4", 3),
+        ("vel", "<f4", 3),
+        ("mass", "<f4"),
+        ("age", "<f4"),
+        ("lifespan", "<f4"),
+        ("terminal", "<f4"),
+        ("alive", "?"),
+    ]
+)
+
+
+def _spread(rng, base: float, spread: float, n: int) -> np.ndarray:
+    """Sample base +/- spread uniformly, like Panda3D's SPREAD() macro."""
+    return (base + spread * rng.uniform(-1.0, 1.0, n)).astype(np.float32)
+
+
+class TangentRingEmitter:
+    """Spawn particles on a ring in the local x-y plane, moving tangentially.
+
+    Matches Panda3D's TangentRingEmitter with ET_CUSTOM emission.
+    """
+
+    def __init__(self, radius: float, amplitude: float, amplitude_spread: float):
+        self.radius = radius
+        self.amplitude = amplitude
+        self.amplitude_spread = amplitude_spread
+
+    def emit(self, rng, n: int):
+        """Return (positions, velocities) for n new particles."""
+        theta = rng.uniform(0.0, 2 * np.pi, n)
+        cos, sin = np.cos(theta), np.sin(theta)
+        zeros = np.zeros(n)
+        pos = np.stack([cos * self.radius, sin * self.radius, zeros], axis=1)
+        amp = _spread(rng, self.amplitude, self.amplitude_spread, n)[:, None]
+        vel = np.stack([-sin, cos, zeros], axis=1) * amp
+        return pos, vel
+
+
+class SphereSurfaceEmitter:
+    """Spawn particles on a sphere surface, radiating away from an origin.
+
+    Matches Panda3D's SphereSurfaceEmitter with ET_RADIATE emission.
+    """
+
+    def __init__(
+        self,
+        radius: float,
+        amplitude: float,
+        amplitude_spread: float,
+        radiate_origin=(0, 0, 0),
+    ):
+        self.radius = radius
+        self.amplitude = amplitude
+        self.amplitude_spread = amplitude_spread
+        self.radiate_origin = np.asarray(radiate_origin, dtype=np.float32)
+
+    def emit(self, rng, n: int):
+        """Return (positions, velocities) for n new particles."""
+        direction = rng.normal(size=(n, 3))
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+        pos = direction * self.radius
+
+        out = pos - self.radiate_origin
+        norm = np.linalg.norm(out, axis=1, keepdims=True)
+        out = np.divide(out, norm, out=np.zeros_like(out), where=norm > 0)
+        amp = _spread(rng, self.amplitude, self.amplitude_spread, n)[:, None]
+        return pos, out * amp
+
+
+class SinkForce:
+    """Vectorized equivalent of Panda3D's LinearSinkForce.
+
+    Panda3D evaluates the falloff against the force's fixed radius, not the
+    particle's distance, so the pull is ``amplitude * (center - pos) /
+    radius**k`` with k = 1 for FT_ONE_OVER_R and k = 2 for
+    FT_ONE_OVER_R_SQUARED. Mass-dependent forces are divided by the particle
+    mass by the integrator.
+    """
+
+    ONE_OVER_R = 1
+    ONE_OVER_R_SQUARED = 2
+
+    def __init__(
+        self,
+        center=(0, 0, 0),
+        radius: float = 1.0,
+        amplitude: float = 1.0,
+        falloff: int = ONE_OVER_R_SQUARED,
+        mass_dependent: bool = True,
+    ):
+        self.center = np.asarray(center, dtype=np.float32)
+        self.radius = radius
+        self.amplitude = amplitude
+        self.falloff = falloff
+        self.mass_dependent = mass_dependent
+
+    def field(self, pos: np.ndarray) -> np.ndarray:
+        """Return the pull on a unit mass at pos."""
+        scale = self.amplitude / self.radius**self.falloff
+        return (self.center - pos) * np.float32(scale)
+
+    def acceleration(self, pos: np.ndarray, mass: np.ndarray) -> np.ndarray:
+        """Return the acceleration applied to particles at pos."""
+        accel = self.field(pos)
+        if self.mass_dependent:
+            accel /= mass[:, None]
+        return accel
+
+
+class NumpyParticleEffect(NodePath):
+    """Particle effect that keeps its state in contiguous NumPy arrays.
+
+    A drop-in alternative to a single-system ParticleEffect for the emitters,
+    forces and renderers this scene uses. Position, velocity, mass, age and
+    lifespan live in structure-of-arrays form and are advanced with
+    vectorized Euler steps; each frame the live particles are written into a
+    single GeomPoints (point/sprite modes) or GeomLines (line mode) vertex
+    buffer through a memoryview.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        emitter,
+        sink: SinkForce,
+        pool_size: int,
+        birth_rate: float = 1e-5,
+        litter_size: int = 10000,
+        litter_spread: int = 1,
+        lifespan_base: float = 3.0,
+        lifespan_spread: float = 1.0,
+        terminal_velocity_base: float = 12.0,
+        terminal_velocity_spread: float = 1.0,
+        mass_base: float = 1.0,
+        mass_spread: float = 0.25,
+        color: LColor = LColor(0.99, 0.39, 0, 1),
+        seed=None,
+    ):
+        """
+        Args:
+            name:       Name of the effect node.
+            emitter:    TangentRingEmitter or SphereSurfaceEmitter.
+            sink:       Gravitational sink force, in the effect's local space:
+                        a SinkForce, or any object with the same
+                        acceleration(pos, mass) method (see gravity.GridSink).
+            pool_size:  Maximum number of live particles. The pool's arrays
+                        are only allocated when the effect first starts.
+            birth_rate: Seconds between litters.
+            seed:       Seed for the effect's random generator.
+
+        The remaining arguments mirror the Particles / PointParticleFactory
+        setters of the same name.
+        """
+        NodePath.__init__(self, name)
+        self.name = name
+        self.emitter = emitter
+        self.sink = sink
+        self.birth_rate = birth_rate
+        self.litter_size = litter_size
+        self.litter_spread = litter_spread
+        self.lifespan_params = (lifespan_base, lifespan_spread)
+        self.terminal_velocity_params = (
+            terminal_velocity_base,
+            terminal_velocity_spread,
+        )
+        self.mass_params = (mass_base, mass_spread)
+        self.rng = np.random.default_rng(seed)
+
+        self.pool_size = pool_size
+        self._createArrays(0)
+        self.allocated = False
+        self.tics_since_birth = 0.0
+        self.enabled = False
+        self.drawn_count = 0
+        self.batched = False
+        self.horizons = np.zeros((0, 3), dtype=np.float32)
+        self.horizon_radius = 0.0
+        self.swallowed = 0
+
+        self.renderer_mode = "line"
+        self.color = LColor(color)
+        self.point_size = 1.0
+        self.vertex_data = GeomVertexData(name, VERTEX_FORMAT, Geom.UHStream)
+
+        # one prebuilt Geom per primitive type, sharing the vertex data, so
+        # switching renderer is a swap rather than a rebuild
+        self.geoms = {}
+        for kind, primitive in (("line", GeomLines), ("point", GeomPoints)):
+            geom = Geom(self.vertex_data)
+            geom.addPrimitive(primitive(Geom.UHStream))
+            self.geoms[kind] = geom
+
+        self.geom_node = GeomNode(f"{name} geom")
+        self.geom_np = self.attachNewNode(self.geom_node)
+        self.setTransparency(TransparencyAttrib.MAlpha)
+        self.setDepthWrite(False)
+        self.setLightOff()
+        self.setRenderer("line", color)
+
+    def allocate(self, pool_size: int):
+        """(Re)allocate the particle pool, discarding any live particles."""
+        self.pool_size = pool_size
+        self._createArrays(pool_size)
+        self.allocated = True
+
+    def release(self):
+        """Free the pool's arrays and vertex buffer, keeping its size.
+
+        The next start() allocates an empty pool of the same size again.
+        """
+        self._createArrays(0)
+        self.allocated = False
+        self.vertex_data.uncleanSetNumRows(0)
+        self.primitive.setNonindexedVertices(0, 0)
+        self.drawn_count = 0
+
+    def isAllocated(self) -> bool:
+        return self.allocated
+
+    def _createArrays(self, n: int):
+        self.pos = np.zeros((n, 3), dtype=np.float32)
+        self.prev_pos = np.zeros((n, 3), dtype=np.float32)
+        self.vel = np.zeros((n, 3), dtype=np.float32)
+        self.mass = np.ones(n, dtype=np.float32)
+        self.age = np.zeros(n, dtype=np.float32)
+        self.lifespan = np.zeros(n, dtype=np.float32)
+        self.terminal = np.zeros(n, dtype=np.float32)
+        self.alive = np.zeros(n, dtype=bool)
+
+    def getPoolBytes(self) -> int:
+        """Return the bytes held by the pool's arrays and vertex buffer."""
+        arrays = sum(getattr(self, name).nbytes for name in STATE_DTYPE.names)
+        return arrays + self.vertex_data.getArray(0).getDataSizeBytes()
+
+    def setPoolSize(self, pool_size: int):
+        """Resize the pool, keeping as many live particles as fit.
+
+        A released pool only records the new size.
+        """
+        if not self.allocated:
+            self.pool_size = pool_size
+            return
+        live = np.flatnonzero(self.alive)[:pool_size]
+        n = len(live)
+        old = {
+            name: getattr(self, name)[live]
+            for name in (
+                "pos",
+                "prev_pos",
+                "vel",
+                "mass",
+                "age",
+                "lifespan",
+                "terminal",
+            )
+        }
+        self.allocate(pool_size)
+        for name, values in old.items():
+            getattr(self, name)[:n] = values
+        self.alive[:n] = True
+
+    def getPoolSize(self) -> int:
+        return self.pool_size
+
+    def getState(self) -> np.ndarray:
+        """Return a copy of the whole pool as one STATE_DTYPE array (empty
+        while the pool is released)."""
+        state = np.empty(len(self.alive), dtype=STATE_DTYPE)
+        for name in STATE_DTYPE.names:
+            state[name] = getattr(self, name)
+        return state
+
+    def setState(self, state: np.ndarray):
+        """Replace the pool with a getState() array, resizing it to fit."""
+        self.allocate(len(state))
+        for name in STATE_DTYPE.names:
+            getattr(self, name)[:] = state[name]
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self, parent: NodePath):
+        """Attach the effect under parent and mark it for per-frame updates.
+
+        Like Panda3D particle effects, the effect does not own a task: the
+        owner steps every enabled effect with update() each frame. A
+        released pool is allocated here, empty.
+        """
+        if not self.allocated:
+            self.allocate(self.pool_size)
+        self.reparentTo(parent)
+        self.enabled = True
+
+    def disable(self, release: bool = False):
+        """Stop updating the effect and detach it from the scene.
+
+        Args:
+            release: Also free the pool (see release()); otherwise the effect
+                     resumes with its particles when started again.
+        """
+        self.enabled = False
+        self.detachNode()
+        if release:
+            self.release()
+
+    def isEnabled(self) -> bool:
+        return self.enabled
+
+    def setHorizons(self, centers, radius: float):
+        """Set the event horizons that swallow particles, in local space.
+
+        Args:
+            centers: Local-space (x, y, z) of every black hole.
+            radius:  Event horizon radius.
+        """
+        self.horizons = np.asarray(
+            [tuple(c) for c in centers], dtype=np.float32
+        ).reshape(-1, 3)
+        self.horizon_radius = radius
+
+    def getSwallowedCount(self) -> int:
+        """Return how many particles have crossed an event horizon so far."""
+        return self.swallowed
+
+    def getLivingParticleCount(self) -> int:
+        return int(np.count_nonzero(self.alive))
+
+    def update(self, dt: float, steps: int = 1, blend: float = 1.0):
+        """Advance the simulation and rebuild the vertex buffer.
+
+        Args:
+            dt:    Length of one simulation step in seconds.
+            steps: Number of steps to take; 0 only redraws.
+            blend: Render interpolation factor passed to writeGeom().
+        """
+        self.advance(dt, steps)
+        self.writeGeom(blend)
+
+    def advance(self, dt: float, steps: int = 1):
+        """Take steps simulation steps of dt seconds each."""
+        for _ in range(steps):
+            self.step(dt)
+
+    # -------------------------------------------------------------------------
+    # Simulation
+    # -------------------------------------------------------------------------
+
+    def step(self, dt: float):
+        """Advance every particle by dt seconds."""
+        if dt <= 0:
+            return
+
+        # age out; dead slots are integrated too; whole-array in-place
+        # updates are cheaper than gathering and scattering the live subset
+        self.age += dt
+        self.alive &= self.age < self.lifespan
+
+        # births: one litter per elapsed birth_rate, limited by free slots
+        self.tics_since_birth += dt
+        litters = int(self.tics_since_birth // self.birth_rate)
+        if litters:
+            self.tics_since_birth -= litters * self.birth_rate
+            spread = self.rng.integers(
+                -self.litter_spread, self.litter_spread + 1, min(litters, 1 << 16)
+            )
+            wanted = int(np.sum(self.litter_size + spread))
+            self.spawn(wanted)
+
+        # integrate (semi-implicit Euler, like LinearEulerIntegrator)
+        dt = np.float32(dt)
+        self.vel += self.sink.acceleration(self.pos, self.mass) * dt
+
+        # terminal velocity clamp
+        speed_sq = np.einsum("ij,ij->i", self.vel, self.vel)
+        over = np.flatnonzero(speed_sq > self.terminal * self.terminal)
+        if len(over):
+            self.vel[over] *= (self.terminal[over] / np.sqrt(speed_sq[over]))[:, None]
+
+        self.prev_pos[:] = self.pos
+        self.pos += self.vel * dt
+
+        self.swallow()
+
+    def swallow(self):
+        """Kill live particles inside an event horizon, freeing their slots.
+
+        They would otherwise live out their lifespan hidden behind the black
+        sphere; freed slots are refilled at the emitter by the next litter.
+        """
+        if not len(self.horizons):
+            return
+        r_sq = np.float32(self.horizon_radius * self.horizon_radius)
+        inside = np.zeros(self.pool_size, dtype=bool)
+        for center in self.horizons:
+            offset = self.pos - center
+            inside |= np.einsum("ij,ij->i", offset, offset) < r_sq
+        inside &= self.alive
+        swallowed = int(np.count_nonzero(inside))
+        if swallowed:
+            self.alive &= ~inside
+            self.swallowed += swallowed
+
+    def spawn(self, count: int):
+        """Birth up to count particles into free pool slots."""
+        free = np.flatnonzero(~self.alive)[:count]
+        n = len(free)
+        if not n:
+            return
+
+        pos, vel = self.emitter.emit(self.rng, n)
+        self.pos[free] = pos
+        self.prev_pos[free] = pos
+        self.vel[free] = vel
+        self.age[free] = 0.0
+        self.lifespan[free] = _spread(self.rng, *self.lifespan_params, n)
+        self.terminal[free] = _spread(self.rng, *self.terminal_velocity_params, n)
+        self.mass[free] = np.maximum(_spread(self.rng, *self.mass_params, n), 1e-3)
+        self.alive[free] = True
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def setRenderer(
+        self, mode: str, color: LColor, point_size: float = 1.0, texture=None
+    ):
+        """Switch how particles are drawn.
+
+        Args:
+            mode:       "line" (head to last position), "point", or "sprite"
+                        (textured point sprites sized in world units).
+            color:      Particle color; alpha fades out over each lifespan.
+            point_size: Pixel size in point mode, world size in sprite mode.
+            texture:    Sprite texture (sprite mode only).
+        """
+        self.renderer_mode = mode
+        self.color = LColor(color)
+        self.point_size = point_size
+
+        # the vertex layout differs between lines and points, so refill the
+        # buffer for the new primitive before it is attached
+        geom = self.geoms["line" if mode == "line" else "point"]
+        self.primitive = geom.modifyPrimitive(0)
+        self.writeGeom()
+        self.geom_node.removeAllGeoms()
+        self.geom_node.addGeom(geom)
+
+        geom_np = self.geom_np
+        geom_np.clearTexture()
+        geom_np.clearTexGen()
+        geom_np.setRenderModeThickness(point_size)
+        geom_np.setRenderModePerspective(mode == "sprite")
+        if mode == "sprite" and texture is not None:
+            geom_np.setTexture(texture)
+            geom_np.setTexGen(TextureStage.getDefault(), TexGenAttrib.MPointSprite)
+
+    def setBatched(self, batched: bool):
+        """Hand drawing over to a shared batch Geom, or take it back.
+
+        While batched the effect's own Geom is stashed and not updated; a
+        particle_batch.ParticleBatch writes its particles instead.
+        """
+        self.batched = batched
+        if batched:
+            self.geom_np.stash()
+        else:
+            self.geom_np.unstash()
+            self.writeGeom()
+
+    def writeGeom(self, blend: float = 1.0):
+        """Copy live particles into the vertex buffer in one bulk write.
+
+        Args:
+            blend: Fraction of the last step to show, for rendering between
+                   fixed simulation steps; 1 draws the latest state.
+        """
+        idx = np.flatnonzero(self.alive)
+        n = len(idx)
+        self.drawn_count = n
+        per_particle = 2 if self.renderer_mode == "line" else 1
+
+        self.vertex_data.uncleanSetNumRows(n * per_particle)
+        self.primitive.setNonindexedVertices(0, n * per_particle)
+        if not n:
+            return
+
+        buf = np.frombuffer(
+            memoryview(self.vertex_data.modifyArray(0)).cast("B"), dtype=np.float32
+        ).reshape(n, per_particle, FLOATS_PER_VERTEX)
+        self.writeVertices(buf, idx, blend)
+
+    def writeVertices(self, buf: np.ndarray, idx: np.ndarray, blend=1.0, frame=None):
+        """Write the particles idx as position + color vertices into buf.
+
+        Args:
+            buf:   float32 array of shape (len(idx), 2 or 1, FLOATS_PER_VERTEX):
+                   head and tail per particle in line mode, one vertex
+                   otherwise.
+            idx:   Pool slots of the particles to write.
+            blend: See writeGeom().
+            frame: Optional (rotation, origin) mapping local positions to
+                   another space as ``pos @ rotation + origin``, e.g. for a
+                   shared batch Geom (see particle_batch.ParticleBatch).
+        """
+        per_particle = buf.shape[1]
+
+        # PR_ALPHA_OUT: fade linearly from opaque to clear over the lifespan
+        alpha = 1.0 - self.age[idx] / self.lifespan[idx]
+        if blend >= 1.0:
+            buf[:, 0, 0:3] = self.pos[idx]
+            if per_particle == 2:
+                buf[:, 1, 0:3] = self.prev_pos[idx]
+        else:
+            # head partway along the last step, tail one step behind it
+            prev = self.prev_pos[idx]
+            delta = self.pos[idx] - prev
+            buf[:, 0, 0:3] = prev + np.float32(blend) * delta
+            if per_particle == 2:
+                buf[:, 1, 0:3] = buf[:, 0, 0:3] - delta
+        if frame is not None:
+            rotation, origin = frame
+            buf[:, :, 0:3] = buf[:, :, 0:3] @ rotation + origin
+        buf[:, :, 3:6] = np.asarray(tuple(self.color)[:3], dtype=np.float32)
+        buf[:, :, 6] = (alpha * self.color[3])[:, None]
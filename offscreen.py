@@ -0,0 +1,145 @@
+import ctypes
+import ctypes.util
+import sys
+import time
+
+import numpy as np
+from panda3d.core import ClockObject, ConfigVariable
+
+from capture import FrameCapture
+
+
+def configure_offscreen(width: int, height: int, software: bool = False):
+    """Load the config needed to render without a window.
+
+    Must be called before the ShowBase constructor opens its graphics pipe.
+    The values are set as local overrides, so they win over config/conf.prc
+    no matter which is loaded first.
+
+    Args:
+        width:    Width of the offscreen buffer in pixels.
+        height:   Height of the offscreen buffer in pixels.
+        software: Force the tinydisplay software renderer, for hosts that
+                  have no GPU or X server.
+    """
+    overrides = {
+        "window-type": "offscreen",
+        "win-size": f"{width} {height}",
+        "sync-video": "false",
+        "show-frame-rate-meter": "false",
+        "audio-library-name": "null",
+    }
+    if software:
+        overrides["load-display"] = "p3tinydisplay"
+    for name, value in overrides.items():
+        ConfigVariable(name).setStringValue(value)
+
+
+def seed_random(seed: int):
+    """Seed every random source the scene draws from.
+
+    Panda3D's particle systems use the C library's rand(), so it is seeded
+    through ctypes alongside NumPy's global generator.
+
+    Args:
+        seed: Non-negative integer seed.
+    """
+    np.random.seed(seed)
+    name = "ucrtbase" if sys.platform == "win32" else ctypes.util.find_library("c")
+    try:
+        ctypes.CDLL(name).srand(ctypes.c_uint(seed))
+    except (OSError, AttributeError, TypeError):
+        pass
+
+
+def render_frame_range(
+    app,
+    start: int,
+    end: int,
+    out_dir: str,
+    fps: float = 30.0,
+    buffers: int = 8,
+    workers: int = 2,
+    report=None,
+) -> float:
+    """Render frames [start, end) of the animation straight to image files.
+
+    The global clock is switched to non-real-time mode so every frame
+    advances the scene by exactly 1 / fps seconds, no matter how long it took
+    to draw. Frames before ``start`` are simulated but not written, so a
+    range always shows the same moment of the animation; a particle replay
+    seeks straight to ``start`` instead, with the clock moved to where those
+    frames would have left it. Queued assets are waited for first, so no
+    frame shows a placeholder.
+
+    Frames are written by a blocking capture.FrameCapture in the
+    background, attached only after the warm-up frames so those skip the
+    RAM copy; the measured throughput includes waiting for the last of them.
+
+    The captured image is read right after each frame is drawn, so the
+    pipeline must be single-threaded: with Cull or Draw on their own threads
+    the image would belong to an earlier frame.
+
+    Args:
+        app:     A BlackHoleAnimation opened with an offscreen window.
+        start:   First frame number to write.
+        end:     Frame number to stop before.
+        out_dir: Directory that receives ``frame_NNNNNN.png`` files, or a
+                 video file (see capture.VIDEO_EXTENSIONS).
+        fps:     Simulated frames per second of the output sequence.
+        buffers: Frame buffers of the capture ring.
+        workers: PNG encoder threads.
+        report:  Callable receiving the capture summary; None for silence.
+
+    Returns:
+        The measured render throughput in frames per second.
+
+    Raises:
+        RuntimeError: If the pipeline is multi-threaded, or if any frame of
+            the range was not written.
+    """
+    model = app.graphicsEngine.getThreadingModel()
+    if model.getDrawStage():
+        raise RuntimeError(
+            f"offscreen renders need the single-threaded pipeline, not "
+            f"threading-model {model.getModel()}"
+        )
+    app.waitForAssets()
+    clock = ClockObject.getGlobalClock()
+    clock.setMode(ClockObject.MNonRealTime)
+    clock.setFrameRate(fps)
+
+    if app.particle_replay:
+        app.seekReplay(start)
+        clock.setFrameTime(start / fps)
+        clock.setFrameCount(start)
+        app.spinner.seek(start / fps)
+    else:
+        app.spinner.seek(0.0)
+        for _ in range(start):
+            app.taskMgr.step()
+
+    capture = FrameCapture(
+        app.win, out_dir, fps=fps, buffers=buffers, workers=workers, block=True
+    )
+
+    t0 = time.perf_counter()
+    for frame in range(start, end):
+        app.taskMgr.step()
+        capture.capture(frame)
+    try:
+        capture.close()
+    finally:
+        # reported even when a write failed, so the failure count shows
+        if report:
+            report(capture.report())
+    elapsed = time.perf_counter() - t0
+
+    missing = sorted(set(range(start, end)) - capture.frames)
+    if missing:
+        raise RuntimeError(
+            f"{len(missing)} of {end - start} frames were not written "
+            f"(first: {missing[0]})"
+        )
+
+    return (end - start) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,103 @@
+import numpy as np
+from panda3d.core import (
+    Geom,
+    GeomLines,
+    GeomNode,
+    GeomPoints,
+    GeomVertexData,
+    NodePath,
+    TransparencyAttrib,
+)
+
+from np_particles import FLOATS_PER_VERTEX, VERTEX_FORMAT
+
+
+class ParticleBatch(NodePath):
+    """One shared vertex buffer and Geom for several NumPy particle effects.
+
+    Every batched effect writes its live particles into its own slice of the
+    buffer, mapped from the effect's local space into the batch's space, so
+    the particles of all effects are drawn with a single draw call. Vertex
+    colors carry each effect's color and alpha fade, which stand in for the
+    per-renderer head / start colors.
+
+    Only line and point modes are batched: the sprite size is a per-Geom
+    render attribute and differs between effects, so sprites stay on each
+    effect's own Geom.
+    """
+
+    def __init__(self, name: str = "particle batch"):
+        NodePath.__init__(self, name)
+        self.mode = "line"
+        self.drawn_count = 0
+        self.vertex_data = GeomVertexData(name, VERTEX_FORMAT, Geom.UHStream)
+
+        self.geoms = {}
+        for kind, primitive in (("line", GeomLines), ("point", GeomPoints)):
+            geom = Geom(self.vertex_data)
+            geom.addPrimitive(primitive(Geom.UHStream))
+            self.geoms[kind] = geom
+
+        self.geom_node = GeomNode(f"{name} geom")
+        self.geom_np = self.attachNewNode(self.geom_node)
+        self.setTransparency(TransparencyAttrib.MAlpha)
+        self.setDepthWrite(False)
+        self.setLightOff()
+        self.setRenderer("line")
+
+    def setRenderer(self, mode: str, point_size: float = 1.0):
+        """Switch the batch between "line" and "point" primitives.
+
+        Args:
+            mode:       "line" or "point".
+            point_size: Pixel size in point mode.
+        """
+        self.mode = mode
+        geom = self.geoms[mode]
+        self.primitive = geom.modifyPrimitive(0)
+        self.write([])
+        self.geom_node.removeAllGeoms()
+        self.geom_node.addGeom(geom)
+        self.geom_np.setRenderModeThickness(point_size)
+
+    def getDrawCalls(self) -> int:
+        """Return how many draw calls the batch issued for its last write."""
+        return 1 if self.drawn_count else 0
+
+    def write(self, effects, blend: float = 1.0):
+        """Gather the live particles of effects into the shared buffer.
+
+        Must run on the App thread, after any particle worker has finished,
+        since it reads the effects' arrays and transforms.
+
+        Args:
+            effects: NumpyParticleEffects in the scene, in draw order.
+            blend:   Render interpolation factor, see
+                     NumpyParticleEffect.writeGeom().
+        """
+        per_particle = 2 if self.mode == "line" else 1
+        live = [np.flatnonzero(pe.alive) for pe in effects]
+        n = sum(len(idx) for idx in live)
+        self.drawn_count = n
+
+        self.vertex_data.uncleanSetNumRows(n * per_particle)
+        self.primitive.setNonindexedVertices(0, n * per_particle)
+        if not n:
+            return
+
+        buf = np.frombuffer(
+            memoryview(self.vertex_data.modifyArray(0)).cast("B"), dtype=np.float32
+        ).reshape(n, per_particle, FLOATS_PER_VERTEX)
+
+        start = 0
+        for pe, idx in zip(effects, live):
+            end = start + len(idx)
+            pe.drawn_count = len(idx)
+            if len(idx):
+                # Panda3D matrices act on row vectors: batch = local * mat
+                mat = pe.getMat(self)
+                rows = np.array(
+                    [list(mat.getRow3(i)) for i in range(4)], dtype=np.float32
+                )
+                pe.writeVertices(buf[start:end], idx, blend, (rows[:3], rows[3]))
+            start = end
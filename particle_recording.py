@@ -0,0 +1,247 @@
+import json
+import os
+
+import numpy as np
+
+RECORDING_VERSION = 1
+
+# one particle of one frame: local-space position, velocity, and age as a
+# fraction of its lifespan (drives the alpha fade)
+PARTICLE_DTYPE = np.dtype([("pos", "<f4", 3), ("vel", "<f2", 3), ("life", "<f2")])
+
+
+def frame_dtype(effects: int) -> np.dtype:
+    """Row of the frame table of a recording with the given effect count.
+
+    offset and count locate each effect's particles in the frame's chunk
+    file (count -1: the effect was not running); dt is the simulation step
+    that led to the frame, which turns velocities back into line tails.
+    """
+    return np.dtype(
+        [
+            ("chunk", "<i4"),
+            ("time", "<f8"),
+            ("dt", "<f4"),
+            ("orbit_angle", "<f4"),
+            ("offset", "<i8", effects),
+            ("count", "<i4", effects),
+            ("color", "<f4", (effects, 4)),
+        ]
+    )
+
+
+class ParticleRecorder:
+    """Write each frame's particle state to a chunked on-disk recording.
+
+    A recording is a directory holding meta.json, a frame table
+    (frames.npy) and chunk-NNNNNN.bin files of raw PARTICLE_DTYPE records,
+    ``chunk_frames`` frames per chunk. Chunks are written sequentially and
+    never rewritten, and the frame table is saved at every chunk boundary,
+    so an interrupted recording stays readable up to its last full chunk.
+    """
+
+    def __init__(self, path: str, effects, chunk_frames: int = 64, meta=None):
+        """
+        Args:
+            path:         Recording directory, created if needed; an existing
+                          recording in it is replaced.
+            effects:      Effect keys, in the order their columns are stored.
+            chunk_frames: Frames per chunk file.
+            meta:         Extra JSON-serializable scene settings to store
+                          (e.g. the number of black holes).
+        """
+        self.path = path
+        self.effects = list(effects)
+        self.chunk_frames = chunk_frames
+        self.dtype = frame_dtype(len(self.effects))
+        self.rows = []
+        self.bytes_written = 0
+
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("chunk-") or name in ("frames.npy", "meta.json"):
+                os.remove(os.path.join(path, name))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(
+                {
+                    "version": RECORDING_VERSION,
+                    "effects": self.effects,
+                    "chunk_frames": chunk_frames,
+                    **(meta or {}),
+                },
+                f,
+                indent=2,
+            )
+
+        self._file = None
+        self._chunk = -1
+        self._offset = 0
+
+    @property
+    def frames(self) -> int:
+        return len(self.rows)
+
+    def record(self, effects: dict, dt: float, time: float, orbit_angle: float = 0.0):
+        """Append one frame.
+
+        Args:
+            effects:     Maps effect keys to running NumpyParticleEffects;
+                         keys missing here are stored as not running.
+            dt:          Simulation step that led to this state.
+            time:        Frame time, for reference.
+            orbit_angle: Orbit angle of several black holes, in degrees.
+        """
+        chunk = len(self.rows) // self.chunk_frames
+        if chunk != self._chunk:
+            self._startChunk(chunk)
+
+        row = np.zeros((), dtype=self.dtype)
+        row["chunk"] = chunk
+        row["time"] = time
+        row["dt"] = dt
+        row["orbit_angle"] = orbit_angle
+        row["count"] = -1
+        for i, key in enumerate(self.effects):
+            pe = effects.get(key)
+            if pe is None:
+                continue
+            idx = np.flatnonzero(pe.alive)
+            block = np.empty(len(idx), dtype=PARTICLE_DTYPE)
+            block["pos"] = pe.pos[idx]
+            block["vel"] = pe.vel[idx]
+            block["life"] = pe.age[idx] / pe.lifespan[idx]
+            row["offset"][i] = self._offset
+            row["count"][i] = len(idx)
+            row["color"][i] = tuple(pe.color)
+            self._file.write(block.data)
+            self._offset += len(idx)
+            self.bytes_written += block.nbytes
+        self.rows.append(row)
+
+    def close(self):
+        """Finish the last chunk and write the frame table."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._writeTable()
+
+    def _startChunk(self, chunk: int):
+        if self._file:
+            self._file.close()
+            self._writeTable()
+        self._chunk = chunk
+        self._offset = 0
+        self._file = open(os.path.join(self.path, f"chunk-{chunk:06d}.bin"), "wb")
+
+    def _writeTable(self):
+        table = np.array(self.rows, dtype=self.dtype)
+        np.save(os.path.join(self.path, "frames.npy"), table)
+
+
+class ParticleReplay:
+    """Read frames of a recording written by ParticleRecorder.
+
+    Particle data is never loaded as a whole: the chunk holding the
+    requested frame is memory-mapped and the frame's records are slices of
+    that map, so any frame can be reached directly and only the pages it
+    touches are read from disk.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Recording directory.
+        """
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != RECORDING_VERSION:
+            raise ValueError(
+                f"{path}: recording version {self.meta['version']}, "
+                f"expected {RECORDING_VERSION}"
+            )
+        self.effects = self.meta["effects"]
+        self.table = np.load(os.path.join(path, "frames.npy"))
+        self.position = 0
+
+        self._chunk = None
+        self._map = None
+
+    @property
+    def frames(self) -> int:
+        return len(self.table)
+
+    def seek(self, frame: int):
+        """Make frame the one next() returns, clamped to the recording."""
+        self.position = min(max(frame, 0), self.frames - 1)
+
+    def next(self):
+        """Return the current frame (see frame()) and move to the next one.
+
+        The last frame is held once the recording runs out.
+        """
+        result = self.frame(self.position)
+        self.position = min(self.position + 1, self.frames - 1)
+        return result
+
+    def frame(self, index: int):
+        """Return (row, particles) of a frame.
+
+        Args:
+            index: Frame number.
+
+        Returns:
+            The frame table row, and a dict mapping each effect key that
+            was running to a read-only PARTICLE_DTYPE view of its particles.
+        """
+        row = self.table[index]
+        data = self._mapChunk(int(row["chunk"]))
+        particles = {}
+        for i, key in enumerate(self.effects):
+            count = int(row["count"][i])
+            if count < 0:
+                continue
+            offset = int(row["offset"][i])
+            particles[key] = data[offset : offset + count]
+        return row, particles
+
+    def close(self):
+        """Release the mapped chunk."""
+        self._map = None
+        self._chunk = None
+
+    def _mapChunk(self, chunk: int) -> np.ndarray:
+        if chunk != self._chunk:
+            path = os.path.join(self.path, f"chunk-{chunk:06d}.bin")
+            if os.path.getsize(path):
+                self._map = np.memmap(path, dtype=PARTICLE_DTYPE, mode="r")
+            else:
+                # np.memmap cannot map an empty file
+                self._map = np.empty(0, dtype=PARTICLE_DTYPE)
+            self._chunk = chunk
+        return self._map
+
+
+def restore_particles(pe, particles: np.ndarray, dt: float):
+    """Load one recorded frame into a NumpyParticleEffect's arrays.
+
+    Lifespans are set to 1 so the recorded life fraction reproduces the
+    alpha fade, and tails are rebuilt from the velocities; the effect is
+    then drawn as usual (writeGeom or a ParticleBatch) but must not be
+    stepped.
+
+    Args:
+        pe:        The effect.
+        particles: PARTICLE_DTYPE records, e.g. from ParticleReplay.frame().
+        dt:        The frame's simulation step.
+    """
+    n = len(particles)
+    if n > pe.pool_size or not pe.isAllocated():
+        pe.allocate(max(n, pe.pool_size))
+    pos = particles["pos"]
+    pe.pos[:n] = pos
+    pe.prev_pos[:n] = pos - particles["vel"].astype(np.float32) * np.float32(dt)
+    pe.age[:n] = particles["life"]
+    pe.lifespan[:n] = 1.0
+    pe.alive[:n] = True
+    pe.alive[n:] = False
@@ -0,0 +1,106 @@
+import threading
+
+from panda3d.core import ConfigVariable, Thread
+
+# values accepted by Panda3D's threading-model config variable: the stages
+# before the "/" run on the App thread, "Cull" and "Draw" name extra threads
+THREADING_MODELS = ("", "Cull", "/Draw", "Cull/Draw", "/Cull/Draw")
+
+
+def configure_threading(model: str):
+    """Select Panda3D's App / Cull / Draw threading model.
+
+    Must be called before the ShowBase constructor opens its graphics pipe.
+    With a multi-threaded model the App stage of frame N runs while Cull
+    and/or Draw are still working on frame N-1, so everything that changes
+    the scene graph has to happen from tasks on the main task chain.
+
+    Args:
+        model: One of THREADING_MODELS; "" is the single-threaded pipeline.
+    """
+    if model not in THREADING_MODELS:
+        raise ValueError(f"unknown threading model {model!r}")
+    if model and not Thread.isThreadingSupported():
+        raise RuntimeError("this Panda3D build has no thread support")
+    ConfigVariable("threading-model").setStringValue(model)
+
+
+class ParticleWorker:
+    """Run particle simulation steps on a dedicated task chain.
+
+    The App thread hands the worker a list of jobs with submit() and later
+    collects them with wait(); only the simulation runs on the worker, and it
+    must not touch the scene graph. Writing the results into vertex data and
+    anything else that reads or changes an effect's arrays stays on the App
+    thread, after wait(). Submitting at the end of one frame's particle
+    update and waiting at the start of the next lets the step overlap the
+    rest of the frame (cull, draw, other tasks), at the cost of particles
+    being drawn one step behind the simulation.
+    """
+
+    def __init__(self, task_mgr, name: str = "particleWorker"):
+        """
+        Args:
+            task_mgr: The ShowBase task manager.
+            name:     Task name; the chain is called f"{name}Chain".
+        """
+        self.task_mgr = task_mgr
+        self.name = name
+        self.chain = f"{name}Chain"
+
+        self._cond = threading.Condition()
+        self._jobs = None
+        self._error = None
+
+        task_mgr.setupTaskChain(self.chain, numThreads=1)
+        task_mgr.add(self._run, name, taskChain=self.chain)
+
+    def submit(self, jobs):
+        """Start running jobs, a list of zero-argument callables.
+
+        Waits for the previous batch first, so at most one batch is ever in
+        flight.
+        """
+        self.wait()
+        with self._cond:
+            self._jobs = list(jobs)
+            self._cond.notify_all()
+
+    def wait(self):
+        """Block until the submitted batch has finished.
+
+        Re-raises the first exception raised by a job on the worker.
+        """
+        with self._cond:
+            while self._jobs is not None:
+                self._cond.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def stop(self):
+        """Finish the current batch and remove the worker task."""
+        self.wait()
+        self.task_mgr.remove(self.name)
+
+    def _run(self, task):
+        with self._cond:
+            # short timeout so the task manager can stop the chain
+            if self._jobs is None and not self._cond.wait(0.05):
+                return task.cont
+            jobs = self._jobs
+        if jobs is None:
+            return task.cont
+
+        error = None
+        try:
+            for job in jobs:
+                job()
+        except Exception as e:
+            error = e
+
+        with self._cond:
+            self._jobs = None
+            self._error = error
+            self._cond.notify_all()
+        return task.cont
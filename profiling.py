@@ -0,0 +1,187 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from panda3d.core import ClockObject, PStatCollector
+
+
+class FrameProfiler:
+    """Named per-subsystem timers that feed both PStats and a metrics file.
+
+    Every timer is backed by a PStatCollector, so it shows up in the PStats
+    viewer under its name (use ":" to nest, e.g. "App:Particles:star"). The
+    same timings are summed per frame in Python and, when ``path`` is given,
+    appended to a rolling CSV or JSON-lines file: once the file grows past
+    ``max_bytes`` it is renamed to ``path.1`` (older files shift up to
+    ``backups``) and a fresh one is started. A CSV header covers every
+    column seen so far: when a frame brings a new one, such as the timer of
+    an effect built later, the file is rewritten with the wider header and
+    earlier rows are left empty there.
+
+    Cull and draw cannot be split from Python in a single-threaded pipeline,
+    so the exported "render" column covers the whole igLoop (cull + draw +
+    flip); PStats still shows them separately.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = 16 * 2**20, backups: int = 3):
+        """
+        Args:
+            path:      Metrics file; ".csv" selects CSV, anything else JSON
+                       lines. None disables export.
+            max_bytes: Size at which the metrics file is rotated.
+            backups:   Number of rotated files to keep.
+        """
+        self.path = path
+        self.format = "csv" if path and path.endswith(".csv") else "jsonl"
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self.collectors = {}
+        self.current = {}
+        self.frame = 0
+        self.last_row = {}
+
+        self._file = None
+        self._writer = None
+        self._columns = None
+        self._render_start = None
+        self._frame_start = time.perf_counter()
+
+    # -------------------------------------------------------------------------
+    # Timers
+    # -------------------------------------------------------------------------
+
+    def collector(self, name: str) -> PStatCollector:
+        """Return the collector for name, registering it on first use."""
+        if name not in self.collectors:
+            self.collectors[name] = PStatCollector(name)
+            self.current[name] = 0.0
+        return self.collectors[name]
+
+    @contextmanager
+    def timed(self, name: str):
+        """Time the body of a with-block under name."""
+        collector = self.collector(name)
+        collector.start()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - t0
+            collector.stop()
+
+    def wrapTask(self, name: str, func):
+        """Return a task function that runs func under the timer name."""
+        self.collector(name)
+
+        def task(task):
+            with self.timed(name):
+                return func(task)
+
+        return task
+
+    # -------------------------------------------------------------------------
+    # Frame boundaries
+    # -------------------------------------------------------------------------
+
+    def beginRender(self, task):
+        """Task to run just before igLoop (sort < 50)."""
+        self._render_start = time.perf_counter()
+        return task.cont
+
+    def endFrame(self, **extra):
+        """Close the current frame, export its row, and reset the timers.
+
+        Call from a task that runs just after igLoop (sort > 50).
+
+        Args:
+            extra: Additional columns for this frame, e.g. particle counts.
+        """
+        now = time.perf_counter()
+        row = {
+            "frame": self.frame,
+            "time": round(ClockObject.getGlobalClock().getFrameTime(), 6),
+            "frame_ms": (now - self._frame_start) * 1e3,
+            "render_ms": (
+                (now - self._render_start) * 1e3 if self._render_start else 0.0
+            ),
+        }
+        for name, seconds in self.current.items():
+            row[f"{name}_ms"] = seconds * 1e3
+            self.current[name] = 0.0
+        row.update(extra)
+
+        self.last_row = row
+        if self.path:
+            self._write(row)
+
+        self.frame += 1
+        self._frame_start = now
+        self._render_start = None
+
+    def close(self):
+        """Flush and close the metrics file."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def _write(self, row: dict):
+        if self._file is None:
+            self._open()
+        elif self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+        if self.format == "csv":
+            if self._columns is None:
+                self._columns = list(row)
+                self._writer = csv.DictWriter(self._file, fieldnames=self._columns)
+                self._writer.writeheader()
+            elif not row.keys() <= set(self._columns):
+                self._widen([key for key in row if key not in self._columns])
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + "\n")
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._columns = None
+        self._writer = None
+        if self.format == "csv" and os.path.isfile(self.path):
+            # appending to an earlier run: keep its header
+            with open(self.path, newline="") as f:
+                self._columns = next(csv.reader(f), None)
+        self._file = open(self.path, "a", newline="")
+        if self._columns:
+            self._writer = csv.DictWriter(self._file, fieldnames=self._columns)
+
+    def _widen(self, columns):
+        self._file.close()
+        with open(self.path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self._columns = self._columns + columns
+        with open(self.path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self._columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        self._file = open(self.path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self._columns)
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            # no backups to keep: start the file over
+            os.remove(self.path)
+        self._open()
@@ -0,0 +1,326 @@
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from panda3d.core import Filename, Texture
+
+# tracer used by pool workers, installed once per process by _init_worker
+_tracer = None
+
+
+class GeodesicTracer:
+    """Offline renderer that traces null geodesics around a Schwarzschild hole.
+
+    In Cartesian coordinates centred on the hole, a photon's path obeys
+
+        d^2x/dl^2 = -1.5 * rs * h^2 * x / r^5,    h = |x cross dx/dl|
+
+    which is integrated with RK4 for a whole tile of rays at once, using a
+    step proportional to the distance from the hole. Each ray ends when it
+    falls through the horizon, crosses the photon ring (x-z plane, radius
+    ``photon_rad``) or the accretion disk annulus (x-y plane), or escapes,
+    in which case the star background is looked up in its final direction.
+
+    The image is split into square tiles that are traced independently, so
+    they can be farmed out to worker processes. The tracer only holds NumPy
+    arrays and numbers, which keeps it cheap to send to each worker once.
+    """
+
+    def __init__(
+        self,
+        rs: float,
+        camera_pos,
+        camera_axes,
+        fov,
+        size,
+        photon_rad: float,
+        disk_inner: float,
+        disk_outer: float,
+        disk_color=(0.99, 0.39, 0, 1),
+        ring_color=(0.99, 0.39, 0, 1),
+        ring_width: float = 0.15,
+        sky: np.ndarray = None,
+        background: bool = True,
+        max_steps: int = 2000,
+        tile: int = 64,
+    ):
+        """
+        Args:
+            rs:          Schwarzschild radius (the black hole's bh_rad).
+            camera_pos:  Camera position relative to the hole centre.
+            camera_axes: (right, forward, up) unit vectors of the camera.
+            fov:         (horizontal, vertical) field of view in degrees.
+            size:        (width, height) of the image in pixels.
+            photon_rad:  Radius of the photon ring.
+            disk_inner:  Inner radius of the accretion disk annulus.
+            disk_outer:  Outer radius of the accretion disk annulus.
+            disk_color:  RGBA color of the disk at its inner edge.
+            ring_color:  RGBA color of the photon ring.
+            ring_width:  Half width of the photon ring band.
+            sky:         Equirectangular star map, (height, width, 3) floats in
+                         [0, 1] with the top row first; None for black.
+            background:  Draw the star map; if False escaped rays are left
+                         transparent so the frame can be composited.
+            max_steps:   Integration steps before a ray is treated as captured.
+            tile:        Tile edge in pixels.
+        """
+        self.rs = float(rs)
+        self.camera_pos = np.asarray(camera_pos, dtype=np.float64)
+        self.camera_axes = np.asarray(camera_axes, dtype=np.float64)
+        self.tan_x = math.tan(math.radians(fov[0]) / 2)
+        self.tan_y = math.tan(math.radians(fov[1]) / 2)
+        self.width, self.height = size
+        self.photon_rad = photon_rad
+        self.ring_width = ring_width
+        self.disk_inner = disk_inner
+        self.disk_outer = disk_outer
+        self.disk_color = np.asarray(disk_color, dtype=np.float32)
+        self.ring_color = np.asarray(ring_color, dtype=np.float32)
+        self.sky = sky
+        self.background = background
+        self.max_steps = max_steps
+        self.tile = tile
+
+        # (plane normal axis, inner radius, outer radius, color, shaded)
+        self.targets = [
+            # photon ring in the x-z plane
+            (
+                1,
+                photon_rad - ring_width,
+                photon_rad + ring_width,
+                self.ring_color,
+                False,
+            ),
+            # accretion disk in the x-y plane
+            (2, disk_inner, disk_outer, self.disk_color, True),
+        ]
+
+        # far enough out that the remaining bending is below a pixel
+        self.escape_rad = max(2 * np.linalg.norm(self.camera_pos), 100 * self.rs)
+
+    # -------------------------------------------------------------------------
+    # Tiles
+    # -------------------------------------------------------------------------
+
+    def tiles(self):
+        """Return every tile as (x0, y0, x1, y1), y counted from the top."""
+        return [
+            (x0, y0, min(x0 + self.tile, self.width), min(y0 + self.tile, self.height))
+            for y0 in range(0, self.height, self.tile)
+            for x0 in range(0, self.width, self.tile)
+        ]
+
+    def traceTile(self, tile) -> np.ndarray:
+        """Trace one tile and return its (rows, cols, 4) float32 RGBA pixels."""
+        x0, y0, x1, y1 = tile
+        px = (np.arange(x0, x1) + 0.5) / self.width * 2 - 1
+        py = 1 - (np.arange(y0, y1) + 0.5) / self.height * 2
+        px, py = np.meshgrid(px * self.tan_x, py * self.tan_y)
+
+        right, forward, up = self.camera_axes
+        direction = (
+            forward[None, :]
+            + px.reshape(-1, 1) * right[None, :]
+            + py.reshape(-1, 1) * up[None, :]
+        )
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+
+        rgba = self.trace(np.broadcast_to(self.camera_pos, direction.shape), direction)
+        return rgba.reshape(y1 - y0, x1 - x0, 4)
+
+    # -------------------------------------------------------------------------
+    # Integration
+    # -------------------------------------------------------------------------
+
+    def trace(self, pos: np.ndarray, vel: np.ndarray) -> np.ndarray:
+        """Trace rays from pos along unit directions vel; return RGBA per ray."""
+        n = len(pos)
+        pos = np.array(pos, dtype=np.float64)
+        vel = np.array(vel, dtype=np.float64)
+        h2 = np.sum(np.cross(pos, vel) ** 2, axis=1)
+        rgba = np.zeros((n, 4), dtype=np.float32)
+        # rays still in flight, as indices into the full arrays
+        live = np.arange(n)
+
+        for _ in range(self.max_steps):
+            if not len(live):
+                break
+            p, v, k = pos[live], vel[live], h2[live]
+            r = np.linalg.norm(p, axis=1)
+            dt = np.clip(0.05 * (r - 0.9 * self.rs), 0.01 * self.rs, 5 * self.rs)
+            p1, v1 = self._rk4(p, v, k, dt[:, None])
+            pos[live], vel[live] = p1, v1
+
+            done = np.zeros(len(live), dtype=bool)
+            hit_at = np.full(len(live), np.inf)
+
+            for axis, lo, hi, color, shade in self.targets:
+                frac, radius = _plane_crossing(p, p1, axis)
+                hit = (lo <= radius) & (radius <= hi) & (frac < hit_at)
+                if hit.any():
+                    hit_at[hit] = frac[hit]
+                    pixel = np.broadcast_to(color, (hit.sum(), 4)).copy()
+                    if shade:
+                        # brightest at the inner edge, fading outward
+                        falloff = (self.disk_inner / radius[hit]) ** 2
+                        pixel[:, :3] *= falloff[:, None]
+                    rgba[live[hit]] = pixel
+                    done |= hit
+
+            r1 = np.linalg.norm(p1, axis=1)
+            captured = ~done & (r1 <= self.rs)
+            rgba[live[captured]] = (0, 0, 0, 1)
+            done |= captured
+
+            escaped = ~done & (r1 >= self.escape_rad) & (np.sum(p1 * v1, axis=1) > 0)
+            if escaped.any():
+                rgba[live[escaped]] = self._sky(v1[escaped])
+            done |= escaped
+
+            live = live[~done]
+
+        # rays still orbiting near the photon sphere end up captured
+        rgba[live] = (0, 0, 0, 1)
+        return rgba
+
+    def _rk4(self, p, v, h2, dt):
+        def accel(x):
+            r2 = np.sum(x * x, axis=1, keepdims=True)
+            return -1.5 * self.rs * h2[:, None] * x / r2**2.5
+
+        a1 = accel(p)
+        a2 = accel(p + 0.5 * dt * v)
+        a3 = accel(p + 0.5 * dt * (v + 0.5 * dt * a1))
+        a4 = accel(p + dt * (v + 0.5 * dt * a2))
+        p1 = p + dt * v + dt * dt / 6 * (a1 + a2 + a3)
+        v1 = v + dt / 6 * (a1 + 2 * a2 + 2 * a3 + a4)
+        return p1, v1
+
+    def _sky(self, direction: np.ndarray) -> np.ndarray:
+        n = len(direction)
+        rgba = np.zeros((n, 4), dtype=np.float32)
+        if not self.background:
+            return rgba
+        rgba[:, 3] = 1
+        if self.sky is None:
+            return rgba
+
+        d = direction / np.linalg.norm(direction, axis=1, keepdims=True)
+        lon = np.arctan2(d[:, 1], d[:, 0])
+        lat = np.arcsin(np.clip(d[:, 2], -1, 1))
+        rows, cols = self.sky.shape[:2]
+        col = ((lon / (2 * np.pi) + 0.5) * cols).astype(np.int32) % cols
+        row = np.clip(((0.5 - lat / np.pi) * rows).astype(np.int32), 0, rows - 1)
+        rgba[:, :3] = self.sky[row, col]
+        return rgba
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def render(self, workers: int = None, progress=None) -> np.ndarray:
+        """Trace every tile, in parallel when workers > 1.
+
+        Args:
+            workers:  Worker processes; None uses every core, 1 traces in
+                      this process.
+            progress: Optional callable(done, total, elapsed, rays) run after
+                      each finished tile.
+
+        Returns:
+            (height, width, 4) float32 RGBA image, top row first.
+        """
+        workers = workers or os.cpu_count() or 1
+        image = np.zeros((self.height, self.width, 4), dtype=np.float32)
+        tiles = self.tiles()
+        t0 = time.perf_counter()
+        rays = 0
+
+        def finished(done, tile, pixels):
+            nonlocal rays
+            x0, y0, x1, y1 = tile
+            image[y0:y1, x0:x1] = pixels
+            rays += pixels.shape[0] * pixels.shape[1]
+            if progress:
+                progress(done, len(tiles), time.perf_counter() - t0, rays)
+
+        if workers == 1:
+            for done, tile in enumerate(tiles, 1):
+                finished(done, tile, self.traceTile(tile))
+            return image
+
+        # spawned, not forked: a fork would copy the parent's Panda3D state
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as pool:
+            futures = {pool.submit(_trace_tile, tile): tile for tile in tiles}
+            for done, future in enumerate(as_completed(futures), 1):
+                finished(done, futures[future], future.result())
+        return image
+
+
+def _plane_crossing(p0: np.ndarray, p1: np.ndarray, axis: int):
+    """Return where each segment p0 -> p1 crosses the plane x[axis] = 0.
+
+    Returns (fraction along the segment, distance from the origin); segments
+    that do not cross get a fraction of inf and a distance of -1.
+    """
+    a, b = p0[:, axis], p1[:, axis]
+    crosses = (a * b <= 0) & (a != b)
+    frac = np.full(len(p0), np.inf)
+    frac[crosses] = a[crosses] / (a[crosses] - b[crosses])
+    radius = np.full(len(p0), -1.0)
+    point = p0[crosses] + frac[crosses, None] * (p1[crosses] - p0[crosses])
+    radius[crosses] = np.linalg.norm(point, axis=1)
+    return frac, radius
+
+
+def _init_worker(tracer: GeodesicTracer):
+    global _tracer
+    _tracer = tracer
+
+
+def _trace_tile(tile):
+    return _tracer.traceTile(tile)
+
+
+def load_sky(path: str) -> np.ndarray:
+    """Load an equirectangular star map as (height, width, 3) floats in [0, 1]."""
+    tex = Texture()
+    if not tex.read(Filename.fromOsSpecific(path)):
+        raise OSError(f"could not read {path}")
+    image = np.frombuffer(memoryview(tex.getRamImageAs("RGB")), dtype=np.uint8)
+    image = image.reshape(tex.getYSize(), tex.getXSize(), 3)[::-1]
+    return image.astype(np.float32) / 255
+
+
+def save_image(image: np.ndarray, path: str):
+    """Write a (height, width, 4) float RGBA image, top row first, to path."""
+    height, width = image.shape[:2]
+    pixels = (np.clip(image, 0, 1) * 255 + 0.5).astype(np.uint8)
+    tex = Texture("geodesic frame")
+    tex.setup2dTexture(width, height, Texture.T_unsigned_byte, Texture.F_rgba)
+    tex.setRamImageAs(np.ascontiguousarray(pixels[::-1]).tobytes(), "RGBA")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if not tex.write(Filename.fromOsSpecific(path)):
+        raise OSError(f"could not write {path}")
+
+
+def print_progress(done: int, total: int, elapsed: float, rays: int):
+    """Progress callback for render() that keeps one status line on stderr."""
+    rate = rays / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(
+        f"\rtile {done}/{total} ({done / total:.0%}), "
+        f"{rate / 1e3:.1f}k rays/sec, {elapsed:.1f} s"
+    )
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
@@ -0,0 +1,125 @@
+from direct.particles.SpriteParticleRendererExt import SpriteParticleRendererExt
+from panda3d.core import LColor
+from panda3d.physics import (
+    LineParticleRenderer,
+    ParticleSystem,
+    PointParticleRenderer,
+)
+
+# renderer type identifiers, matching the 3 / 4 / 5 key bindings
+SPRITE = 3
+LINE = 4
+POINT = 5
+
+RENDERER_TYPES = {
+    SPRITE: "SpriteParticleRenderer",
+    LINE: "LineParticleRenderer",
+    POINT: "PointParticleRenderer",
+}
+
+
+class RendererPool:
+    """Prebuilt Sprite, Line and Point renderers for one Particles system.
+
+    The renderers are configured once, sharing a single sprite texture, so
+    switching is a pointer swap on the particle system followed by a color
+    update instead of constructing a renderer and reloading its texture.
+
+    Switches to Line still hitch: ParticleSystem.setRenderer resizes the
+    renderer's pool, and LineParticleRenderer rebuilds its Geom on every
+    resize, so the first frame after the swap refills an empty vertex
+    buffer. With 9000-particle pools (software, 320x200) that frame takes
+    about 51 ms against 25.6 ms steady; Sprite and Point switches cost
+    nothing measurable. Keeping a second particle system per renderer would
+    avoid it, at the price of simulating every effect twice every frame.
+    """
+
+    def __init__(
+        self,
+        particles,
+        texture,
+        sprite_scales,
+        point_size: float = 100.0,
+    ):
+        """
+        Args:
+            particles:     The Particles system whose renderer is swapped.
+            texture:       Sprite texture, shared between all pools.
+            sprite_scales: (initial x, final x, initial y, final y) scales.
+            point_size:    Point renderer size in pixels.
+        """
+        self.particles = particles
+
+        # the line renderer already on the system is reused as-is
+        line = particles.getRenderer()
+
+        sprite = SpriteParticleRendererExt()
+        sprite.setTexture(texture)
+        sprite.setXScaleFlag(True)
+        sprite.setYScaleFlag(True)
+        sprite.setAnimAngleFlag(True)
+        x_init, x_final, y_init, y_final = sprite_scales
+        sprite.setInitialXScale(x_init)
+        sprite.setFinalXScale(x_final)
+        sprite.setInitialYScale(y_init)
+        sprite.setFinalYScale(y_final)
+
+        point = PointParticleRenderer()
+        point.setPointSize(point_size)
+        point.setBlendType(point.PP_BLEND_VEL)
+        point.setBlendMethod(point.PP_BLEND_CUBIC)
+
+        self.renderers = {SPRITE: sprite, LINE: line, POINT: point}
+        self.mode = LINE
+
+    def prewarm(self, particle_mgr, color: LColor):
+        """Render once with every renderer so each allocates its buffers now.
+
+        A renderer grows its vertex buffers to the live particle count on its
+        first render, which is what makes the first switch to it hitch. The
+        system is advanced by a negligible step first so the pool is full.
+        This does not carry over for the line renderer, which starts over
+        on every swap (see the class docstring).
+
+        Args:
+            particle_mgr: The ParticleSystemManager updating the system.
+            color:        Particle color to leave the renderers with.
+        """
+        mode = self.mode
+        particle_mgr.doParticles(1e-4, self.particles, False)
+        for other in self.renderers:
+            self.use(other, color)
+            particle_mgr.doParticles(0.0, self.particles, True)
+        self.use(mode, color)
+
+    def setSpriteTexture(self, texture):
+        """Replace the sprite renderer's texture (e.g. once it has loaded)."""
+        self.renderers[SPRITE].setTexture(texture)
+
+    def use(self, mode: int, color: LColor):
+        """Make mode the active renderer and apply color to it.
+
+        Args:
+            mode:  SPRITE, LINE or POINT.
+            color: Particle color.
+        """
+        renderer = self.renderers[mode]
+        if mode != self.mode:
+            # bypass Particles.setRenderer, which always builds a new renderer
+            ParticleSystem.setRenderer(self.particles, renderer)
+            self.particles.renderer = renderer
+            self.particles.rendererType = RENDERER_TYPES[mode]
+            self.mode = mode
+        set_renderer_color(renderer, mode, color)
+
+
+def set_renderer_color(renderer, mode: int, color: LColor):
+    """Apply color to a renderer of the given type."""
+    if mode == SPRITE:
+        renderer.setColor(color)
+    elif mode == LINE:
+        renderer.setHeadColor(color)
+        renderer.setTailColor(color)
+    else:
+        renderer.setStartColor(color)
+        renderer.setEndColor(color)
@@ -0,0 +1,131 @@
+from panda3d.core import (
+    Camera,
+    CardMaker,
+    ColorBlendAttrib,
+    FrameBufferProperties,
+    NodePath,
+    OrthographicLens,
+    SamplerState,
+    Texture,
+    TextureStage,
+)
+
+
+class DynamicResolution:
+    """Render the 3-D scene at a fraction of the window size and upscale it.
+
+    The scene camera draws into an offscreen buffer the size of the window
+    (see update()), but only into its lower-left ``scale`` fraction
+    in each direction, so changing the scale is a display region change
+    rather than a new buffer. A full-window card then stretches that part of
+    the buffer's texture over the window's 3-D display region with bilinear
+    filtering; display regions drawn before and after it, such as the
+    render2dp background and the render2d overlay, stay at native
+    resolution.
+
+    The buffer is cleared to transparent black and the card blends it as
+    premultiplied color, so the background shows through wherever the scene
+    left it uncovered.
+    """
+
+    def __init__(self, win, camera: NodePath, scale: float = 1.0):
+        """
+        Args:
+            win:    The window (or offscreen window buffer) to draw into.
+            camera: The scene camera; its display region on win is taken
+                    over by the upscaling card.
+            scale:  Initial fraction of the window resolution, in (0, 1].
+        """
+        self.win = win
+        self.camera = camera
+        self.window_region = camera.node().getDisplayRegion(0)
+
+        fbp = FrameBufferProperties()
+        fbp.setRgbColor(True)
+        fbp.setRgbaBits(8, 8, 8, 8)
+        fbp.setDepthBits(24)
+        self.texture = Texture("dynamic resolution")
+        self.texture.setMinfilter(SamplerState.FT_linear)
+        self.texture.setMagfilter(SamplerState.FT_linear)
+        self.texture.setWrapU(SamplerState.WM_clamp)
+        self.texture.setWrapV(SamplerState.WM_clamp)
+        # GSGs without non-power-of-two textures (tinydisplay) get a padded
+        # buffer, of which only the window-sized corner is used
+        self.pad = not win.getGsg().getSupportsTexNonPow2()
+        self.buffer = win.makeTextureBuffer(
+            "dynamic resolution", *self.bufferSize(), self.texture, False, fbp
+        )
+        self.buffer.setClearColor((0, 0, 0, 0))
+        self.buffer.setClearColorActive(True)
+        self.buffer.setClearDepthActive(True)
+        self.region = self.buffer.makeDisplayRegion()
+        self.region.setCamera(camera)
+
+        # full-window card, seen through its own orthographic camera
+        self.root = NodePath("dynamic resolution")
+        self.root.setDepthTest(False)
+        self.root.setDepthWrite(False)
+        card = CardMaker("dynamic resolution card")
+        card.setFrameFullscreenQuad()
+        self.card = self.root.attachNewNode(card.generate())
+        self.card.setTexture(self.texture)
+        self.card.setAttrib(
+            ColorBlendAttrib.make(
+                ColorBlendAttrib.MAdd,
+                ColorBlendAttrib.OOne,
+                ColorBlendAttrib.OOneMinusIncomingAlpha,
+            )
+        )
+        lens = OrthographicLens()
+        lens.setFilmSize(2, 2)
+        lens.setNearFar(-1000, 1000)
+        card_camera = Camera("dynamic resolution camera", lens)
+        self.card_camera = self.root.attachNewNode(card_camera)
+        self.window_region.setCamera(self.card_camera)
+
+        self.scale = None
+        self.setScale(scale)
+
+    def bufferSize(self):
+        """Return the (width, height) the buffer needs for the window."""
+        width, height = self.win.getXSize(), self.win.getYSize()
+        if self.pad:
+            width, height = (1 << (n - 1).bit_length() for n in (width, height))
+        return width, height
+
+    def setScale(self, scale: float):
+        """Render the scene at scale times the window resolution."""
+        self.scale = min(max(scale, 0.0), 1.0)
+        width = self.scale * self.win.getXSize() / self.buffer.getXSize()
+        height = self.scale * self.win.getYSize() / self.buffer.getYSize()
+        self.region.setDimensions(0, width, 0, height)
+
+    def getScale(self) -> float:
+        return self.scale
+
+    def getRenderSize(self):
+        """Return the (width, height) in pixels the scene is rendered at."""
+        return self.region.getPixelWidth(), self.region.getPixelHeight()
+
+    def update(self):
+        """Map the rendered part of the buffer onto the card.
+
+        Must run every frame before rendering, so the buffer follows the
+        window's size.
+        """
+        size = self.bufferSize()
+        if size != (self.buffer.getXSize(), self.buffer.getYSize()):
+            self.buffer.setSize(*size)
+            self.setScale(self.scale)
+        width, height = self.getRenderSize()
+        self.card.setTexScale(
+            TextureStage.getDefault(),
+            width / self.buffer.getXSize(),
+            height / self.buffer.getYSize(),
+        )
+
+    def destroy(self):
+        """Give the window's display region back to the scene camera."""
+        self.window_region.setCamera(self.camera)
+        self.buffer.getEngine().removeWindow(self.buffer)
+        self.root.removeNode()
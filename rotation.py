@@ -0,0 +1,68 @@
+from direct.interval.LerpInterval import LerpHprInterval
+from panda3d.core import LVector3, NodePath
+
+
+class Spinner:
+    """Spin scene nodes at fixed angular rates using looping C++ intervals.
+
+    Each node gets a LerpHprInterval covering one full turn, looped forever.
+    The intervals are advanced by Panda3D's C++ interval manager as part of
+    its single per-frame step, so spinning costs no Python work per node and
+    the speed is set in degrees per second rather than per frame.
+    """
+
+    def __init__(self):
+        self.intervals = {}
+
+    def add(self, name: str, node: NodePath, hpr_rate):
+        """Start spinning node.
+
+        Args:
+            name:     Unique name, also used for the interval.
+            node:     Node to rotate.
+            hpr_rate: (heading, pitch, roll) rates in degrees per second; only
+                      one axis is expected to be non-zero.
+        """
+        rate = LVector3(*hpr_rate)
+        speed = max(abs(rate[0]), abs(rate[1]), abs(rate[2]))
+        if speed == 0:
+            return
+
+        # one full turn on the fastest axis, then loop
+        duration = 360.0 / speed
+        start = node.getHpr()
+        interval = LerpHprInterval(
+            node,
+            duration,
+            hpr=start + rate * duration,
+            startHpr=start,
+            name=f"spin {name}",
+        )
+        self.remove(name)
+        self.intervals[name] = interval
+        interval.loop()
+
+    def remove(self, name: str):
+        """Stop spinning the node registered under name."""
+        interval = self.intervals.pop(name, None)
+        if interval is not None:
+            interval.finish()
+
+    def seek(self, t: float):
+        """Put every spin where it is t seconds after starting, from now on.
+
+        Offscreen renders call this once the fixed clock is set up, so spin
+        angles follow the frame number rather than how long setup took.
+        """
+        for interval in self.intervals.values():
+            interval.setT(t % interval.getDuration())
+
+    def pause(self):
+        """Freeze every spinning node in place."""
+        for interval in self.intervals.values():
+            interval.pause()
+
+    def resume(self):
+        """Continue every paused spin from where it stopped."""
+        for interval in self.intervals.values():
+            interval.resume()
@@ -1 +1 @@
-python main.py
\ No newline at end of file
+python main.py %*
\ No newline at end of file
@@ -7,4 +7,4 @@ if [ -d ".venv" ]; then
     . .venv/bin/activate
 fi
 
-python main.py
+python main.py "$@"
@@ -0,0 +1,57 @@
+class FixedStepClock:
+    """Accumulator that turns variable frame times into fixed simulation steps.
+
+    Every frame, advance() adds the frame's duration and returns how many
+    whole steps of 1 / rate seconds are now due. The simulation may therefore
+    run slower or faster than rendering: a long frame is caught up with
+    several steps and no extra draws, a short one may take none. What is left
+    over, as a fraction of a step, is ``blend``, used to interpolate between
+    the last two simulated states when drawing.
+
+    Time is kept in units of steps so that frame times that are exact
+    multiples of the step (e.g. 30 fps rendering of a 60 Hz simulation)
+    always yield the same step count, which keeps fixed-clock renders
+    reproducible frame for frame.
+    """
+
+    def __init__(self, rate: float = 60.0, max_steps: int = 8):
+        """
+        Args:
+            rate:      Simulation steps per second.
+            max_steps: Most steps taken in one frame; time beyond that is
+                       dropped so a stall cannot snowball into ever longer
+                       catch-up frames.
+        """
+        self.rate = rate
+        self.step = 1.0 / rate
+        self.max_steps = max_steps
+
+        self.accumulator = 0.0
+        self.steps = 0
+        self.total_steps = 0
+        self.dropped_steps = 0
+
+    @property
+    def blend(self) -> float:
+        """Fraction of a step accumulated but not yet simulated, in [0, 1)."""
+        return self.accumulator
+
+    @property
+    def time(self) -> float:
+        """Simulated time in seconds."""
+        return self.total_steps * self.step
+
+    def advance(self, dt: float) -> int:
+        """Add dt seconds of frame time and return the steps now due."""
+        self.accumulator += dt * self.rate
+        # tolerate float error so exact multiples of the step are not lost
+        steps = int(self.accumulator + 1e-6)
+        self.accumulator = max(0.0, self.accumulator - steps)
+
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+
+        self.steps = steps
+        self.total_steps += steps
+        return steps
@@ -0,0 +1,74 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall-clock breakdown of the time from launch to the first frame.
+
+    Phases are timed spans (imports, geometry build, particle setup, ...);
+    marks are moments measured from the start (first frame, assets loaded).
+    Phases run on the loader thread overlap the App thread's, so they are
+    listed but not counted towards the App thread total.
+
+    Only the standard library is imported here, so main.py can create the
+    profile before the heavy imports it measures.
+    """
+
+    def __init__(self, start: float = None):
+        """
+        Args:
+            start: time.perf_counter() value at launch; defaults to now.
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self.marks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase name."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float):
+        """Record a phase that took seconds; safe to call from any thread."""
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    def mark(self, name: str):
+        """Record the time since start under name, if not recorded yet."""
+        with self._lock:
+            self.marks.setdefault(name, time.perf_counter() - self.start)
+
+    def importModules(self, modules):
+        """Import each module in turn, timing it as an "import" phase.
+
+        Modules already imported by an earlier one take no time, so list
+        heavy dependencies first.
+        """
+        for module in modules:
+            with self.phase(f"import {module}"):
+                importlib.import_module(module)
+
+    def report(self) -> str:
+        """Return the phases and marks as an aligned multi-line table."""
+        with self._lock:
+            phases = list(self.phases)
+            marks = sorted(self.marks.items(), key=lambda item: item[1])
+
+        width = max([len(name) for name, _ in phases + marks] + [10])
+        lines = ["startup profile:"]
+        total = 0.0
+        for name, seconds in phases:
+            if "(loader thread)" not in name:
+                total += seconds
+            lines.append(f"  {name:<{width}} {seconds * 1e3:8.1f} ms")
+        lines.append(f"  {'App thread total':<{width}} {total * 1e3:8.1f} ms")
+        for name, seconds in marks:
+            lines.append(f"  {name:<{width}} {seconds * 1e3:8.1f} ms after launch")
+        return "\n".join(lines)